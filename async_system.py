@@ -0,0 +1,80 @@
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+from main import EventManagementSystem
+
+
+class AsyncEventManagementSystem:
+    """
+    asyncio front end for EventManagementSystem.
+    
+    Every call runs on a small thread pool, so the event loop never waits
+    on the disk, and the wrapped system is built in write-behind mode, so
+    a burst of changes costs one file rewrite instead of one per request.
+    The system itself is thread-safe, which lets requests overlap.
+    """
+    
+    def __init__(self, system=None, storage=None, max_workers=8, flush_interval_ms=200, max_pending=1000):
+        if system is None:
+            system = EventManagementSystem(storage, write_behind=True,
+                                           flush_interval_ms=flush_interval_ms, max_pending=max_pending)
+        self.system = system
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ems")
+    
+    async def _call(self, method, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(method, *args, **kwargs))
+    
+    async def login(self, username, password):
+        return await self._call(self.system.login, username, password)
+    
+    async def register_user(self, username, password, email, role="user"):
+        return await self._call(self.system.register_user, username, password, email, role)
+    
+    async def create_event(self, title, description, date, venue, capacity, category, organizer_id):
+        return await self._call(self.system.create_event, title, description, date, venue,
+                                capacity, category, organizer_id)
+    
+    async def update_event(self, event_id, title, description, date, venue, capacity, category, organizer_id):
+        return await self._call(self.system.update_event, event_id, title, description, date, venue,
+                                capacity, category, organizer_id)
+    
+    async def approve_event(self, event_id, admin_id):
+        return await self._call(self.system.approve_event, event_id, admin_id)
+    
+    async def register_for_event(self, event_id, user_id):
+        return await self._call(self.system.register_for_event, event_id, user_id)
+    
+    async def unregister_from_event(self, event_id, user_id):
+        return await self._call(self.system.unregister_from_event, event_id, user_id)
+    
+    async def delete_user(self, target_user_id, admin_id):
+        return await self._call(self.system.delete_user, target_user_id, admin_id)
+    
+    async def get_available_events(self, user_id=None, category=None, sort_by_date=False):
+        return await self._call(self.system.get_available_events, user_id, category, sort_by_date)
+    
+    async def get_user_registrations(self, user_id):
+        # A copy, since the live set can change under the caller between awaits
+        return await self._call(lambda: list(self.system.get_user_registrations(user_id)))
+    
+    async def get_event_registrations(self, event_id, organizer_id=None):
+        return await self._call(lambda: list(self.system.get_event_registrations(event_id, organizer_id)))
+    
+    async def get_user_events(self, organizer_id):
+        return await self._call(self.system.get_user_events, organizer_id)
+    
+    async def flush(self):
+        await self._call(self.system.flush)
+    
+    async def close(self):
+        # Write out queued changes, then release the storage and the pool
+        await self._call(self.system.close)
+        self._executor.shutdown(wait=True)
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
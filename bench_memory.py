@@ -0,0 +1,56 @@
+import argparse
+import gc
+import json
+import tracemalloc
+import uuid
+from datetime import datetime, timedelta
+
+from main import User, Event
+
+
+def make_records(count, registrations):
+    # Records as JSON text, like the storage files; each is parsed while
+    # measuring, so every string is a fresh copy just as on a real load
+    event_ids = [str(uuid.uuid4()) for _ in range(count)]
+    user_ids = [str(uuid.uuid4()) for _ in range(count)]
+    roles = ["user", "user", "user", "organizer", "admin"]
+    users, events = [], []
+    for i in range(count):
+        user = {"user_id": user_ids[i], "username": f"user{i}", "password": "secret",
+                "email": f"user{i}@example.com", "is_active": True, "role": roles[i % len(roles)],
+                "version": 0}
+        user["registered_events"] = [event_ids[(i + j) % count] for j in range(registrations)]
+        user["events"] = [event_ids[i]]
+        users.append(user)
+        events.append({"event_id": event_ids[i], "title": f"Event {i}", "description": "",
+                       "date": (datetime(2030, 1, 1) + timedelta(hours=i)).isoformat(),
+                       "venue": "Main hall", "capacity": 100, "category": "Music",
+                       "organizer_id": user_ids[i], "is_approved": True, "version": 0,
+                       "registered_users": [user_ids[(i + j) % count] for j in range(registrations)]})
+    return [json.dumps(user) for user in users], [json.dumps(event) for event in events]
+
+
+def measure(build, records):
+    gc.collect()
+    tracemalloc.start()
+    objects = [build(json.loads(record)) for record in records]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    # Less the list holding them
+    return (size - objects.__sizeof__()) / len(objects)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bytes of memory per loaded User and Event")
+    parser.add_argument("--count", type=int, default=100000)
+    parser.add_argument("--registrations", type=int, default=5, help="registrations per user and per event")
+    args = parser.parse_args()
+    
+    users, events = make_records(args.count, args.registrations)
+    print(f"{args.count} records, {args.registrations} registrations each")
+    print(f"bytes per user:  {measure(User.from_dict, users):.0f}")
+    print(f"bytes per event: {measure(Event.from_dict, events):.0f}")
+
+
+if __name__ == "__main__":
+    main()
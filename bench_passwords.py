@@ -0,0 +1,52 @@
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from passwords import PasswordHasher
+
+
+def logins_per_second(hasher, stored, password, logins, concurrency):
+    # concurrency threads verifying at once, like simultaneous login requests
+    start = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as executor:
+        results = list(executor.map(lambda _: hasher.verify(password, stored)[0], range(logins)))
+    elapsed = time.perf_counter() - start
+    assert all(results)
+    return logins / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Password verifications (logins) per second at each scrypt cost")
+    parser.add_argument("--costs", type=int, nargs="+", default=[12, 13, 14, 15, 16], help="log2 of scrypt's n")
+    parser.add_argument("--logins", type=int, default=64, help="verifications per measurement")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="hashing processes")
+    args = parser.parse_args()
+    
+    password = "correct horse battery staple"
+    print(f"{args.logins} logins per measurement, {args.workers} worker processes")
+    print(f"{'cost':>4} {'hash ms':>8} {'1 core/s':>9} {'pool/s':>8} {'per core/s':>10} {'cached/s':>9}")
+    for cost in args.costs:
+        # One core: hashing in the calling thread, one login at a time
+        inline = PasswordHasher(cost, workers=0, cache_size=0)
+        start = time.perf_counter()
+        stored = inline.hash(password)
+        hash_ms = (time.perf_counter() - start) * 1000
+        single = logins_per_second(inline, stored, password, args.logins, 1)
+        
+        # Every worker process busy, as in a login storm
+        pooled = PasswordHasher(cost, workers=args.workers, cache_size=0)
+        pooled.verify(password, stored)  # start the workers outside the measurement
+        pool = logins_per_second(pooled, stored, password, args.logins, args.workers * 2)
+        pooled.close()
+        
+        # The same users logging in again, answered from the verification cache
+        cached = PasswordHasher(cost, workers=0)
+        cached.verify(password, stored)
+        hits = logins_per_second(cached, stored, password, args.logins * 100, 1)
+        
+        print(f"{cost:>4} {hash_ms:>8.1f} {single:>9.1f} {pool:>8.1f} {pool / args.workers:>10.1f} {hits:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,268 @@
+import mmap
+import os
+import struct
+import threading
+from collections import namedtuple
+from collections.abc import Sequence
+from datetime import datetime, timedelta
+
+
+MAGIC = b"EMSCAT1\n"
+EPOCH = datetime(1970, 1, 1)
+
+# magic, record count, category count, then the offsets of the records,
+# category table, postings and string heap sections
+HEADER = struct.Struct("<8sIIQQQQ")
+# date (microseconds since EPOCH), capacity, registered, category number,
+# then (offset, length) in the heap for event_id, title, description,
+# venue and organizer_id
+RECORD = struct.Struct("<qIII10I")
+# Where the registered count sits in a record
+REGISTERED_AT = struct.calcsize("<qI")
+# (offset, length) of the name in the heap, then (offset, count) of the
+# creation-order and date-order postings
+CATEGORY = struct.Struct("<6I")
+
+# One mapping of the file and what its header and category table say
+_Snapshot = namedtuple("_Snapshot", "buf records_at postings_at heap_at postings names")
+
+
+def _stamp(stat):
+    # Changes whenever the file is replaced or written
+    return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+
+class CatalogEntry:
+    """Read-only stand-in for an Event, decoded from one catalog record."""
+    
+    __slots__ = ("event_id", "title", "description", "date", "venue", "capacity", "category",
+                 "organizer_id", "registered_count")
+    
+    is_approved = True  # the catalog only lists approved events
+    
+    def is_full(self):
+        return self.registered_count >= self.capacity
+    
+    def seats_available(self):
+        return self.capacity - self.registered_count
+
+
+class CatalogListing(Sequence):
+    """
+    Events of one catalog posting list. Entries are decoded from the
+    mapped file when indexed, so a page costs only what it shows, with
+    the seat counts of the moment.
+    """
+    
+    def __init__(self, snapshot, numbers):
+        self._snapshot = snapshot
+        self._numbers = numbers  # memoryview of record numbers
+    
+    def __len__(self):
+        return len(self._numbers)
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [_entry(self._snapshot, number) for number in self._numbers[index]]
+        return _entry(self._snapshot, self._numbers[index])
+    
+    def items(self):
+        # Same shape as the dicts returned by EventManager
+        for entry in self:
+            yield entry.event_id, entry
+    
+    def page(self, limit, cursor=None):
+        """
+        (entries, next_cursor) like EventManagementSystem's page methods,
+        with entries an {event_id: CatalogEntry} dict. The cursor is an
+        offset into this listing, which stays the same snapshot however
+        often the catalog is rebuilt meanwhile.
+        """
+        start = int(cursor or 0)
+        entries = {entry.event_id: entry for entry in self[start:start + limit]}
+        return entries, str(start + limit) if start + limit < len(self) else None
+
+
+class EventCatalog:
+    """
+    Read-optimized snapshot of the approved events for browsing.
+    
+    build() writes fixed-width records, a category table with posting
+    lists (record numbers in creation and in date order, overall and per
+    category) and a string heap to one file, which is then read through
+    mmap: listing, filtering by category and sorting by date only read
+    posting lists, and records are decoded as they are looked at.
+    Processes opening the same file share its pages; a rebuilt file
+    replaces the old one atomically and readers switch over on their
+    next listing. Registration counts, which don't change any listing,
+    are updated in place by set_registered().
+    """
+    
+    def __init__(self, path="events.catalog"):
+        self.path = path
+        self._lock = threading.Lock()
+        self._snapshot = None
+        self._stamp = None
+        # The file as this process last wrote it, and its record numbers
+        self._written = None
+        self._numbers = {}  # event_id -> record number
+    
+    def build(self, events):
+        """
+        Write the catalog for the approved events among events.
+        
+        Args:
+            events: Iterable of Event objects, in creation order
+        """
+        events = [event for event in events if event.is_approved]
+        heap = bytearray()
+        heap_index = {}
+        
+        def put(text):
+            location = heap_index.get(text)
+            if location is None:
+                data = text.encode()
+                location = heap_index[text] = (len(heap), len(data))
+                heap.extend(data)
+            return location
+        
+        categories = {}
+        records = bytearray()
+        for number, event in enumerate(events):
+            category = categories.setdefault(event.category, len(categories))
+            records.extend(RECORD.pack(
+                (event.date - EPOCH) // timedelta(microseconds=1), event.capacity,
+                len(event.registered_users), category,
+                *put(event.event_id), *put(event.title), *put(event.description),
+                *put(event.venue), *put(event.organizer_id)))
+        
+        by_date = sorted(range(len(events)), key=lambda number: events[number].date)
+        created = {category: [] for category in categories.values()}
+        dated = {category: [] for category in categories.values()}
+        for number, event in enumerate(events):
+            created[categories[event.category]].append(number)
+        for number in by_date:
+            dated[categories[events[number].category]].append(number)
+        # The last table entry lists every category
+        created[len(categories)] = list(range(len(events)))
+        dated[len(categories)] = by_date
+        
+        postings = bytearray()
+        
+        def put_postings(numbers):
+            offset = len(postings)
+            postings.extend(struct.pack(f"<{len(numbers)}I", *numbers))
+            return offset, len(numbers)
+        
+        table = bytearray()
+        for name, category in list(categories.items()) + [("", len(categories))]:
+            table.extend(CATEGORY.pack(*put(name), *put_postings(created[category]),
+                                       *put_postings(dated[category])))
+        
+        records_at = HEADER.size
+        table_at = records_at + len(records)
+        postings_at = table_at + len(table)
+        heap_at = postings_at + len(postings)
+        header = HEADER.pack(MAGIC, len(events), len(categories) + 1, records_at, table_at, postings_at, heap_at)
+        
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                for part in (header, records, table, postings, heap):
+                    f.write(part)
+            written = _stamp(os.stat(tmp_path))
+            # Can fail on Windows while listings still map the old file
+            os.replace(tmp_path, self.path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        with self._lock:
+            self._written = written
+            self._numbers = {event.event_id: number for number, event in enumerate(events)}
+    
+    def set_registered(self, event_id, count):
+        """
+        Change an event's registration count in the file in place. Readers
+        mapping it, in this process or another, see the new count the next
+        time they decode the record.
+        
+        Returns:
+            False if the file is not the one this process last built (say,
+            another process rebuilt it) or doesn't list the event; rebuild
+            it instead
+        """
+        with self._lock:
+            number = self._numbers.get(event_id)
+            if number is None:
+                return False
+            try:
+                with open(self.path, 'r+b') as f:
+                    if _stamp(os.fstat(f.fileno())) != self._written:
+                        return False
+                    f.seek(HEADER.size + number * RECORD.size + REGISTERED_AT)
+                    f.write(struct.pack("<I", count))
+                    f.flush()
+                    written = _stamp(os.fstat(f.fileno()))
+            except OSError:
+                return False
+            if self._stamp == self._written:
+                # The mapping is of this file, and shows the change already
+                self._stamp = written
+            self._written = written
+            return True
+    
+    def _open(self):
+        # (Re)map the file if it was rebuilt since it was last mapped
+        stamp = _stamp(os.stat(self.path))
+        if stamp == self._stamp:
+            return self._snapshot
+        with open(self.path, 'rb') as f:
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, count, category_count, records_at, table_at, postings_at, heap_at = HEADER.unpack_from(buf)
+        if magic != MAGIC:
+            raise ValueError(f"{self.path} is not an event catalog")
+        postings, names = {}, []
+        for i in range(category_count):
+            name_at, name_len, *category_postings = CATEGORY.unpack_from(buf, table_at + i * CATEGORY.size)
+            name = buf[heap_at + name_at:heap_at + name_at + name_len].decode()
+            names.append(name)
+            postings[None if i == category_count - 1 else name] = category_postings
+        # Listings made from the previous mapping keep it alive until they go
+        self._snapshot = _Snapshot(buf, records_at, postings_at, heap_at, postings, names)
+        self._stamp = stamp
+        return self._snapshot
+    
+    def listing(self, category=None, sort_by_date=False):
+        """
+        Approved events, optionally of one category, in creation or date order.
+        
+        Returns:
+            CatalogListing of CatalogEntry objects
+        """
+        with self._lock:
+            snapshot = self._open()
+        postings = snapshot.postings.get(category)
+        if postings is None:
+            return CatalogListing(snapshot, [])
+        offset, count = postings[2:] if sort_by_date else postings[:2]
+        start = snapshot.postings_at + offset
+        return CatalogListing(snapshot, memoryview(snapshot.buf)[start:start + 4 * count].cast("I"))
+    
+    def close(self):
+        with self._lock:
+            self._snapshot = None
+            self._stamp = None
+
+
+def _entry(snapshot, number):
+    buf, heap_at = snapshot.buf, snapshot.heap_at
+    date, capacity, registered, category, *strings = RECORD.unpack_from(
+        buf, snapshot.records_at + number * RECORD.size)
+    entry = CatalogEntry()
+    (entry.event_id, entry.title, entry.description, entry.venue, entry.organizer_id) = [
+        buf[heap_at + strings[i]:heap_at + strings[i] + strings[i + 1]].decode() for i in range(0, 10, 2)]
+    entry.category = snapshot.names[category]
+    entry.date = EPOCH + timedelta(microseconds=date)
+    entry.capacity = capacity
+    entry.registered_count = registered
+    return entry
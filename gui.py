@@ -1,1361 +1,1666 @@
-import tkinter as tk
-from tkinter import ttk, messagebox, simpledialog
-import json
-import os
-from datetime import datetime
-import sys
-import calendar
-from tkcalendar import DateEntry  # You might need to install this: pip install tkcalendar
-
-# Add the directory containing the event_management_system.py to Python's path
-# so we can import the code from it
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-
-# Import the event management system
-from main import User, Admin, Organizer, RegularUser, Event, DataStorage, UserManager, EventManager, EventManagementSystem
-
-class LoginFrame(tk.Frame):
-    def __init__(self, master, on_login, on_register):
-        super().__init__(master)
-        self.master = master
-        self.on_login = on_login
-        self.on_register = on_register
-        
-        # Configure the frame with gradient-like background
-        self.configure(bg="#e6f2ff", padx=550, pady=200)
-        
-        # Create widgets
-        self.create_widgets()
-        
-    def create_widgets(self):
-        # Create a decorative top banner
-        banner_frame = tk.Frame(self, bg="#4a86e8", padx=30, pady=20)
-        banner_frame.grid(row=0, column=0, sticky="ew", pady=(0, 25))
-        
-        # Center the title with shadow effect
-        title_frame = tk.Frame(banner_frame, bg="#4a86e8")
-        title_frame.pack(fill="x")
-        
-        # Shadow label (slightly offset)
-        ttk.Label(title_frame, text="Event Management System", 
-                 font=("Arial", 22, "bold"), foreground="#2a5698",
-                 background="#4a86e8").pack(anchor="center")
-        
-        # Main title label
-        ttk.Label(title_frame, text="Event Management System", 
-                 font=("Arial", 22, "bold"), foreground="white",
-                 background="#4a86e8").place(relx=0.5, rely=0.5, anchor="center")
-        
-        # Create a rounded content frame
-        content_frame = tk.Frame(self, bg="white", padx=40, pady=30,
-                               highlightbackground="#c9daf8", 
-                               highlightthickness=2)
-        content_frame.grid(row=1, column=0, pady=10)
-        
-        # Username with centered elements
-        username_frame = tk.Frame(content_frame, bg="white")
-        username_frame.pack(fill="x", pady=12)
-        ttk.Label(username_frame, text="Username", font=("Arial", 12),
-                 background="white").pack(anchor="center")
-        self.username_var = tk.StringVar()
-        username_entry = ttk.Entry(username_frame, textvariable=self.username_var, 
-                                  width=36, font=("Arial", 11))
-        username_entry.pack(anchor="center", pady=(5, 0))
-        username_entry.bind("<Return>", lambda event: self.login())
-        
-        # Password with centered elements
-        password_frame = tk.Frame(content_frame, bg="white")
-        password_frame.pack(fill="x", pady=12)
-        ttk.Label(password_frame, text="Password", font=("Arial", 12),
-                 background="white").pack(anchor="center")
-        self.password_var = tk.StringVar()
-        password_entry = ttk.Entry(password_frame, textvariable=self.password_var, 
-                                  show="•", width=36, font=("Arial", 11))
-        password_entry.pack(anchor="center", pady=(5, 0))
-        password_entry.bind("<Return>", lambda event: self.login())
-        
-        # Create a stylish button frame
-        button_frame = tk.Frame(content_frame, bg="white", pady=15)
-        button_frame.pack(fill="x")
-        
-        # Center the buttons in their container
-        btn_container = tk.Frame(button_frame, bg="white")
-        btn_container.pack(anchor="center")
-        
-        # Create custom button styles
-        style = ttk.Style()
-        style.configure("Login.TButton", font=("Arial", 12, "bold"))
-        style.configure("Register.TButton", font=("Arial", 12))
-        style.map("Login.TButton",
-                 foreground=[('pressed', 'white'), ('active', 'white')],
-                 background=[('pressed', '!disabled', '#3a7ca5'), ('active', '#4a86e8')])
-        
-        # Login Button with improved styling
-        login_btn = ttk.Button(btn_container, text="LOGIN", style="Login.TButton", 
-                             command=self.login, width=15)
-        login_btn.pack(side=tk.LEFT, padx=(0, 15))
-        
-        # Register Button with improved styling
-        register_btn = ttk.Button(btn_container, text="REGISTER", style="Register.TButton", 
-                                command=self.show_register, width=15)
-        register_btn.pack(side=tk.LEFT)
-        
-        # Add a decorative footer
-        footer_frame = tk.Frame(self, bg="#e6f2ff", pady=10)
-        footer_frame.grid(row=2, column=0, sticky="ew")
-        ttk.Label(footer_frame, text="© 2025 Event Management System", 
-                 foreground="#555555", background="#e6f2ff",
-                 font=("Arial", 9)).pack(anchor="center")
-    
-    def login(self):
-        username = self.username_var.get()
-        password = self.password_var.get()
-        
-        if not username or not password:
-            messagebox.showerror("Error", "Please enter username and password")
-            return
-        
-        self.on_login(username, password)
-    
-    def show_register(self):
-        self.on_register()
-
-
-class RegisterFrame(tk.Frame):
-    def __init__(self, master, on_register, on_back):
-        super().__init__(master)
-        self.master = master
-        self.on_register = on_register
-        self.on_back = on_back
-        
-        # Configure the frame with matching style
-        self.configure(bg="#e6f2ff", padx=550, pady=280)
-        
-        # Create widgets
-        self.create_widgets()
-        
-    def create_widgets(self):
-        # Create a decorative top banner
-        banner_frame = tk.Frame(self, bg="#4a86e8", padx=30, pady=20)
-        banner_frame.grid(row=0, column=0, sticky="ew", pady=(0, 25))
-        
-        # Center the title with shadow effect
-        title_frame = tk.Frame(banner_frame, bg="#4a86e8")
-        title_frame.pack(fill="x")
-        
-        # Shadow label (slightly offset)
-        ttk.Label(title_frame, text="Register New User", 
-                 font=("Arial", 22, "bold"), foreground="#2a5698",
-                 background="#4a86e8").pack(anchor="center")
-        
-        # Main title label
-        ttk.Label(title_frame, text="Register New User", 
-                 font=("Arial", 22, "bold"), foreground="white",
-                 background="#4a86e8").place(relx=0.5, rely=0.5, anchor="center")
-        
-        # Create a rounded content frame
-        content_frame = tk.Frame(self, bg="white", padx=40, pady=30,
-                               highlightbackground="#c9daf8", 
-                               highlightthickness=2)
-        content_frame.grid(row=1, column=0, pady=10)
-        
-        # Username with centered elements
-        username_frame = tk.Frame(content_frame, bg="white")
-        username_frame.pack(fill="x", pady=10)
-        ttk.Label(username_frame, text="Username", font=("Arial", 12),
-                 background="white").pack(anchor="center")
-        self.username_var = tk.StringVar()
-        ttk.Entry(username_frame, textvariable=self.username_var, 
-                 width=36, font=("Arial", 11)).pack(anchor="center", pady=(5, 0))
-        
-        # Password with centered elements
-        password_frame = tk.Frame(content_frame, bg="white")
-        password_frame.pack(fill="x", pady=10)
-        ttk.Label(password_frame, text="Password", font=("Arial", 12),
-                 background="white").pack(anchor="center")
-        self.password_var = tk.StringVar()
-        ttk.Entry(password_frame, textvariable=self.password_var, 
-                 show="•", width=36, font=("Arial", 11)).pack(anchor="center", pady=(5, 0))
-        
-        # Email with centered elements
-        email_frame = tk.Frame(content_frame, bg="white")
-        email_frame.pack(fill="x", pady=10)
-        ttk.Label(email_frame, text="Email", font=("Arial", 12),
-                 background="white").pack(anchor="center")
-        self.email_var = tk.StringVar()
-        ttk.Entry(email_frame, textvariable=self.email_var, 
-                 width=36, font=("Arial", 11)).pack(anchor="center", pady=(5, 0))
-        
-        # Role selection with better styling and centered
-        role_frame = tk.Frame(content_frame, bg="white")
-        role_frame.pack(fill="x", pady=10)
-        ttk.Label(role_frame, text="Select Your Role", font=("Arial", 12),
-                 background="white").pack(anchor="center", pady=(0, 5))
-        
-        # Center the radio buttons
-        role_options_frame = tk.Frame(role_frame, bg="white")
-        role_options_frame.pack(anchor="center")
-        
-        self.role_var = tk.StringVar(value="user")
-        
-        # Styled radio buttons
-        style = ttk.Style()
-        style.configure("TRadiobutton", background="white", font=("Arial", 11))
-        
-        ttk.Radiobutton(role_options_frame, text="Regular User", variable=self.role_var, 
-                      value="user", style="TRadiobutton").pack(side=tk.LEFT, padx=(0, 20))
-        ttk.Radiobutton(role_options_frame, text="Event Organizer", variable=self.role_var, 
-                      value="organizer", style="TRadiobutton").pack(side=tk.LEFT)
-        
-        # Button frame
-        button_frame = tk.Frame(content_frame, bg="white", pady=15)
-        button_frame.pack(fill="x")
-        
-        # Center the buttons in their container
-        btn_container = tk.Frame(button_frame, bg="white")
-        btn_container.pack(anchor="center")
-        
-        # Create custom button styles
-        style = ttk.Style()
-        style.configure("Register.TButton", font=("Arial", 12, "bold"))
-        style.configure("Back.TButton", font=("Arial", 12))
-        style.map("Register.TButton",
-                 foreground=[('pressed', 'white'), ('active', 'white')],
-                 background=[('pressed', '!disabled', '#3a7ca5'), ('active', '#4a86e8')])
-        
-        # Register Button with improved styling
-        register_btn = ttk.Button(btn_container, text="CREATE ACCOUNT", style="Register.TButton",
-                                command=self.register, width=18)
-        register_btn.pack(side=tk.LEFT, padx=(0, 15))
-        
-        # Back Button with improved styling
-        back_btn = ttk.Button(btn_container, text="BACK TO LOGIN", style="Back.TButton",
-                             command=self.on_back, width=18)
-        back_btn.pack(side=tk.LEFT)
-        
-        # Add a decorative footer
-        footer_frame = tk.Frame(self, bg="#e6f2ff", pady=10)
-        footer_frame.grid(row=2, column=0, sticky="ew")
-        ttk.Label(footer_frame, text="© 2025 Event Management System", 
-                 foreground="#555555", background="#e6f2ff",
-                 font=("Arial", 9)).pack(anchor="center")
-    
-    def register(self):
-        username = self.username_var.get()
-        password = self.password_var.get()
-        email = self.email_var.get()
-        role = self.role_var.get()
-        
-        if not username or not password or not email:
-            messagebox.showerror("Error", "Please fill all fields")
-            return
-        
-        self.on_register(username, password, email, role)
-
-class UserDashboard(tk.Frame):
-    def __init__(self, master, system, user_id, role, on_logout):
-        super().__init__(master)
-        self.master = master
-        self.system = system
-        self.user_id = user_id
-        self.role = role
-        self.on_logout = on_logout
-        
-        # Configure the frame
-        self.configure(padx=10, pady=10)
-        
-        # Create widgets
-        self.create_widgets()
-        
-    def create_widgets(self):
-        # Create a notebook (tabbed interface)
-        self.notebook = ttk.Notebook(self)
-        self.notebook.pack(fill='both', expand=True)
-        
-        # Create tabs based on role
-        self.create_common_tabs()
-        
-        if self.role == "admin":
-            self.create_admin_tabs()
-        elif self.role == "organizer":
-            self.create_organizer_tabs()
-        elif self.role == "user":
-            self.create_user_tabs()
-        
-        # Logout Button
-        ttk.Button(self, text="Logout", command=self.on_logout).pack(pady=10)
-    
-    def create_common_tabs(self):
-        # Available Events Tab
-        self.events_tab = ttk.Frame(self.notebook)
-        self.notebook.add(self.events_tab, text="Available Events")
-        
-        # Create a frame for filters
-        filter_frame = ttk.Frame(self.events_tab)
-        filter_frame.pack(fill='x', pady=5)
-        
-        # Category filter
-        ttk.Label(filter_frame, text="Category:").pack(side=tk.LEFT, padx=5)
-        self.category_var = tk.StringVar()
-        categories = ["All", "Technology", "Music", "Art", "Sports", "Education", "Other"]
-        ttk.Combobox(filter_frame, textvariable=self.category_var, values=categories, state="readonly").pack(side=tk.LEFT, padx=5)
-        self.category_var.set("All")
-        
-        # Date sort checkbox
-        self.date_sort_var = tk.BooleanVar(value=True)
-        ttk.Checkbutton(filter_frame, text="Sort by date", variable=self.date_sort_var).pack(side=tk.LEFT, padx=5)
-        
-        # Apply filter button
-        ttk.Button(filter_frame, text="Apply Filters", command=self.load_events).pack(side=tk.LEFT, padx=5)
-        
-        # Create the treeview
-        self.events_tree = ttk.Treeview(self.events_tab, columns=("Title", "Date", "Venue", "Category", "Available"))
-        self.events_tree.pack(fill='both', expand=True, padx=5, pady=5)
-        
-        # Configure the treeview
-        self.events_tree.heading("#0", text="ID")
-        self.events_tree.heading("Title", text="Title")
-        self.events_tree.heading("Date", text="Date")
-        self.events_tree.heading("Venue", text="Venue")
-        self.events_tree.heading("Category", text="Category")
-        self.events_tree.heading("Available", text="Available Seats")
-        
-        self.events_tree.column("#0", width=50, stretch=tk.NO)
-        self.events_tree.column("Title", width=200, stretch=tk.YES)
-        self.events_tree.column("Date", width=150, stretch=tk.NO)
-        self.events_tree.column("Venue", width=150, stretch=tk.YES)
-        self.events_tree.column("Category", width=100, stretch=tk.NO)
-        self.events_tree.column("Available", width=100, stretch=tk.NO)
-        
-        # Add a scrollbar
-        scrollbar = ttk.Scrollbar(self.events_tab, orient="vertical", command=self.events_tree.yview)
-        scrollbar.pack(side=tk.RIGHT, fill='y')
-        self.events_tree.configure(yscrollcommand=scrollbar.set)
-        
-        # Add a button frame
-        button_frame = ttk.Frame(self.events_tab)
-        button_frame.pack(fill='x', pady=5)
-        
-        # View details button
-        ttk.Button(button_frame, text="View Details", command=self.view_event_details).pack(side=tk.LEFT, padx=5)
-        
-        # Register/unregister button (only for regular users)
-        if self.role == "user":
-            ttk.Button(button_frame, text="Register for Event", command=self.register_for_event).pack(side=tk.LEFT, padx=5)
-            ttk.Button(button_frame, text="Unregister from Event", command=self.unregister_from_event).pack(side=tk.LEFT, padx=5)
-        
-        # Load events
-        self.load_events()
-    
-    def create_admin_tabs(self):
-    # Apply a theme for better appearance
-        style = ttk.Style()
-        
-        # Configure colors for UI elements
-        bg_color = "#f5f7fa"  # Light blue-gray background
-        header_bg = "#4a6fa5"  # Darker blue for headers
-        header_fg = "#ffffff"  # White text for headers
-        btn_color = "#000"  # Blue for buttons
-        
-        # Configure styles
-        style.configure("Treeview", rowheight=25, font=('Helvetica', 10), background=bg_color, fieldbackground=bg_color)
-        style.configure("Treeview.Heading", font=('Helvetica', 10, 'bold'), background=header_bg, foreground=header_fg)
-        style.map('Treeview', background=[('selected', '#007bff')], foreground=[('selected', 'white')])
-        
-        # Configure TFrame with background color
-        style.configure("MainFrame.TFrame", background=bg_color)
-        style.configure("Header.TFrame", background=header_bg)
-        style.configure("Header.TLabel", background=header_bg, foreground=header_fg, font=('Helvetica', 12, 'bold'))
-        style.configure("TButton", background=btn_color)
-        
-        # Users Management Tab
-        users_tab = ttk.Frame(self.notebook, padding=10, style="MainFrame.TFrame")
-        self.notebook.add(users_tab, text="Manage Users")
-        
-        # Title section with colored background
-        header_frame = ttk.Frame(users_tab, style="Header.TFrame")
-        header_frame.pack(fill='x', pady=(0, 10))
-        ttk.Label(header_frame, text="User Management", style="Header.TLabel", padding=5).pack(anchor='w')
-        
-        # Create frame for treeview and scrollbar
-        tree_frame = ttk.Frame(users_tab, style="MainFrame.TFrame")
-        tree_frame.pack(fill='both', expand=True)
-        
-        # Create the treeview
-        self.users_tree = ttk.Treeview(tree_frame, columns=("Username", "Email", "Role", "Status"))
-        
-        # Configure the treeview
-        self.users_tree.heading("#0", text="ID")
-        self.users_tree.heading("Username", text="Username")
-        self.users_tree.heading("Email", text="Email")
-        self.users_tree.heading("Role", text="Role")
-        self.users_tree.heading("Status", text="Status")
-        
-        self.users_tree.column("#0", width=50, stretch=tk.NO)
-        self.users_tree.column("Username", width=150, stretch=tk.YES)
-        self.users_tree.column("Email", width=200, stretch=tk.YES)
-        self.users_tree.column("Role", width=100, stretch=tk.NO)
-        self.users_tree.column("Status", width=100, stretch=tk.NO)
-        
-        # Apply alternating row colors (zebra stripes)
-        self.users_tree.tag_configure('odd', background='#e6eef7')
-        self.users_tree.tag_configure('even', background='#ffffff')
-        
-        # Add scrollbars
-        y_scrollbar = ttk.Scrollbar(tree_frame, orient="vertical", command=self.users_tree.yview)
-        x_scrollbar = ttk.Scrollbar(tree_frame, orient="horizontal", command=self.users_tree.xview)
-        
-        # Configure the treeview to use the scrollbars
-        self.users_tree.configure(yscrollcommand=y_scrollbar.set, xscrollcommand=x_scrollbar.set)
-        
-        # Pack the treeview and scrollbars
-        y_scrollbar.pack(side=tk.RIGHT, fill='y')
-        x_scrollbar.pack(side=tk.BOTTOM, fill='x')
-        self.users_tree.pack(side=tk.LEFT, fill='both', expand=True)
-        
-        # Add a button frame with padding and background
-        button_frame = ttk.Frame(users_tab, style="MainFrame.TFrame")
-        button_frame.pack(fill='x', pady=10)
-        
-        # Define button style
-        style.configure("Action.TButton", background="black", foreground="white", font=('Helvetica', 10))
-        
-        # Add buttons with consistent styling
-        style.configure("BlackButton.TButton", background="black", foreground="black", font=('Helvetica', 10))
-        ttk.Button(button_frame, text="Delete User", command=self.delete_user, width=15, style="BlackButton.TButton").pack(side=tk.LEFT, padx=5)
-        ttk.Button(button_frame, text="Refresh", command=self.load_users, width=15, style="BlackButton.TButton").pack(side=tk.LEFT, padx=5)
-        # Override load_users to apply row tags
-        original_load_users = self.load_users
-        def styled_load_users(*args, **kwargs):
-            original_load_users(*args, **kwargs)
-            # Apply tags to rows
-            for i, item in enumerate(self.users_tree.get_children()):
-                tag = 'even' if i % 2 == 0 else 'odd'
-                self.users_tree.item(item, tags=(tag,))
-        
-        self.load_users = styled_load_users
-        
-        # Load users
-        self.load_users()
-        
-        # Event Approval Tab
-        approval_tab = ttk.Frame(self.notebook, padding=10, style="MainFrame.TFrame")
-        self.notebook.add(approval_tab, text="Event Approvals")
-        
-        # Title section with colored background
-        approval_header_frame = ttk.Frame(approval_tab, style="Header.TFrame")
-        approval_header_frame.pack(fill='x', pady=(0, 10))
-        ttk.Label(approval_header_frame, text="Event Approval Queue", style="Header.TLabel", padding=5).pack(anchor='w')
-        
-        # Create frame for approval treeview and scrollbar
-        approval_tree_frame = ttk.Frame(approval_tab, style="MainFrame.TFrame")
-        approval_tree_frame.pack(fill='both', expand=True)
-        
-        # Create the treeview
-        self.approval_tree = ttk.Treeview(approval_tree_frame, columns=("Title", "Organizer", "Date", "Category"))
-        
-        # Configure the treeview
-        self.approval_tree.heading("#0", text="ID")
-        self.approval_tree.heading("Title", text="Title")
-        self.approval_tree.heading("Organizer", text="Organizer")
-        self.approval_tree.heading("Date", text="Date")
-        self.approval_tree.heading("Category", text="Category")
-        
-        self.approval_tree.column("#0", width=50, stretch=tk.NO)
-        self.approval_tree.column("Title", width=200, stretch=tk.YES)
-        self.approval_tree.column("Organizer", width=150, stretch=tk.YES)
-        self.approval_tree.column("Date", width=150, stretch=tk.NO)
-        self.approval_tree.column("Category", width=100, stretch=tk.NO)
-        
-        # Apply alternating row colors (zebra stripes)
-        self.approval_tree.tag_configure('odd', background='#e6eef7')
-        self.approval_tree.tag_configure('even', background='#ffffff')
-        
-        # Add scrollbars
-        approval_y_scrollbar = ttk.Scrollbar(approval_tree_frame, orient="vertical", command=self.approval_tree.yview)
-        approval_x_scrollbar = ttk.Scrollbar(approval_tree_frame, orient="horizontal", command=self.approval_tree.xview)
-        
-        # Configure the treeview to use the scrollbars
-        self.approval_tree.configure(yscrollcommand=approval_y_scrollbar.set, xscrollcommand=approval_x_scrollbar.set)
-        
-        # Pack the treeview and scrollbars
-        approval_y_scrollbar.pack(side=tk.RIGHT, fill='y')
-        approval_x_scrollbar.pack(side=tk.BOTTOM, fill='x')
-        self.approval_tree.pack(side=tk.LEFT, fill='both', expand=True)
-        
-        # Add a button frame with padding and background
-        approval_button_frame = ttk.Frame(approval_tab, style="MainFrame.TFrame")
-        approval_button_frame.pack(fill='x', pady=10)
-        
-        # Add buttons with consistent styling
-        style.configure("BlackButton.TButton", background="black", foreground="black", font=('Helvetica', 10))
-        
-        ttk.Button(approval_button_frame, text="Approve Event", command=self.approve_event, width=15, style="BlackButton.TButton").pack(side=tk.LEFT, padx=5)
-        ttk.Button(approval_button_frame, text="View Details", command=self.view_approval_details, width=15, style="BlackButton.TButton").pack(side=tk.LEFT, padx=5)
-        ttk.Button(approval_button_frame, text="Refresh", command=self.load_unapproved_events, width=15, style="BlackButton.TButton").pack(side=tk.LEFT, padx=5)
-        
-        # Override load_unapproved_events to apply row tags
-        original_load_events = self.load_unapproved_events
-        def styled_load_events(*args, **kwargs):
-            original_load_events(*args, **kwargs)
-            # Apply tags to rows
-            for i, item in enumerate(self.approval_tree.get_children()):
-                tag = 'even' if i % 2 == 0 else 'odd'
-                self.approval_tree.item(item, tags=(tag,))
-        
-        self.load_unapproved_events = styled_load_events
-        
-        # Load unapproved events
-        self.load_unapproved_events()
-    
-    def create_organizer_tabs(self):
-        # My Events Tab
-        my_events_tab = ttk.Frame(self.notebook)
-        self.notebook.add(my_events_tab, text="My Events")
-        
-        # Create the treeview
-        self.my_events_tree = ttk.Treeview(my_events_tab, columns=("Title", "Date", "Status", "Registered"))
-        self.my_events_tree.pack(fill='both', expand=True, padx=5, pady=5)
-        
-        # Configure the treeview
-        self.my_events_tree.heading("#0", text="ID")
-        self.my_events_tree.heading("Title", text="Title")
-        self.my_events_tree.heading("Date", text="Date")
-        self.my_events_tree.heading("Status", text="Status")
-        self.my_events_tree.heading("Registered", text="Registered Users")
-        
-        self.my_events_tree.column("#0", width=50, stretch=tk.NO)
-        self.my_events_tree.column("Title", width=200, stretch=tk.YES)
-        self.my_events_tree.column("Date", width=150, stretch=tk.NO)
-        self.my_events_tree.column("Status", width=100, stretch=tk.NO)
-        self.my_events_tree.column("Registered", width=120, stretch=tk.NO)
-        
-        # Add a scrollbar
-        scrollbar = ttk.Scrollbar(my_events_tab, orient="vertical", command=self.my_events_tree.yview)
-        scrollbar.pack(side=tk.RIGHT, fill='y')
-        self.my_events_tree.configure(yscrollcommand=scrollbar.set)
-        
-        # Add a button frame
-        button_frame = ttk.Frame(my_events_tab)
-        button_frame.pack(fill='x', pady=5)
-        
-        # Add buttons
-        ttk.Button(button_frame, text="Create New Event", command=self.create_event).pack(side=tk.LEFT, padx=5)
-        ttk.Button(button_frame, text="Edit Event", command=self.edit_event).pack(side=tk.LEFT, padx=5)
-        ttk.Button(button_frame, text="View Details", command=self.view_my_event_details).pack(side=tk.LEFT, padx=5)
-        ttk.Button(button_frame, text="View Registrations", command=self.view_registrations).pack(side=tk.LEFT, padx=5)
-        ttk.Button(button_frame, text="Refresh", command=self.load_my_events).pack(side=tk.LEFT, padx=5)
-        
-        # Load my events
-        self.load_my_events()
-    
-    def create_user_tabs(self):
-        # My Registrations Tab
-        registrations_tab = ttk.Frame(self.notebook)
-        self.notebook.add(registrations_tab, text="My Registrations")
-        
-        # Create the treeview
-        self.registrations_tree = ttk.Treeview(registrations_tab, columns=("Title", "Date", "Venue", "Category"))
-        self.registrations_tree.pack(fill='both', expand=True, padx=5, pady=5)
-        
-        # Configure the treeview
-        self.registrations_tree.heading("#0", text="ID")
-        self.registrations_tree.heading("Title", text="Title")
-        self.registrations_tree.heading("Date", text="Date")
-        self.registrations_tree.heading("Venue", text="Venue")
-        self.registrations_tree.heading("Category", text="Category")
-        
-        self.registrations_tree.column("#0", width=50, stretch=tk.NO)
-        self.registrations_tree.column("Title", width=200, stretch=tk.YES)
-        self.registrations_tree.column("Date", width=150, stretch=tk.NO)
-        self.registrations_tree.column("Venue", width=150, stretch=tk.YES)
-        self.registrations_tree.column("Category", width=100, stretch=tk.NO)
-        
-        # Add a scrollbar
-        scrollbar = ttk.Scrollbar(registrations_tab, orient="vertical", command=self.registrations_tree.yview)
-        scrollbar.pack(side=tk.RIGHT, fill='y')
-        self.registrations_tree.configure(yscrollcommand=scrollbar.set)
-        
-        # Add a button frame
-        button_frame = ttk.Frame(registrations_tab)
-        button_frame.pack(fill='x', pady=5)
-        
-        # Add buttons
-        ttk.Button(button_frame, text="View Details", command=self.view_registration_details).pack(side=tk.LEFT, padx=5)
-        ttk.Button(button_frame, text="Unregister", command=self.unregister_from_registration).pack(side=tk.LEFT, padx=5)
-        ttk.Button(button_frame, text="Refresh", command=self.load_registrations).pack(side=tk.LEFT, padx=5)
-        
-        # Load registrations
-        self.load_registrations()
-    
-    def load_events(self):
-        # Clear existing items
-        self.events_tree.delete(*self.events_tree.get_children())
-        
-        # Get selected category
-        category = self.category_var.get()
-        if category == "All":
-            category = None
-        
-        # Get sort preference
-        sort_by_date = self.date_sort_var.get()
-        
-        # Get events from the system
-        events = self.system.get_available_events(category=category, sort_by_date=sort_by_date)
-        
-        # Populate the treeview
-        for event_id, event in events.items():
-            seats = event.seats_available()
-            date_str = event.date.strftime("%Y-%m-%d %H:%M")
-            
-            self.events_tree.insert("", "end", event_id, text=event_id[:8],
-                                   values=(event.title, date_str, event.venue, 
-                                           event.category, f"{seats}/{event.capacity}"))
-    
-    def load_users(self):
-        # Clear existing items
-        self.users_tree.delete(*self.users_tree.get_children())
-        
-        # Get users from the system
-        users = self.system.user_manager.get_all_users()
-        
-        # Populate the treeview
-        for user_id, user in users.items():
-            status = "Active" if user.is_active else "Inactive"
-            
-            self.users_tree.insert("", "end", user_id, text=user_id[:8],
-                                  values=(user.username, user.email, user.get_role(), status))
-    
-    def load_unapproved_events(self):
-        # Clear existing items
-        self.approval_tree.delete(*self.approval_tree.get_children())
-        
-        # Get unapproved events from the system
-        events = self.system.event_manager.get_unapproved_events()
-        
-        # Populate the treeview
-        for event_id, event in events.items():
-            date_str = event.date.strftime("%Y-%m-%d %H:%M")
-            
-            # Get organizer info
-            organizer = self.system.user_manager.get_user(event.organizer_id)
-            organizer_name = organizer.username if organizer else "Unknown"
-            
-            self.approval_tree.insert("", "end", event_id, text=event_id[:8],
-                                     values=(event.title, organizer_name, date_str, event.category))
-    
-    def load_my_events(self):
-        # Clear existing items
-        self.my_events_tree.delete(*self.my_events_tree.get_children())
-        
-        # Get organizer's events from the system
-        events = self.system.get_user_events(self.user_id)
-        
-        # Populate the treeview
-        for event_id, event in events.items():
-            date_str = event.date.strftime("%Y-%m-%d %H:%M")
-            status = "Approved" if event.is_approved else "Pending"
-            registered = len(event.registered_users)
-            
-            self.my_events_tree.insert("", "end", event_id, text=event_id[:8],
-                                      values=(event.title, date_str, status, 
-                                              f"{registered}/{event.capacity}"))
-    
-    def load_registrations(self):
-        # Clear existing items
-        self.registrations_tree.delete(*self.registrations_tree.get_children())
-        
-        # Get user's registered events
-        registration_ids = self.system.get_user_registrations(self.user_id)
-        
-        # Populate the treeview
-        for event_id in registration_ids:
-            event = self.system.event_manager.get_event(event_id)
-            if event and event.is_approved:
-                date_str = event.date.strftime("%Y-%m-%d %H:%M")
-                
-                self.registrations_tree.insert("", "end", event_id, text=event_id[:8],
-                                              values=(event.title, date_str, event.venue, event.category))
-    
-    def view_event_details(self):
-        selected_item = self.events_tree.selection()
-        if not selected_item:
-            messagebox.showinfo("Info", "Please select an event to view")
-            return
-        
-        event_id = selected_item[0]
-        event = self.system.event_manager.get_event(event_id)
-        
-        if event:
-            details = f"Title: {event.title}\n\n"
-            details += f"Description: {event.description}\n\n"
-            details += f"Date: {event.date.strftime('%Y-%m-%d %H:%M')}\n\n"
-            details += f"Venue: {event.venue}\n\n"
-            details += f"Category: {event.category}\n\n"
-            details += f"Available Seats: {event.seats_available()}/{event.capacity}"
-            
-            # Create a details window
-            details_window = tk.Toplevel(self.master)
-            details_window.title(f"Event Details: {event.title}")
-            details_window.geometry("400x400")
-            
-            # Make the window modal
-            details_window.transient(self.master)
-            details_window.grab_set()
-            
-            # Add a text widget to display details
-            text_widget = tk.Text(details_window, wrap="word", padx=10, pady=10)
-            text_widget.insert("1.0", details)
-            text_widget.config(state="disabled")
-            text_widget.pack(fill="both", expand=True)
-            
-            # Add a close button
-            ttk.Button(details_window, text="Close", command=details_window.destroy).pack(pady=10)
-    
-    def register_for_event(self):
-        selected_item = self.events_tree.selection()
-        if not selected_item:
-            messagebox.showinfo("Info", "Please select an event to register for")
-            return
-        
-        event_id = selected_item[0]
-        
-        # Check if the user is already registered
-        user = self.system.user_manager.get_user(self.user_id)
-        if isinstance(user, RegularUser) and event_id in user.registered_events:
-            messagebox.showinfo("Info", "You are already registered for this event")
-            return
-        
-        # Register for the event
-        success = self.system.register_for_event(event_id, self.user_id)
-        
-        if success:
-            messagebox.showinfo("Success", "Registration successful")
-            # Refresh events and registrations
-            self.load_events()
-            if hasattr(self, 'load_registrations'):
-                self.load_registrations()
-        else:
-            messagebox.showerror("Error", "Registration failed. The event might be full.")
-    
-    def unregister_from_event(self):
-        selected_item = self.events_tree.selection()
-        if not selected_item:
-            messagebox.showinfo("Info", "Please select an event to unregister from")
-            return
-        
-        event_id = selected_item[0]
-        
-        # Check if the user is registered
-        user = self.system.user_manager.get_user(self.user_id)
-        if not isinstance(user, RegularUser) or event_id not in user.registered_events:
-            messagebox.showinfo("Info", "You are not registered for this event")
-            return
-        
-        # Unregister from the event
-        success = self.system.unregister_from_event(event_id, self.user_id)
-        
-        if success:
-            messagebox.showinfo("Success", "Unregistration successful")
-            # Refresh events and registrations
-            self.load_events()
-            if hasattr(self, 'load_registrations'):
-                self.load_registrations()
-        else:
-            messagebox.showerror("Error", "Unregistration failed")
-    
-    def delete_user(self):
-        selected_item = self.users_tree.selection()
-        if not selected_item:
-            messagebox.showinfo("Info", "Please select a user to delete")
-            return
-        
-        user_id = selected_item[0]
-        
-        # Confirm deletion
-        confirm = messagebox.askyesno("Confirm", "Are you sure you want to delete this user?")
-        
-        if confirm:
-            success, msg = self.system.delete_user(user_id, self.user_id)
-            
-            if success:
-                messagebox.showinfo("Success", msg)
-                # Refresh users list
-                self.load_users()
-                # Also refresh events as they might have changed
-                self.load_events()
-                if hasattr(self, 'load_unapproved_events'):
-                    self.load_unapproved_events()
-            else:
-                messagebox.showerror("Error", msg)
-    
-    def approve_event(self):
-        selected_item = self.approval_tree.selection()
-        if not selected_item:
-            messagebox.showinfo("Info", "Please select an event to approve")
-            return
-        
-        event_id = selected_item[0]
-        
-        # Approve the event
-        success = self.system.approve_event(event_id, self.user_id)
-        
-        if success:
-            messagebox.showinfo("Success", "Event approved successfully")
-            # Refresh unapproved events and available events
-            self.load_unapproved_events()
-            self.load_events()
-        else:
-            messagebox.showerror("Error", "Event approval failed")
-    
-    def view_approval_details(self):
-        selected_item = self.approval_tree.selection()
-        if not selected_item:
-            messagebox.showinfo("Info", "Please select an event to view")
-            return
-        
-        event_id = selected_item[0]
-        event = self.system.event_manager.get_event(event_id)
-        
-        if event:
-            # Get organizer info
-            organizer = self.system.user_manager.get_user(event.organizer_id)
-            organizer_name = organizer.username if organizer else "Unknown"
-            
-            details = f"Title: {event.title}\n\n"
-            details += f"Description: {event.description}\n\n"
-            details += f"Date: {event.date.strftime('%Y-%m-%d %H:%M')}\n\n"
-            details += f"Venue: {event.venue}\n\n"
-            details += f"Category: {event.category}\n\n"
-            details += f"Capacity: {event.capacity}\n\n"
-            details += f"Organizer: {organizer_name}"
-            
-            # Create a details window
-            details_window = tk.Toplevel(self.master)
-            details_window.title(f"Event Details: {event.title}")
-            details_window.geometry("400x400")
-            
-            # Make the window modal
-            details_window.transient(self.master)
-            details_window.grab_set()
-            
-            # Add a text widget to display details
-            text_widget = tk.Text(details_window, wrap="word", padx=10, pady=10)
-            text_widget.insert("1.0", details)
-            text_widget.config(state="disabled")
-            text_widget.pack(fill="both", expand=True)
-            
-            # Add buttons
-            button_frame = ttk.Frame(details_window)
-            button_frame.pack(fill='x', pady=10)
-            
-            ttk.Button(button_frame, text="Approve", command=lambda: [self.system.approve_event(event_id, self.user_id), details_window.destroy(), self.load_unapproved_events(), self.load_events()]).pack(side=tk.LEFT, padx=5)
-            ttk.Button(button_frame, text="Close", command=details_window.destroy).pack(side=tk.LEFT, padx=5)
-    
-    def create_event(self):
-        # Create a window for creating a new event
-        create_window = tk.Toplevel(self.master)
-        create_window.title("Create New Event")
-        create_window.geometry("500x600")
-        
-        # Make the window modal
-        create_window.transient(self.master)
-        create_window.grab_set()
-        
-        # Create a form
-        form_frame = ttk.Frame(create_window, padding=20)
-        form_frame.pack(fill='both', expand=True)
-        
-        # Title
-        ttk.Label(form_frame, text="Title:").grid(row=0, column=0, sticky="w", pady=5)
-        title_var = tk.StringVar()
-        ttk.Entry(form_frame, textvariable=title_var, width=40).grid(row=0, column=1, sticky="w", pady=5)
-        
-        # Description
-        ttk.Label(form_frame, text="Description:").grid(row=1, column=0, sticky="nw", pady=5)
-        description_text = tk.Text(form_frame, width=40, height=5)
-        description_text.grid(row=1, column=1, sticky="w", pady=5)
-        
-        # Date
-        ttk.Label(form_frame, text="Date:").grid(row=2, column=0, sticky="w", pady=5)
-        date_frame = ttk.Frame(form_frame)
-        date_frame.grid(row=2, column=1, sticky="w", pady=5)
-        
-        # Use DateEntry for date
-        date_picker = DateEntry(date_frame, width=12, background='darkblue',
-                                foreground='white', borderwidth=2, date_pattern='yyyy-mm-dd')
-        date_picker.pack(side=tk.LEFT)
-        
-        # Time selection
-        ttk.Label(date_frame, text="  Time:").pack(side=tk.LEFT)
-        hour_var = tk.StringVar(value="12")
-        ttk.Combobox(date_frame, textvariable=hour_var, values=[str(i).zfill(2) for i in range(24)], 
-                    width=3, state="readonly").pack(side=tk.LEFT)
-        ttk.Label(date_frame, text=":").pack(side=tk.LEFT)
-        minute_var = tk.StringVar(value="00")
-        ttk.Combobox(date_frame, textvariable=minute_var, values=[str(i).zfill(2) for i in range(0, 60, 5)], 
-                    width=3, state="readonly").pack(side=tk.LEFT)
-        
-        # Venue
-        ttk.Label(form_frame, text="Venue:").grid(row=3, column=0, sticky="w", pady=5)
-        venue_var = tk.StringVar()
-        ttk.Entry(form_frame, textvariable=venue_var, width=40).grid(row=3, column=1, sticky="w", pady=5)
-        
-        # Capacity
-        ttk.Label(form_frame, text="Capacity:").grid(row=4, column=0, sticky="w", pady=5)
-        capacity_var = tk.IntVar(value=50)
-        ttk.Spinbox(form_frame, from_=1, to=1000, textvariable=capacity_var, width=10).grid(row=4, column=1, sticky="w", pady=5)
-        
-        # Category
-        ttk.Label(form_frame, text="Category:").grid(row=5, column=0, sticky="w", pady=5)
-        category_var = tk.StringVar(value="Technology")
-        categories = ["Technology", "Music", "Art", "Sports", "Education", "Other"]
-        ttk.Combobox(form_frame, textvariable=category_var, values=categories, width=20, state="readonly").grid(row=5, column=1, sticky="w", pady=5)
-        
-        # Create button
-        def submit_event():
-            title = title_var.get()
-            description = description_text.get("1.0", "end-1c")
-            date_str = date_picker.get()
-            hour = hour_var.get()
-            minute = minute_var.get()
-            venue = venue_var.get()
-            capacity = capacity_var.get()
-            category = category_var.get()
-            
-            if not title or not description or not venue:
-                messagebox.showerror("Error", "Please fill all required fields")
-                return
-            
-            # Create a datetime object
-            try:
-                event_date = datetime.strptime(f"{date_str} {hour}:{minute}", "%Y-%m-%d %H:%M")
-                if event_date < datetime.now():
-                    messagebox.showerror("Error", "Event date cannot be in the past")
-                    return
-            except ValueError:
-                messagebox.showerror("Error", "Invalid date format")
-                return
-            
-            # Create the event
-            event_id, msg = self.system.create_event(title, description, event_date, venue, capacity, category, self.user_id)
-            
-            if event_id:
-                messagebox.showinfo("Success", "Event created successfully")
-                create_window.destroy()
-                self.load_my_events()
-                # If admin, also refresh unapproved events
-                if hasattr(self, 'load_unapproved_events'):
-                    self.load_unapproved_events()
-            else:
-                messagebox.showerror("Error", msg)
-        
-        ttk.Button(form_frame, text="Create Event", command=submit_event).grid(row=6, column=0, columnspan=2, pady=20)
-    
-    def view_my_event_details(self):
-        selected_item = self.my_events_tree.selection()
-        if not selected_item:
-            messagebox.showinfo("Info", "Please select an event to view")
-            return
-        
-        event_id = selected_item[0]
-        event = self.system.event_manager.get_event(event_id)
-        
-        if event:
-            details = f"Title: {event.title}\n\n"
-            details += f"Description: {event.description}\n\n"
-            details += f"Date: {event.date.strftime('%Y-%m-%d %H:%M')}\n\n"
-            details += f"Venue: {event.venue}\n\n"
-            details += f"Category: {event.category}\n\n"
-            details += f"Capacity: {event.capacity}\n\n"
-            details += f"Status: {'Approved' if event.is_approved else 'Pending Approval'}\n\n"
-            details += f"Registered Users: {len(event.registered_users)}/{event.capacity}"
-            
-            # Create a details window
-            details_window = tk.Toplevel(self.master)
-            details_window.title(f"Event Details: {event.title}")
-            details_window.geometry("400x400")
-            
-            # Make the window modal
-            details_window.transient(self.master)
-            details_window.grab_set()
-            
-            # Add a text widget to display details
-            text_widget = tk.Text(details_window, wrap="word", padx=10, pady=10)
-            text_widget.insert("1.0", details)
-            text_widget.config(state="disabled")
-            text_widget.pack(fill="both", expand=True)
-            
-            # Add a close button
-            ttk.Button(details_window, text="Close", command=details_window.destroy).pack(pady=10)
-    
-    def view_registrations(self):
-        selected_item = self.my_events_tree.selection()
-        if not selected_item:
-            messagebox.showinfo("Info", "Please select an event to view registrations")
-            return
-        
-        event_id = selected_item[0]
-        event = self.system.event_manager.get_event(event_id)
-        
-        if event:
-            # Create a registrations window
-            reg_window = tk.Toplevel(self.master)
-            reg_window.title(f"Registrations for: {event.title}")
-            reg_window.geometry("400x400")
-            
-            # Make the window modal
-            reg_window.transient(self.master)
-            reg_window.grab_set()
-            
-            # Create a treeview for users
-            reg_tree = ttk.Treeview(reg_window, columns=("Username", "Email"))
-            reg_tree.pack(fill='both', expand=True, padx=10, pady=10)
-            
-            # Configure the treeview
-            reg_tree.heading("#0", text="ID")
-            reg_tree.heading("Username", text="Username")
-            reg_tree.heading("Email", text="Email")
-            
-            reg_tree.column("#0", width=50, stretch=tk.NO)
-            reg_tree.column("Username", width=150, stretch=tk.YES)
-            reg_tree.column("Email", width=200, stretch=tk.YES)
-            
-            # Add a scrollbar
-            scrollbar = ttk.Scrollbar(reg_window, orient="vertical", command=reg_tree.yview)
-            scrollbar.pack(side=tk.RIGHT, fill='y')
-            reg_tree.configure(yscrollcommand=scrollbar.set)
-            
-            # Populate the treeview with registered users
-            for user_id in event.registered_users:
-                user = self.system.user_manager.get_user(user_id)
-                if user:
-                    reg_tree.insert("", "end", user_id, text=user_id[:8],
-                                   values=(user.username, user.email))
-            
-            # Add a close button
-            ttk.Button(reg_window, text="Close", command=reg_window.destroy).pack(pady=10)
-    
-    def view_registration_details(self):
-        selected_item = self.registrations_tree.selection()
-        if not selected_item:
-            messagebox.showinfo("Info", "Please select a registration to view")
-            return
-        
-        event_id = selected_item[0]
-        event = self.system.event_manager.get_event(event_id)
-        
-        if event:
-            details = f"Title: {event.title}\n\n"
-            details += f"Description: {event.description}\n\n"
-            details += f"Date: {event.date.strftime('%Y-%m-%d %H:%M')}\n\n"
-            details += f"Venue: {event.venue}\n\n"
-            details += f"Category: {event.category}\n\n"
-            details += f"Available Seats: {event.seats_available()}/{event.capacity}"
-            
-            # Create a details window
-            details_window = tk.Toplevel(self.master)
-            details_window.title(f"Event Details: {event.title}")
-            details_window.geometry("400x400")
-            
-            # Make the window modal
-            details_window.transient(self.master)
-            details_window.grab_set()
-            
-            # Add a text widget to display details
-            text_widget = tk.Text(details_window, wrap="word", padx=10, pady=10)
-            text_widget.insert("1.0", details)
-            text_widget.config(state="disabled")
-            text_widget.pack(fill="both", expand=True)
-            
-            # Add a close button
-            ttk.Button(details_window, text="Close", command=details_window.destroy).pack(pady=10)
-    
-    def unregister_from_registration(self):
-        selected_item = self.registrations_tree.selection()
-        if not selected_item:
-            messagebox.showinfo("Info", "Please select a registration to unregister from")
-            return
-        
-        event_id = selected_item[0]
-        
-        # Confirm unregistration
-        confirm = messagebox.askyesno("Confirm", "Are you sure you want to unregister from this event?")
-        
-        if confirm:
-            # Unregister from the event
-            success = self.system.unregister_from_event(event_id, self.user_id)
-            
-            if success:
-                messagebox.showinfo("Success", "Unregistration successful")
-                # Refresh registrations and available events
-                self.load_registrations()
-                self.load_events()
-            else:
-                messagebox.showerror("Error", "Unregistration failed")
-    
-    def edit_event(self):
-        selected_item = self.my_events_tree.selection()
-        if not selected_item:
-            messagebox.showinfo("Info", "Please select an event to edit")
-            return
-        
-        event_id = selected_item[0]
-        event = self.system.event_manager.get_event(event_id)
-        
-        if not event:
-            messagebox.showerror("Error", "Event not found")
-            return
-            
-        # Check if user is the organizer of this event
-        if event.organizer_id != self.user_id:
-            messagebox.showerror("Error", "You can only edit your own events")
-            return
-        
-        # Create a window for editing the event with improved style
-        edit_window = tk.Toplevel(self.master)
-        edit_window.title(f"Edit Event: {event.title}")
-        edit_window.geometry("550x650")
-        edit_window.configure(bg="#f5f7fa")  # Light blue-gray background
-        
-        # Make the window modal
-        edit_window.transient(self.master)
-        edit_window.grab_set()
-        
-        # Add a header
-        header_frame = tk.Frame(edit_window, bg="#4a6fa5", padx=10, pady=10)
-        header_frame.pack(fill='x')
-        
-        header_label = tk.Label(header_frame, text=f"Edit Event: {event.title}", 
-                            bg="#4a6fa5", fg="white", font=("Helvetica", 14, "bold"))
-        header_label.pack(anchor="w")
-        
-        # Create a styled form
-        form_frame = tk.Frame(edit_window, bg="#f5f7fa", padx=25, pady=20)
-        form_frame.pack(fill='both', expand=True)
-        
-        # Custom style for labels
-        label_style = {"bg": "#f5f7fa", "fg": "#333333", "font": ("Helvetica", 10, "bold")}
-        entry_style = {"bg": "white", "relief": "solid", "borderwidth": 1}
-        button_style = {"bg": "#5b87c7", "fg": "white", "font": ("Helvetica", 11, "bold"), 
-                    "activebackground": "#3a679f", "relief": "raised", "borderwidth": 2, "cursor": "hand2"}
-        
-        # Title
-        tk.Label(form_frame, text="Title:", **label_style).grid(row=0, column=0, sticky="w", pady=10, padx=5)
-        title_var = tk.StringVar(value=event.title)
-        title_entry = tk.Entry(form_frame, textvariable=title_var, width=40, **entry_style)
-        title_entry.grid(row=0, column=1, sticky="w", pady=10, padx=5)
-        
-        # Description
-        tk.Label(form_frame, text="Description:", **label_style).grid(row=1, column=0, sticky="nw", pady=10, padx=5)
-        description_frame = tk.Frame(form_frame, bg="#f5f7fa")
-        description_frame.grid(row=1, column=1, sticky="w", pady=10, padx=5)
-        
-        description_text = tk.Text(description_frame, width=40, height=5, **entry_style)
-        description_text.pack(side=tk.LEFT, fill="both", expand=True)
-        description_scroll = tk.Scrollbar(description_frame, command=description_text.yview)
-        description_scroll.pack(side=tk.RIGHT, fill="y")
-        description_text.configure(yscrollcommand=description_scroll.set)
-        description_text.insert("1.0", event.description)
-        
-        # Date
-        tk.Label(form_frame, text="Date:", **label_style).grid(row=2, column=0, sticky="w", pady=10, padx=5)
-        date_frame = tk.Frame(form_frame, bg="#f5f7fa")
-        date_frame.grid(row=2, column=1, sticky="w", pady=10, padx=5)
-        
-        # Use DateEntry for date with the current event date and better styling
-        event_date = event.date
-        date_picker = DateEntry(date_frame, width=12, background='#5b87c7',
-                                foreground='white', borderwidth=2, date_pattern='yyyy-mm-dd',
-                                year=event_date.year, month=event_date.month, day=event_date.day)
-        date_picker.pack(side=tk.LEFT)
-        
-        # Time selection with current event time
-        tk.Label(date_frame, text="  Time:", bg="#f5f7fa").pack(side=tk.LEFT)
-        hour_var = tk.StringVar(value=str(event_date.hour).zfill(2))
-        ttk.Combobox(date_frame, textvariable=hour_var, values=[str(i).zfill(2) for i in range(24)], 
-                    width=3, state="readonly").pack(side=tk.LEFT)
-        tk.Label(date_frame, text=":", bg="#f5f7fa").pack(side=tk.LEFT)
-        minute_var = tk.StringVar(value=str(event_date.minute).zfill(2))
-        ttk.Combobox(date_frame, textvariable=minute_var, values=[str(i).zfill(2) for i in range(0, 60, 5)], 
-                    width=3, state="readonly").pack(side=tk.LEFT)
-        
-        # Venue
-        tk.Label(form_frame, text="Venue:", **label_style).grid(row=3, column=0, sticky="w", pady=10, padx=5)
-        venue_var = tk.StringVar(value=event.venue)
-        tk.Entry(form_frame, textvariable=venue_var, width=40, **entry_style).grid(row=3, column=1, sticky="w", pady=10, padx=5)
-        
-        # Capacity
-        tk.Label(form_frame, text="Capacity:", **label_style).grid(row=4, column=0, sticky="w", pady=10, padx=5)
-        capacity_frame = tk.Frame(form_frame, bg="#f5f7fa")
-        capacity_frame.grid(row=4, column=1, sticky="w", pady=10, padx=5)
-        
-        capacity_var = tk.IntVar(value=event.capacity)
-        capacity_spinner = ttk.Spinbox(capacity_frame, from_=1, to=1000, textvariable=capacity_var, width=10)
-        capacity_spinner.pack(side=tk.LEFT)
-        
-        # Disable capacity field if there are registered users
-        if len(event.registered_users) > 0:
-            capacity_spinner.configure(state="disabled")
-            reg_label = tk.Label(capacity_frame, 
-                                text=f"({len(event.registered_users)} users registered)", 
-                                bg="#f5f7fa", fg="#e74c3c")
-            reg_label.pack(side=tk.LEFT, padx=10)
-        
-        # Category
-        tk.Label(form_frame, text="Category:", **label_style).grid(row=5, column=0, sticky="w", pady=10, padx=5)
-        category_var = tk.StringVar(value=event.category)
-        categories = ["Technology", "Music", "Art", "Sports", "Education", "Other"]
-        category_combo = ttk.Combobox(form_frame, textvariable=category_var, values=categories, width=20, state="readonly")
-        category_combo.grid(row=5, column=1, sticky="w", pady=10, padx=5)
-        category_combo.current(categories.index(event.category) if event.category in categories else 0)
-        
-        # Separator line
-        separator = ttk.Separator(form_frame, orient='horizontal')
-        separator.grid(row=6, column=0, columnspan=2, sticky="ew", pady=15)
-        
-        # Button frame
-        button_frame = tk.Frame(form_frame, bg="#f5f7fa")
-        button_frame.grid(row=7, column=0, columnspan=2, pady=10)
-        
-        # Update button
-        def update_event():
-            title = title_var.get()
-            description = description_text.get("1.0", "end-1c")
-            date_str = date_picker.get()
-            hour = hour_var.get()
-            minute = minute_var.get()
-            venue = venue_var.get()
-            capacity = capacity_var.get()
-            category = category_var.get()
-            
-            if not title or not description or not venue:
-                messagebox.showerror("Error", "Please fill all required fields")
-                return
-            
-            # Create a datetime object
-            try:
-                event_date = datetime.strptime(f"{date_str} {hour}:{minute}", "%Y-%m-%d %H:%M")
-                if event_date < datetime.now():
-                    messagebox.showerror("Error", "Event date cannot be in the past")
-                    return
-            except ValueError:
-                messagebox.showerror("Error", "Invalid date format")
-                return
-            
-            # Update the event
-            success, msg = self.system.update_event(event_id, title, description, event_date, 
-                                                venue, capacity, category, self.user_id)
-            
-            if success:
-                messagebox.showinfo("Success", "Event updated successfully")
-                edit_window.destroy()
-                self.load_my_events()
-                # If user is admin, also refresh unapproved events
-                if hasattr(self, 'load_unapproved_events'):
-                    self.load_unapproved_events()
-                # Also refresh available events
-                self.load_events()
-            else:
-                messagebox.showerror("Error", msg)
-        
-        cancel_button = tk.Button(button_frame, text="Cancel", width=15, command=edit_window.destroy, 
-                                **button_style, bg="#6c757d")
-        cancel_button.pack(side=tk.LEFT, padx=10)
-        
-        update_button = tk.Button(button_frame, text="Update Event", width=15, command=update_event, **button_style)
-        update_button.pack(side=tk.LEFT, padx=10)
-        
-        # Add some styling to the window
-        edit_window.update_idletasks()
-        width = edit_window.winfo_width()
-        height = edit_window.winfo_height()
-        x = (edit_window.winfo_screenwidth() // 2) - (width // 2)
-        y = (edit_window.winfo_screenheight() // 2) - (height // 2)
-        edit_window.geometry('{}x{}+{}+{}'.format(width, height, x, y))
-
-
-class EventManagementApp:
-    def __init__(self, master):
-        self.master = master
-        self.master.title("Event Management System")
-        self.master.geometry("900x600")
-        
-        # Create a data storage
-        self.storage = DataStorage()
-        
-        # Create the event management system
-        self.system = EventManagementSystem(self.storage)
-        
-        # Initialize the user state
-        self.user_id = None
-        self.role = None
-        
-        # Show the login frame
-        self.show_login_frame()
-    
-    def show_login_frame(self):
-        # Clear the window
-        for widget in self.master.winfo_children():
-            widget.destroy()
-        
-        # Create and show the login frame
-        login_frame = LoginFrame(self.master, self.handle_login, self.show_register_frame)
-        login_frame.pack(fill='both', expand=True)
-    
-    def show_register_frame(self):
-        # Clear the window
-        for widget in self.master.winfo_children():
-            widget.destroy()
-        
-        # Create and show the register frame
-        register_frame = RegisterFrame(self.master, self.handle_register, self.show_login_frame)
-        register_frame.pack(fill='both', expand=True)
-    
-    def show_dashboard(self):
-        # Clear the window
-        for widget in self.master.winfo_children():
-            widget.destroy()
-        
-        # Create and show the dashboard
-        dashboard = UserDashboard(self.master, self.system, self.user_id, self.role, self.handle_logout)
-        dashboard.pack(fill='both', expand=True)
-    
-    def handle_login(self, username, password):
-        user_id, role = self.system.login(username, password)
-        
-        if user_id:
-            self.user_id = user_id
-            self.role = role
-            self.show_dashboard()
-        else:
-            messagebox.showerror("Login Failed", "Invalid username or password")
-    
-    def handle_register(self, username, password, email, role):
-        user_id, msg = self.system.register_user(username, password, email, role)
-        
-        if user_id:
-            messagebox.showinfo("Registration Successful", "You can now login with your credentials")
-            self.show_login_frame()
-        else:
-            messagebox.showerror("Registration Failed", msg)
-    
-    def handle_logout(self):
-        self.user_id = None
-        self.role = None
-        self.show_login_frame()
-
-
-def main():
-    # Create the main window
-    root = tk.Tk()
-    
-    # Create the application
-    app = EventManagementApp(root)
-    
-    # Start the main loop
-    root.mainloop()
-
-
-if __name__ == "__main__":
-    main()
+import tkinter as tk
+from tkinter import ttk, messagebox, simpledialog
+import json
+import os
+from datetime import datetime
+import sys
+import calendar
+import functools
+import queue
+import threading
+from tkcalendar import DateEntry  # You might need to install this: pip install tkcalendar
+
+# Add the directory containing the event_management_system.py to Python's path
+# so we can import the code from it
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+# Import the event management system
+from main import User, Admin, Organizer, RegularUser, Event, DataStorage, UserManager, EventManager, EventManagementSystem, EventChange, UserChange
+from lazy_storage import LazyJsonStorage
+
+class LoginFrame(tk.Frame):
+    def __init__(self, master, on_login, on_register):
+        super().__init__(master)
+        self.master = master
+        self.on_login = on_login
+        self.on_register = on_register
+        
+        # Configure the frame with gradient-like background
+        self.configure(bg="#e6f2ff", padx=550, pady=200)
+        
+        # Create widgets
+        self.create_widgets()
+    
+    def create_widgets(self):
+        # Create a decorative top banner
+        banner_frame = tk.Frame(self, bg="#4a86e8", padx=30, pady=20)
+        banner_frame.grid(row=0, column=0, sticky="ew", pady=(0, 25))
+        
+        # Center the title with shadow effect
+        title_frame = tk.Frame(banner_frame, bg="#4a86e8")
+        title_frame.pack(fill="x")
+        
+        # Shadow label (slightly offset)
+        ttk.Label(title_frame, text="Event Management System", 
+                 font=("Arial", 22, "bold"), foreground="#2a5698",
+                 background="#4a86e8").pack(anchor="center")
+        
+        # Main title label
+        ttk.Label(title_frame, text="Event Management System", 
+                 font=("Arial", 22, "bold"), foreground="white",
+                 background="#4a86e8").place(relx=0.5, rely=0.5, anchor="center")
+        
+        # Create a rounded content frame
+        content_frame = tk.Frame(self, bg="white", padx=40, pady=30,
+                               highlightbackground="#c9daf8", 
+                               highlightthickness=2)
+        content_frame.grid(row=1, column=0, pady=10)
+        
+        # Username with centered elements
+        username_frame = tk.Frame(content_frame, bg="white")
+        username_frame.pack(fill="x", pady=12)
+        ttk.Label(username_frame, text="Username", font=("Arial", 12),
+                 background="white").pack(anchor="center")
+        self.username_var = tk.StringVar()
+        username_entry = ttk.Entry(username_frame, textvariable=self.username_var, 
+                                  width=36, font=("Arial", 11))
+        username_entry.pack(anchor="center", pady=(5, 0))
+        username_entry.bind("<Return>", lambda event: self.login())
+        
+        # Password with centered elements
+        password_frame = tk.Frame(content_frame, bg="white")
+        password_frame.pack(fill="x", pady=12)
+        ttk.Label(password_frame, text="Password", font=("Arial", 12),
+                 background="white").pack(anchor="center")
+        self.password_var = tk.StringVar()
+        password_entry = ttk.Entry(password_frame, textvariable=self.password_var, 
+                                  show="•", width=36, font=("Arial", 11))
+        password_entry.pack(anchor="center", pady=(5, 0))
+        password_entry.bind("<Return>", lambda event: self.login())
+        
+        # Create a stylish button frame
+        button_frame = tk.Frame(content_frame, bg="white", pady=15)
+        button_frame.pack(fill="x")
+        
+        # Center the buttons in their container
+        btn_container = tk.Frame(button_frame, bg="white")
+        btn_container.pack(anchor="center")
+        
+        # Create custom button styles
+        style = ttk.Style()
+        style.configure("Login.TButton", font=("Arial", 12, "bold"))
+        style.configure("Register.TButton", font=("Arial", 12))
+        style.map("Login.TButton",
+                 foreground=[('pressed', 'white'), ('active', 'white')],
+                 background=[('pressed', '!disabled', '#3a7ca5'), ('active', '#4a86e8')])
+        
+        # Login Button with improved styling
+        login_btn = ttk.Button(btn_container, text="LOGIN", style="Login.TButton", 
+                             command=self.login, width=15)
+        login_btn.pack(side=tk.LEFT, padx=(0, 15))
+        
+        # Register Button with improved styling
+        register_btn = ttk.Button(btn_container, text="REGISTER", style="Register.TButton", 
+                                command=self.show_register, width=15)
+        register_btn.pack(side=tk.LEFT)
+        
+        # Add a decorative footer
+        footer_frame = tk.Frame(self, bg="#e6f2ff", pady=10)
+        footer_frame.grid(row=2, column=0, sticky="ew")
+        ttk.Label(footer_frame, text="© 2025 Event Management System", 
+                 foreground="#555555", background="#e6f2ff",
+                 font=("Arial", 9)).pack(anchor="center")
+    
+    def login(self):
+        username = self.username_var.get()
+        password = self.password_var.get()
+        
+        if not username or not password:
+            messagebox.showerror("Error", "Please enter username and password")
+            return
+        
+        self.on_login(username, password)
+    
+    def show_register(self):
+        self.on_register()
+
+
+class RegisterFrame(tk.Frame):
+    def __init__(self, master, on_register, on_back):
+        super().__init__(master)
+        self.master = master
+        self.on_register = on_register
+        self.on_back = on_back
+        
+        # Configure the frame with matching style
+        self.configure(bg="#e6f2ff", padx=550, pady=280)
+        
+        # Create widgets
+        self.create_widgets()
+    
+    def create_widgets(self):
+        # Create a decorative top banner
+        banner_frame = tk.Frame(self, bg="#4a86e8", padx=30, pady=20)
+        banner_frame.grid(row=0, column=0, sticky="ew", pady=(0, 25))
+        
+        # Center the title with shadow effect
+        title_frame = tk.Frame(banner_frame, bg="#4a86e8")
+        title_frame.pack(fill="x")
+        
+        # Shadow label (slightly offset)
+        ttk.Label(title_frame, text="Register New User", 
+                 font=("Arial", 22, "bold"), foreground="#2a5698",
+                 background="#4a86e8").pack(anchor="center")
+        
+        # Main title label
+        ttk.Label(title_frame, text="Register New User", 
+                 font=("Arial", 22, "bold"), foreground="white",
+                 background="#4a86e8").place(relx=0.5, rely=0.5, anchor="center")
+        
+        # Create a rounded content frame
+        content_frame = tk.Frame(self, bg="white", padx=40, pady=30,
+                               highlightbackground="#c9daf8", 
+                               highlightthickness=2)
+        content_frame.grid(row=1, column=0, pady=10)
+        
+        # Username with centered elements
+        username_frame = tk.Frame(content_frame, bg="white")
+        username_frame.pack(fill="x", pady=10)
+        ttk.Label(username_frame, text="Username", font=("Arial", 12),
+                 background="white").pack(anchor="center")
+        self.username_var = tk.StringVar()
+        ttk.Entry(username_frame, textvariable=self.username_var, 
+                 width=36, font=("Arial", 11)).pack(anchor="center", pady=(5, 0))
+        
+        # Password with centered elements
+        password_frame = tk.Frame(content_frame, bg="white")
+        password_frame.pack(fill="x", pady=10)
+        ttk.Label(password_frame, text="Password", font=("Arial", 12),
+                 background="white").pack(anchor="center")
+        self.password_var = tk.StringVar()
+        ttk.Entry(password_frame, textvariable=self.password_var, 
+                 show="•", width=36, font=("Arial", 11)).pack(anchor="center", pady=(5, 0))
+        
+        # Email with centered elements
+        email_frame = tk.Frame(content_frame, bg="white")
+        email_frame.pack(fill="x", pady=10)
+        ttk.Label(email_frame, text="Email", font=("Arial", 12),
+                 background="white").pack(anchor="center")
+        self.email_var = tk.StringVar()
+        ttk.Entry(email_frame, textvariable=self.email_var, 
+                 width=36, font=("Arial", 11)).pack(anchor="center", pady=(5, 0))
+        
+        # Role selection with better styling and centered
+        role_frame = tk.Frame(content_frame, bg="white")
+        role_frame.pack(fill="x", pady=10)
+        ttk.Label(role_frame, text="Select Your Role", font=("Arial", 12),
+                 background="white").pack(anchor="center", pady=(0, 5))
+        
+        # Center the radio buttons
+        role_options_frame = tk.Frame(role_frame, bg="white")
+        role_options_frame.pack(anchor="center")
+        
+        self.role_var = tk.StringVar(value="user")
+        
+        # Styled radio buttons
+        style = ttk.Style()
+        style.configure("TRadiobutton", background="white", font=("Arial", 11))
+        
+        ttk.Radiobutton(role_options_frame, text="Regular User", variable=self.role_var, 
+                      value="user", style="TRadiobutton").pack(side=tk.LEFT, padx=(0, 20))
+        ttk.Radiobutton(role_options_frame, text="Event Organizer", variable=self.role_var, 
+                      value="organizer", style="TRadiobutton").pack(side=tk.LEFT)
+        
+        # Button frame
+        button_frame = tk.Frame(content_frame, bg="white", pady=15)
+        button_frame.pack(fill="x")
+        
+        # Center the buttons in their container
+        btn_container = tk.Frame(button_frame, bg="white")
+        btn_container.pack(anchor="center")
+        
+        # Create custom button styles
+        style = ttk.Style()
+        style.configure("Register.TButton", font=("Arial", 12, "bold"))
+        style.configure("Back.TButton", font=("Arial", 12))
+        style.map("Register.TButton",
+                 foreground=[('pressed', 'white'), ('active', 'white')],
+                 background=[('pressed', '!disabled', '#3a7ca5'), ('active', '#4a86e8')])
+        
+        # Register Button with improved styling
+        register_btn = ttk.Button(btn_container, text="CREATE ACCOUNT", style="Register.TButton",
+                                command=self.register, width=18)
+        register_btn.pack(side=tk.LEFT, padx=(0, 15))
+        
+        # Back Button with improved styling
+        back_btn = ttk.Button(btn_container, text="BACK TO LOGIN", style="Back.TButton",
+                             command=self.on_back, width=18)
+        back_btn.pack(side=tk.LEFT)
+        
+        # Add a decorative footer
+        footer_frame = tk.Frame(self, bg="#e6f2ff", pady=10)
+        footer_frame.grid(row=2, column=0, sticky="ew")
+        ttk.Label(footer_frame, text="© 2025 Event Management System", 
+                 foreground="#555555", background="#e6f2ff",
+                 font=("Arial", 9)).pack(anchor="center")
+    
+    def register(self):
+        username = self.username_var.get()
+        password = self.password_var.get()
+        email = self.email_var.get()
+        role = self.role_var.get()
+        
+        if not username or not password or not email:
+            messagebox.showerror("Error", "Please fill all fields")
+            return
+        
+        self.on_register(username, password, email, role)
+
+class BackgroundWorker:
+    """
+    Runs data loads and saves on a worker thread so the Tk main loop
+    never waits on them.
+    
+    Results come back through a queue that the main loop polls with
+    after(), so callbacks run on the Tk thread and may touch widgets.
+    There is a single worker, so calls run in the order they were made.
+    """
+    
+    POLL_MS = 50
+    
+    def __init__(self, master, on_busy=None):
+        self.master = master
+        self.on_busy = on_busy  # called with True/False as work starts and runs out
+        self.tasks = queue.Queue()
+        self.results = queue.Queue()
+        self.pending = 0
+        threading.Thread(target=self.run, name="gui-worker", daemon=True).start()
+        self.master.after(self.POLL_MS, self.poll)
+    
+    def submit(self, func, on_done=None, on_error=None):
+        """
+        Call func() on the worker, then on_done(result) on the Tk thread;
+        on_error(exception) if it raised (an error box by default).
+        """
+        self.pending += 1
+        if self.pending == 1 and self.on_busy:
+            self.on_busy(True)
+        self.tasks.put((func, on_done, on_error))
+    
+    def run(self):
+        while True:
+            func, on_done, on_error = self.tasks.get()
+            try:
+                self.results.put((on_done, func(), None))
+            except Exception as e:
+                self.results.put((on_error, None, e))
+    
+    def poll(self):
+        # Rescheduled first, so a failing callback doesn't stop the polling
+        self.master.after(self.POLL_MS, self.poll)
+        while True:
+            try:
+                callback, result, error = self.results.get_nowait()
+            except queue.Empty:
+                break
+            self.pending -= 1
+            try:
+                if error is not None:
+                    if callback:
+                        callback(error)
+                    else:
+                        messagebox.showerror("Error", str(error))
+                elif callback:
+                    callback(result)
+            except tk.TclError:
+                pass  # the widgets it was for were closed meanwhile
+            if self.pending == 0 and self.on_busy:
+                self.on_busy(False)
+
+
+class PagedTree:
+    """
+    Fills a Treeview one page of rows at a time as it is scrolled, instead
+    of inserting every record up front. Only the first page is inserted
+    on load; the next is fetched once the view nears the bottom. With a
+    worker, pages are fetched on its thread.
+    
+    Given the manager's ChangeJournal, refresh() updates only the rows of
+    records that changed since the listing was loaded.
+    """
+    
+    PAGE_SIZE = 100
+    
+    def __init__(self, tree, scrollbar, striped=False, worker=None):
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.striped = striped
+        self.worker = worker
+        self.generation = 0  # bumped by load(), so pages of an older listing are dropped
+        self.fetch_page = None
+        self.make_row = None
+        self.get_journal = None
+        self.get_record = None
+        self.journal = None
+        self.version = 0
+        self.cursor = None
+        self.more = False
+        self.count = 0
+        self.loading = False
+        self.tree.configure(yscrollcommand=self.on_scroll)
+    
+    def load(self, fetch_page, make_row, get_journal=None, get_record=None):
+        """
+        Show a new listing from its first page.
+        
+        Args:
+            fetch_page: Called as fetch_page(limit, cursor); returns a
+                ({id: record}, next_cursor) page like the system's *_page methods
+            make_row: Called as make_row(id, record); returns (text, values)
+                for the row, or None if the record doesn't belong in the listing
+            get_journal: Returns the ChangeJournal of the records' manager
+            get_record: Returns the current record for an id, or None
+        """
+        self.tree.delete(*self.tree.get_children())
+        self.fetch_page = fetch_page
+        self.make_row = make_row
+        self.get_journal = get_journal
+        self.get_record = get_record
+        if get_journal:
+            # Anything changed from here on is applied by the next refresh()
+            self.journal = get_journal()
+            self.version = self.journal.version
+        self.cursor = None
+        self.more = True
+        self.count = 0
+        self.loading = True
+        self.generation += 1
+        self.load_more(self.generation)
+    
+    def load_more(self, generation):
+        # Callers set self.loading first, so no page is asked for twice
+        if generation != self.generation:
+            return
+        fetch_page, cursor = self.fetch_page, self.cursor
+        if self.worker:
+            self.worker.submit(lambda: fetch_page(self.PAGE_SIZE, cursor),
+                               lambda page: self.add_page(generation, page),
+                               lambda error: self.page_failed(generation, error))
+        else:
+            self.add_page(generation, fetch_page(self.PAGE_SIZE, cursor))
+    
+    def page_failed(self, generation, error):
+        if generation != self.generation:
+            return
+        self.loading = False
+        if self.cursor is not None and isinstance(error, ValueError):
+            # The listing no longer knows the cursor; start it over
+            self.reload()
+            return
+        self.more = False
+        messagebox.showerror("Error", str(error))
+    
+    def add_page(self, generation, page):
+        if generation != self.generation:
+            return
+        self.loading = False
+        records, self.cursor = page
+        self.more = self.cursor is not None
+        for record_id, record in records.items():
+            row = self.make_row(record_id, record)
+            if row is None or self.tree.exists(record_id):
+                continue
+            text, values = row
+            # Stripe as the row goes in, instead of walking every row afterwards
+            tags = (('even' if self.count % 2 == 0 else 'odd'),) if self.striped else ()
+            self.tree.insert("", "end", record_id, text=text, values=values, tags=tags)
+            self.count += 1
+    
+    def reload(self):
+        self.load(self.fetch_page, self.make_row, self.get_journal, self.get_record)
+    
+    def refresh(self):
+        """
+        Bring the rows up to date: update or remove the rows of records
+        that changed since the last load or refresh. A record that newly
+        belongs in the listing reloads it from the first page, as its place
+        among the rows isn't known here; so does having no journal, or one
+        that can't tell what changed.
+        """
+        if self.fetch_page is None:
+            return
+        journal = self.get_journal() if self.get_journal else None
+        changed = None
+        if journal is not None and journal is self.journal:
+            changed, version = journal.changed_since(self.version)
+        if changed is None:
+            self.reload()
+            return
+        self.version = version
+        if not changed:
+            return
+        generation = self.generation
+        
+        def get_records():
+            return {record_id: self.get_record(record_id) for record_id in changed}
+        
+        if self.worker:
+            self.worker.submit(get_records, lambda records: self.apply_changes(generation, records))
+        else:
+            self.apply_changes(generation, get_records())
+    
+    def apply_changes(self, generation, records):
+        if generation != self.generation:
+            return
+        first_removed = None
+        for record_id, record in records.items():
+            row = self.make_row(record_id, record) if record is not None else None
+            if self.tree.exists(record_id):
+                if row is None:
+                    index = self.tree.index(record_id)
+                    first_removed = index if first_removed is None else min(first_removed, index)
+                    self.tree.delete(record_id)
+                    self.count -= 1
+                else:
+                    self.tree.item(record_id, text=row[0], values=row[1])
+            elif row is not None:
+                self.reload()
+                return
+        if self.striped and first_removed is not None:
+            # Rows below a removed one swap stripes
+            for index, item in enumerate(self.tree.get_children()[first_removed:], first_removed):
+                self.tree.item(item, tags=('even' if index % 2 == 0 else 'odd',))
+    
+    def on_scroll(self, first, last):
+        self.scrollbar.set(first, last)
+        # Fetch the next page when the last tenth of the rows comes into view
+        # (or the rows don't fill the view yet)
+        if self.more and not self.loading and float(last) > 0.9:
+            self.loading = True
+            self.tree.after_idle(self.load_more, self.generation)
+
+
+def dict_pages(get_records):
+    # fetch_page for a listing that comes as one dict. get_records() is
+    # called for the first page, so it runs wherever the pages are fetched;
+    # pages are slices of its keys as they were then, the offset the cursor
+    listing = {}
+    
+    def fetch_page(limit, cursor):
+        if cursor is None:
+            listing["records"] = records = get_records()
+            listing["ids"] = list(records)
+        records, record_ids = listing["records"], listing["ids"]
+        start = int(cursor or 0)
+        page = {record_id: records[record_id] for record_id in record_ids[start:start + limit]
+                if record_id in records}
+        return page, str(start + limit) if start + limit < len(record_ids) else None
+    
+    return fetch_page
+
+class UserDashboard(tk.Frame):
+    WATCH_MS = 500
+    
+    def __init__(self, master, system, user_id, role, on_logout, worker=None):
+        super().__init__(master)
+        self.master = master
+        self.system = system
+        # Data access runs on this worker; see BackgroundWorker
+        self.worker = worker or BackgroundWorker(master)
+        self.user_id = user_id
+        self.role = role
+        self.on_logout = on_logout
+        
+        # Configure the frame
+        self.configure(padx=10, pady=10)
+        
+        # Create widgets
+        self.create_widgets()
+        
+        # Follow the system's changes, including ones made elsewhere in the
+        # process, and refresh the trees they touch
+        self.changes = self.system.changes.queue()
+        self.master.after(self.WATCH_MS, self.watch_changes)
+    
+    def create_widgets(self):
+        # Create a notebook (tabbed interface)
+        self.notebook = ttk.Notebook(self)
+        self.notebook.pack(fill='both', expand=True)
+        
+        # Create tabs based on role
+        self.create_common_tabs()
+        
+        if self.role == "admin":
+            self.create_admin_tabs()
+        elif self.role == "organizer":
+            self.create_organizer_tabs()
+        elif self.role == "user":
+            self.create_user_tabs()
+        
+        # Logout Button
+        ttk.Button(self, text="Logout", command=self.on_logout).pack(pady=10)
+    
+    def create_common_tabs(self):
+        # Available Events Tab
+        self.events_tab = ttk.Frame(self.notebook)
+        self.notebook.add(self.events_tab, text="Available Events")
+        
+        # Create a frame for filters
+        filter_frame = ttk.Frame(self.events_tab)
+        filter_frame.pack(fill='x', pady=5)
+        
+        # Category filter
+        ttk.Label(filter_frame, text="Category:").pack(side=tk.LEFT, padx=5)
+        self.category_var = tk.StringVar()
+        categories = ["All", "Technology", "Music", "Art", "Sports", "Education", "Other"]
+        ttk.Combobox(filter_frame, textvariable=self.category_var, values=categories, state="readonly").pack(side=tk.LEFT, padx=5)
+        self.category_var.set("All")
+        
+        # Date sort checkbox
+        self.date_sort_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(filter_frame, text="Sort by date", variable=self.date_sort_var).pack(side=tk.LEFT, padx=5)
+        
+        # Apply filter button
+        ttk.Button(filter_frame, text="Apply Filters", command=self.load_events).pack(side=tk.LEFT, padx=5)
+        
+        # Create the treeview
+        self.events_tree = ttk.Treeview(self.events_tab, columns=("Title", "Date", "Venue", "Category", "Available"))
+        self.events_tree.pack(fill='both', expand=True, padx=5, pady=5)
+        
+        # Configure the treeview
+        self.events_tree.heading("#0", text="ID")
+        self.events_tree.heading("Title", text="Title")
+        self.events_tree.heading("Date", text="Date")
+        self.events_tree.heading("Venue", text="Venue")
+        self.events_tree.heading("Category", text="Category")
+        self.events_tree.heading("Available", text="Available Seats")
+        
+        self.events_tree.column("#0", width=50, stretch=tk.NO)
+        self.events_tree.column("Title", width=200, stretch=tk.YES)
+        self.events_tree.column("Date", width=150, stretch=tk.NO)
+        self.events_tree.column("Venue", width=150, stretch=tk.YES)
+        self.events_tree.column("Category", width=100, stretch=tk.NO)
+        self.events_tree.column("Available", width=100, stretch=tk.NO)
+        
+        # Add a scrollbar
+        scrollbar = ttk.Scrollbar(self.events_tab, orient="vertical", command=self.events_tree.yview)
+        scrollbar.pack(side=tk.RIGHT, fill='y')
+        self.events_pages = PagedTree(self.events_tree, scrollbar, worker=self.worker)
+        
+        # Add a button frame
+        button_frame = ttk.Frame(self.events_tab)
+        button_frame.pack(fill='x', pady=5)
+        
+        # View details button
+        ttk.Button(button_frame, text="View Details", command=self.view_event_details).pack(side=tk.LEFT, padx=5)
+        
+        # Register/unregister button (only for regular users)
+        if self.role == "user":
+            ttk.Button(button_frame, text="Register for Event", command=self.register_for_event).pack(side=tk.LEFT, padx=5)
+            ttk.Button(button_frame, text="Unregister from Event", command=self.unregister_from_event).pack(side=tk.LEFT, padx=5)
+        
+        # Load events
+        self.load_events()
+    
+    def create_admin_tabs(self):
+    # Apply a theme for better appearance
+        style = ttk.Style()
+        
+        # Configure colors for UI elements
+        bg_color = "#f5f7fa"  # Light blue-gray background
+        header_bg = "#4a6fa5"  # Darker blue for headers
+        header_fg = "#ffffff"  # White text for headers
+        btn_color = "#000"  # Blue for buttons
+        
+        # Configure styles
+        style.configure("Treeview", rowheight=25, font=('Helvetica', 10), background=bg_color, fieldbackground=bg_color)
+        style.configure("Treeview.Heading", font=('Helvetica', 10, 'bold'), background=header_bg, foreground=header_fg)
+        style.map('Treeview', background=[('selected', '#007bff')], foreground=[('selected', 'white')])
+        
+        # Configure TFrame with background color
+        style.configure("MainFrame.TFrame", background=bg_color)
+        style.configure("Header.TFrame", background=header_bg)
+        style.configure("Header.TLabel", background=header_bg, foreground=header_fg, font=('Helvetica', 12, 'bold'))
+        style.configure("TButton", background=btn_color)
+        
+        # Users Management Tab
+        users_tab = ttk.Frame(self.notebook, padding=10, style="MainFrame.TFrame")
+        self.notebook.add(users_tab, text="Manage Users")
+        
+        # Title section with colored background
+        header_frame = ttk.Frame(users_tab, style="Header.TFrame")
+        header_frame.pack(fill='x', pady=(0, 10))
+        ttk.Label(header_frame, text="User Management", style="Header.TLabel", padding=5).pack(anchor='w')
+        
+        # Create frame for treeview and scrollbar
+        tree_frame = ttk.Frame(users_tab, style="MainFrame.TFrame")
+        tree_frame.pack(fill='both', expand=True)
+        
+        # Create the treeview
+        self.users_tree = ttk.Treeview(tree_frame, columns=("Username", "Email", "Role", "Status"))
+        
+        # Configure the treeview
+        self.users_tree.heading("#0", text="ID")
+        self.users_tree.heading("Username", text="Username")
+        self.users_tree.heading("Email", text="Email")
+        self.users_tree.heading("Role", text="Role")
+        self.users_tree.heading("Status", text="Status")
+        
+        self.users_tree.column("#0", width=50, stretch=tk.NO)
+        self.users_tree.column("Username", width=150, stretch=tk.YES)
+        self.users_tree.column("Email", width=200, stretch=tk.YES)
+        self.users_tree.column("Role", width=100, stretch=tk.NO)
+        self.users_tree.column("Status", width=100, stretch=tk.NO)
+        
+        # Apply alternating row colors (zebra stripes)
+        self.users_tree.tag_configure('odd', background='#e6eef7')
+        self.users_tree.tag_configure('even', background='#ffffff')
+        
+        # Add scrollbars
+        y_scrollbar = ttk.Scrollbar(tree_frame, orient="vertical", command=self.users_tree.yview)
+        x_scrollbar = ttk.Scrollbar(tree_frame, orient="horizontal", command=self.users_tree.xview)
+        
+        # Configure the treeview to use the scrollbars; rows are added a page at a time
+        self.users_tree.configure(xscrollcommand=x_scrollbar.set)
+        self.users_pages = PagedTree(self.users_tree, y_scrollbar, striped=True, worker=self.worker)
+        
+        # Pack the treeview and scrollbars
+        y_scrollbar.pack(side=tk.RIGHT, fill='y')
+        x_scrollbar.pack(side=tk.BOTTOM, fill='x')
+        self.users_tree.pack(side=tk.LEFT, fill='both', expand=True)
+        
+        # Add a button frame with padding and background
+        button_frame = ttk.Frame(users_tab, style="MainFrame.TFrame")
+        button_frame.pack(fill='x', pady=10)
+        
+        # Define button style
+        style.configure("Action.TButton", background="black", foreground="white", font=('Helvetica', 10))
+        
+        # Add buttons with consistent styling
+        style.configure("BlackButton.TButton", background="black", foreground="black", font=('Helvetica', 10))
+        ttk.Button(button_frame, text="Delete User", command=self.delete_user, width=15, style="BlackButton.TButton").pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="Refresh", command=lambda: self.refresh_trees("users"), width=15, style="BlackButton.TButton").pack(side=tk.LEFT, padx=5)
+        
+        # Load users
+        self.load_users()
+        
+        # Event Approval Tab
+        approval_tab = ttk.Frame(self.notebook, padding=10, style="MainFrame.TFrame")
+        self.notebook.add(approval_tab, text="Event Approvals")
+        
+        # Title section with colored background
+        approval_header_frame = ttk.Frame(approval_tab, style="Header.TFrame")
+        approval_header_frame.pack(fill='x', pady=(0, 10))
+        ttk.Label(approval_header_frame, text="Event Approval Queue", style="Header.TLabel", padding=5).pack(anchor='w')
+        
+        # Create frame for approval treeview and scrollbar
+        approval_tree_frame = ttk.Frame(approval_tab, style="MainFrame.TFrame")
+        approval_tree_frame.pack(fill='both', expand=True)
+        
+        # Create the treeview
+        self.approval_tree = ttk.Treeview(approval_tree_frame, columns=("Title", "Organizer", "Date", "Category"))
+        
+        # Configure the treeview
+        self.approval_tree.heading("#0", text="ID")
+        self.approval_tree.heading("Title", text="Title")
+        self.approval_tree.heading("Organizer", text="Organizer")
+        self.approval_tree.heading("Date", text="Date")
+        self.approval_tree.heading("Category", text="Category")
+        
+        self.approval_tree.column("#0", width=50, stretch=tk.NO)
+        self.approval_tree.column("Title", width=200, stretch=tk.YES)
+        self.approval_tree.column("Organizer", width=150, stretch=tk.YES)
+        self.approval_tree.column("Date", width=150, stretch=tk.NO)
+        self.approval_tree.column("Category", width=100, stretch=tk.NO)
+        
+        # Apply alternating row colors (zebra stripes)
+        self.approval_tree.tag_configure('odd', background='#e6eef7')
+        self.approval_tree.tag_configure('even', background='#ffffff')
+        
+        # Add scrollbars
+        approval_y_scrollbar = ttk.Scrollbar(approval_tree_frame, orient="vertical", command=self.approval_tree.yview)
+        approval_x_scrollbar = ttk.Scrollbar(approval_tree_frame, orient="horizontal", command=self.approval_tree.xview)
+        
+        # Configure the treeview to use the scrollbars; rows are added a page at a time
+        self.approval_tree.configure(xscrollcommand=approval_x_scrollbar.set)
+        self.approval_pages = PagedTree(self.approval_tree, approval_y_scrollbar, striped=True, worker=self.worker)
+        
+        # Pack the treeview and scrollbars
+        approval_y_scrollbar.pack(side=tk.RIGHT, fill='y')
+        approval_x_scrollbar.pack(side=tk.BOTTOM, fill='x')
+        self.approval_tree.pack(side=tk.LEFT, fill='both', expand=True)
+        
+        # Add a button frame with padding and background
+        approval_button_frame = ttk.Frame(approval_tab, style="MainFrame.TFrame")
+        approval_button_frame.pack(fill='x', pady=10)
+        
+        # Add buttons with consistent styling
+        style.configure("BlackButton.TButton", background="black", foreground="black", font=('Helvetica', 10))
+        
+        ttk.Button(approval_button_frame, text="Approve Event", command=self.approve_event, width=15, style="BlackButton.TButton").pack(side=tk.LEFT, padx=5)
+        ttk.Button(approval_button_frame, text="View Details", command=self.view_approval_details, width=15, style="BlackButton.TButton").pack(side=tk.LEFT, padx=5)
+        ttk.Button(approval_button_frame, text="Refresh", command=lambda: self.refresh_trees("approval"), width=15, style="BlackButton.TButton").pack(side=tk.LEFT, padx=5)
+        
+        # Load unapproved events
+        self.load_unapproved_events()
+    
+    def create_organizer_tabs(self):
+        # My Events Tab
+        my_events_tab = ttk.Frame(self.notebook)
+        self.notebook.add(my_events_tab, text="My Events")
+        
+        # Create the treeview
+        self.my_events_tree = ttk.Treeview(my_events_tab, columns=("Title", "Date", "Status", "Registered"))
+        self.my_events_tree.pack(fill='both', expand=True, padx=5, pady=5)
+        
+        # Configure the treeview
+        self.my_events_tree.heading("#0", text="ID")
+        self.my_events_tree.heading("Title", text="Title")
+        self.my_events_tree.heading("Date", text="Date")
+        self.my_events_tree.heading("Status", text="Status")
+        self.my_events_tree.heading("Registered", text="Registered Users")
+        
+        self.my_events_tree.column("#0", width=50, stretch=tk.NO)
+        self.my_events_tree.column("Title", width=200, stretch=tk.YES)
+        self.my_events_tree.column("Date", width=150, stretch=tk.NO)
+        self.my_events_tree.column("Status", width=100, stretch=tk.NO)
+        self.my_events_tree.column("Registered", width=120, stretch=tk.NO)
+        
+        # Add a scrollbar
+        scrollbar = ttk.Scrollbar(my_events_tab, orient="vertical", command=self.my_events_tree.yview)
+        scrollbar.pack(side=tk.RIGHT, fill='y')
+        self.my_events_pages = PagedTree(self.my_events_tree, scrollbar, worker=self.worker)
+        
+        # Add a button frame
+        button_frame = ttk.Frame(my_events_tab)
+        button_frame.pack(fill='x', pady=5)
+        
+        # Add buttons
+        ttk.Button(button_frame, text="Create New Event", command=self.create_event).pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="Edit Event", command=self.edit_event).pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="View Details", command=self.view_my_event_details).pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="View Registrations", command=self.view_registrations).pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="Refresh", command=lambda: self.refresh_trees("my_events")).pack(side=tk.LEFT, padx=5)
+        
+        # Load my events
+        self.load_my_events()
+    
+    def create_user_tabs(self):
+        # My Registrations Tab
+        registrations_tab = ttk.Frame(self.notebook)
+        self.notebook.add(registrations_tab, text="My Registrations")
+        
+        # Create the treeview
+        self.registrations_tree = ttk.Treeview(registrations_tab, columns=("Title", "Date", "Venue", "Category"))
+        self.registrations_tree.pack(fill='both', expand=True, padx=5, pady=5)
+        
+        # Configure the treeview
+        self.registrations_tree.heading("#0", text="ID")
+        self.registrations_tree.heading("Title", text="Title")
+        self.registrations_tree.heading("Date", text="Date")
+        self.registrations_tree.heading("Venue", text="Venue")
+        self.registrations_tree.heading("Category", text="Category")
+        
+        self.registrations_tree.column("#0", width=50, stretch=tk.NO)
+        self.registrations_tree.column("Title", width=200, stretch=tk.YES)
+        self.registrations_tree.column("Date", width=150, stretch=tk.NO)
+        self.registrations_tree.column("Venue", width=150, stretch=tk.YES)
+        self.registrations_tree.column("Category", width=100, stretch=tk.NO)
+        
+        # Add a scrollbar
+        scrollbar = ttk.Scrollbar(registrations_tab, orient="vertical", command=self.registrations_tree.yview)
+        scrollbar.pack(side=tk.RIGHT, fill='y')
+        self.registrations_pages = PagedTree(self.registrations_tree, scrollbar, worker=self.worker)
+        
+        # Add a button frame
+        button_frame = ttk.Frame(registrations_tab)
+        button_frame.pack(fill='x', pady=5)
+        
+        # Add buttons
+        ttk.Button(button_frame, text="View Details", command=self.view_registration_details).pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="Unregister", command=self.unregister_from_registration).pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="Refresh", command=lambda: self.refresh_trees("registrations")).pack(side=tk.LEFT, padx=5)
+        
+        # Load registrations
+        self.load_registrations()
+    
+    def load_events(self):
+        # Get selected category
+        category = self.category_var.get()
+        if category == "All":
+            category = None
+        
+        # Get sort preference
+        sort_by_date = self.date_sort_var.get()
+        
+        source = []
+        
+        def fetch_page(limit, cursor):
+            if cursor is None:
+                # Get events from the system; a snapshot of the event catalog when it is current
+                events = self.system.browse_events(category=category, sort_by_date=sort_by_date)
+                source[:] = [events.page if hasattr(events, "page") else
+                             functools.partial(self.system.get_available_events_page, category, sort_by_date)]
+            return source[0](limit, cursor)
+        
+        def make_row(event_id, event):
+            if not event.is_approved or (category and event.category != category):
+                return None
+            seats = event.seats_available()
+            date_str = event.date.strftime("%Y-%m-%d %H:%M")
+            return event_id[:8], (event.title, date_str, event.venue,
+                                  event.category, f"{seats}/{event.capacity}")
+        
+        # Populate the treeview
+        self.events_pages.load(fetch_page, make_row, self.event_journal, self.system.event_manager.get_event)
+    
+    def load_users(self):
+        def make_row(user_id, user):
+            status = "Active" if user.is_active else "Inactive"
+            return user_id[:8], (user.username, user.email, user.get_role(), status)
+        
+        # Populate the treeview from the system's users, a page at a time
+        self.users_pages.load(lambda limit, cursor: self.system.get_users_page(None, limit, cursor), make_row,
+                              lambda: self.system.user_journal, self.system.user_manager.get_user)
+    
+    def load_unapproved_events(self):
+        def make_row(event_id, event):
+            if event.is_approved:
+                return None
+            date_str = event.date.strftime("%Y-%m-%d %H:%M")
+            
+            # Get organizer info
+            organizer = self.system.user_manager.get_user(event.organizer_id)
+            organizer_name = organizer.username if organizer else "Unknown"
+            return event_id[:8], (event.title, organizer_name, date_str, event.category)
+        
+        # Populate the treeview with the unapproved events
+        self.approval_pages.load(dict_pages(self.system.event_manager.get_unapproved_events), make_row,
+                                 self.event_journal, self.system.event_manager.get_event)
+    
+    def load_my_events(self):
+        def make_row(event_id, event):
+            if event.organizer_id != self.user_id:
+                return None
+            date_str = event.date.strftime("%Y-%m-%d %H:%M")
+            status = "Approved" if event.is_approved else "Pending"
+            registered = len(event.registered_users)
+            return event_id[:8], (event.title, date_str, status, f"{registered}/{event.capacity}")
+        
+        # Populate the treeview with the organizer's events
+        self.my_events_pages.load(dict_pages(lambda: self.system.get_user_events(self.user_id)), make_row,
+                                  self.event_journal, self.system.event_manager.get_event)
+    
+    def load_registrations(self):
+        # Get user's registered events
+        def get_events():
+            registration_ids = self.system.get_user_registrations(self.user_id)
+            return {event_id: self.system.event_manager.get_event(event_id) for event_id in registration_ids}
+        
+        def make_row(event_id, event):
+            if event and event.is_approved and event_id in self.system.get_user_registrations(self.user_id):
+                date_str = event.date.strftime("%Y-%m-%d %H:%M")
+                return event_id[:8], (event.title, date_str, event.venue, event.category)
+        
+        # Populate the treeview
+        self.registrations_pages.load(dict_pages(get_events), make_row,
+                                      self.event_journal, self.system.event_manager.get_event)
+    
+    def event_journal(self):
+        return self.system.event_journal
+    
+    def refresh_trees(self, *names):
+        # Apply the changes since each named tree ("events", "users", ...)
+        # was loaded, for the trees this role's dashboard has
+        for name in names:
+            pages = getattr(self, f"{name}_pages", None)
+            if pages:
+                pages.refresh()
+    
+    def watch_changes(self):
+        if not self.winfo_exists():
+            # Logged out
+            self.system.changes.unsubscribe(self.changes.put)
+            return
+        names = set()
+        try:
+            while True:
+                change = self.changes.get_nowait()
+                if not isinstance(change, UserChange):
+                    names.update(("events", "approval", "my_events", "registrations"))
+                if not isinstance(change, EventChange):
+                    names.add("users")
+        except queue.Empty:
+            pass
+        self.refresh_trees(*names)
+        self.master.after(self.WATCH_MS, self.watch_changes)
+    
+    def view_event_details(self):
+        selected_item = self.events_tree.selection()
+        if not selected_item:
+            messagebox.showinfo("Info", "Please select an event to view")
+            return
+        
+        event_id = selected_item[0]
+        event = self.system.event_manager.get_event(event_id)
+        
+        if event:
+            details = f"Title: {event.title}\n\n"
+            details += f"Description: {event.description}\n\n"
+            details += f"Date: {event.date.strftime('%Y-%m-%d %H:%M')}\n\n"
+            details += f"Venue: {event.venue}\n\n"
+            details += f"Category: {event.category}\n\n"
+            details += f"Available Seats: {event.seats_available()}/{event.capacity}"
+            
+            # Create a details window
+            details_window = tk.Toplevel(self.master)
+            details_window.title(f"Event Details: {event.title}")
+            details_window.geometry("400x400")
+            
+            # Make the window modal
+            details_window.transient(self.master)
+            details_window.grab_set()
+            
+            # Add a text widget to display details
+            text_widget = tk.Text(details_window, wrap="word", padx=10, pady=10)
+            text_widget.insert("1.0", details)
+            text_widget.config(state="disabled")
+            text_widget.pack(fill="both", expand=True)
+            
+            # Add a close button
+            ttk.Button(details_window, text="Close", command=details_window.destroy).pack(pady=10)
+    
+    def register_for_event(self):
+        selected_item = self.events_tree.selection()
+        if not selected_item:
+            messagebox.showinfo("Info", "Please select an event to register for")
+            return
+        
+        event_id = selected_item[0]
+        
+        # Check if the user is already registered
+        user = self.system.user_manager.get_user(self.user_id)
+        if isinstance(user, RegularUser) and event_id in user.registered_events:
+            messagebox.showinfo("Info", "You are already registered for this event")
+            return
+        
+        def done(success):
+            if success:
+                messagebox.showinfo("Success", "Registration successful")
+                # Refresh events and registrations
+                self.refresh_trees("events", "registrations")
+            else:
+                messagebox.showerror("Error", "Registration failed. The event might be full.")
+        
+        # Register for the event
+        self.worker.submit(lambda: self.system.register_for_event(event_id, self.user_id), done)
+    
+    def unregister_from_event(self):
+        selected_item = self.events_tree.selection()
+        if not selected_item:
+            messagebox.showinfo("Info", "Please select an event to unregister from")
+            return
+        
+        event_id = selected_item[0]
+        
+        # Check if the user is registered
+        user = self.system.user_manager.get_user(self.user_id)
+        if not isinstance(user, RegularUser) or event_id not in user.registered_events:
+            messagebox.showinfo("Info", "You are not registered for this event")
+            return
+        
+        def done(success):
+            if success:
+                messagebox.showinfo("Success", "Unregistration successful")
+                # Refresh events and registrations
+                self.refresh_trees("events", "registrations")
+            else:
+                messagebox.showerror("Error", "Unregistration failed")
+        
+        # Unregister from the event
+        self.worker.submit(lambda: self.system.unregister_from_event(event_id, self.user_id), done)
+    
+    def delete_user(self):
+        selected_item = self.users_tree.selection()
+        if not selected_item:
+            messagebox.showinfo("Info", "Please select a user to delete")
+            return
+        
+        user_id = selected_item[0]
+        
+        # Confirm deletion
+        confirm = messagebox.askyesno("Confirm", "Are you sure you want to delete this user?")
+        
+        def done(result):
+            success, msg = result
+            if success:
+                messagebox.showinfo("Success", msg)
+                # Refresh users list
+                # Also refresh events as they might have changed
+                self.refresh_trees("users", "events", "approval")
+            else:
+                messagebox.showerror("Error", msg)
+        
+        if confirm:
+            self.worker.submit(lambda: self.system.delete_user(user_id, self.user_id), done)
+    
+    def approve_event(self):
+        selected_item = self.approval_tree.selection()
+        if not selected_item:
+            messagebox.showinfo("Info", "Please select an event to approve")
+            return
+        
+        event_id = selected_item[0]
+        
+        def done(success):
+            if success:
+                messagebox.showinfo("Success", "Event approved successfully")
+                # Refresh unapproved events and available events
+                self.refresh_trees("approval", "events")
+            else:
+                messagebox.showerror("Error", "Event approval failed")
+        
+        # Approve the event
+        self.worker.submit(lambda: self.system.approve_event(event_id, self.user_id), done)
+    
+    def view_approval_details(self):
+        selected_item = self.approval_tree.selection()
+        if not selected_item:
+            messagebox.showinfo("Info", "Please select an event to view")
+            return
+        
+        event_id = selected_item[0]
+        event = self.system.event_manager.get_event(event_id)
+        
+        if event:
+            # Get organizer info
+            organizer = self.system.user_manager.get_user(event.organizer_id)
+            organizer_name = organizer.username if organizer else "Unknown"
+            
+            details = f"Title: {event.title}\n\n"
+            details += f"Description: {event.description}\n\n"
+            details += f"Date: {event.date.strftime('%Y-%m-%d %H:%M')}\n\n"
+            details += f"Venue: {event.venue}\n\n"
+            details += f"Category: {event.category}\n\n"
+            details += f"Capacity: {event.capacity}\n\n"
+            details += f"Organizer: {organizer_name}"
+            
+            # Create a details window
+            details_window = tk.Toplevel(self.master)
+            details_window.title(f"Event Details: {event.title}")
+            details_window.geometry("400x400")
+            
+            # Make the window modal
+            details_window.transient(self.master)
+            details_window.grab_set()
+            
+            # Add a text widget to display details
+            text_widget = tk.Text(details_window, wrap="word", padx=10, pady=10)
+            text_widget.insert("1.0", details)
+            text_widget.config(state="disabled")
+            text_widget.pack(fill="both", expand=True)
+            
+            # Add buttons
+            button_frame = ttk.Frame(details_window)
+            button_frame.pack(fill='x', pady=10)
+            
+            ttk.Button(button_frame, text="Approve", command=lambda: [details_window.destroy(), self.worker.submit(lambda: self.system.approve_event(event_id, self.user_id), lambda success: self.refresh_trees("approval", "events"))]).pack(side=tk.LEFT, padx=5)
+            ttk.Button(button_frame, text="Close", command=details_window.destroy).pack(side=tk.LEFT, padx=5)
+    
+    def create_event(self):
+        # Create a window for creating a new event
+        create_window = tk.Toplevel(self.master)
+        create_window.title("Create New Event")
+        create_window.geometry("500x600")
+        
+        # Make the window modal
+        create_window.transient(self.master)
+        create_window.grab_set()
+        
+        # Create a form
+        form_frame = ttk.Frame(create_window, padding=20)
+        form_frame.pack(fill='both', expand=True)
+        
+        # Title
+        ttk.Label(form_frame, text="Title:").grid(row=0, column=0, sticky="w", pady=5)
+        title_var = tk.StringVar()
+        ttk.Entry(form_frame, textvariable=title_var, width=40).grid(row=0, column=1, sticky="w", pady=5)
+        
+        # Description
+        ttk.Label(form_frame, text="Description:").grid(row=1, column=0, sticky="nw", pady=5)
+        description_text = tk.Text(form_frame, width=40, height=5)
+        description_text.grid(row=1, column=1, sticky="w", pady=5)
+        
+        # Date
+        ttk.Label(form_frame, text="Date:").grid(row=2, column=0, sticky="w", pady=5)
+        date_frame = ttk.Frame(form_frame)
+        date_frame.grid(row=2, column=1, sticky="w", pady=5)
+        
+        # Use DateEntry for date
+        date_picker = DateEntry(date_frame, width=12, background='darkblue',
+                                foreground='white', borderwidth=2, date_pattern='yyyy-mm-dd')
+        date_picker.pack(side=tk.LEFT)
+        
+        # Time selection
+        ttk.Label(date_frame, text="  Time:").pack(side=tk.LEFT)
+        hour_var = tk.StringVar(value="12")
+        ttk.Combobox(date_frame, textvariable=hour_var, values=[str(i).zfill(2) for i in range(24)], 
+                    width=3, state="readonly").pack(side=tk.LEFT)
+        ttk.Label(date_frame, text=":").pack(side=tk.LEFT)
+        minute_var = tk.StringVar(value="00")
+        ttk.Combobox(date_frame, textvariable=minute_var, values=[str(i).zfill(2) for i in range(0, 60, 5)], 
+                    width=3, state="readonly").pack(side=tk.LEFT)
+        
+        # Venue
+        ttk.Label(form_frame, text="Venue:").grid(row=3, column=0, sticky="w", pady=5)
+        venue_var = tk.StringVar()
+        ttk.Entry(form_frame, textvariable=venue_var, width=40).grid(row=3, column=1, sticky="w", pady=5)
+        
+        # Capacity
+        ttk.Label(form_frame, text="Capacity:").grid(row=4, column=0, sticky="w", pady=5)
+        capacity_var = tk.IntVar(value=50)
+        ttk.Spinbox(form_frame, from_=1, to=1000, textvariable=capacity_var, width=10).grid(row=4, column=1, sticky="w", pady=5)
+        
+        # Category
+        ttk.Label(form_frame, text="Category:").grid(row=5, column=0, sticky="w", pady=5)
+        category_var = tk.StringVar(value="Technology")
+        categories = ["Technology", "Music", "Art", "Sports", "Education", "Other"]
+        ttk.Combobox(form_frame, textvariable=category_var, values=categories, width=20, state="readonly").grid(row=5, column=1, sticky="w", pady=5)
+        
+        # Create button
+        def submit_event():
+            title = title_var.get()
+            description = description_text.get("1.0", "end-1c")
+            date_str = date_picker.get()
+            hour = hour_var.get()
+            minute = minute_var.get()
+            venue = venue_var.get()
+            capacity = capacity_var.get()
+            category = category_var.get()
+            
+            if not title or not description or not venue:
+                messagebox.showerror("Error", "Please fill all required fields")
+                return
+            
+            # Create a datetime object
+            try:
+                event_date = datetime.strptime(f"{date_str} {hour}:{minute}", "%Y-%m-%d %H:%M")
+                if event_date < datetime.now():
+                    messagebox.showerror("Error", "Event date cannot be in the past")
+                    return
+            except ValueError:
+                messagebox.showerror("Error", "Invalid date format")
+                return
+            
+            def done(result):
+                event_id, msg = result
+                if event_id:
+                    messagebox.showinfo("Success", "Event created successfully")
+                    create_window.destroy()
+                    # If admin, also refresh unapproved events
+                    self.refresh_trees("my_events", "approval")
+                else:
+                    messagebox.showerror("Error", msg)
+            
+            # Create the event
+            self.worker.submit(lambda: self.system.create_event(title, description, event_date, venue,
+                                                                capacity, category, self.user_id), done)
+        
+        ttk.Button(form_frame, text="Create Event", command=submit_event).grid(row=6, column=0, columnspan=2, pady=20)
+    
+    def view_my_event_details(self):
+        selected_item = self.my_events_tree.selection()
+        if not selected_item:
+            messagebox.showinfo("Info", "Please select an event to view")
+            return
+        
+        event_id = selected_item[0]
+        event = self.system.event_manager.get_event(event_id)
+        
+        if event:
+            details = f"Title: {event.title}\n\n"
+            details += f"Description: {event.description}\n\n"
+            details += f"Date: {event.date.strftime('%Y-%m-%d %H:%M')}\n\n"
+            details += f"Venue: {event.venue}\n\n"
+            details += f"Category: {event.category}\n\n"
+            details += f"Capacity: {event.capacity}\n\n"
+            details += f"Status: {'Approved' if event.is_approved else 'Pending Approval'}\n\n"
+            details += f"Registered Users: {len(event.registered_users)}/{event.capacity}"
+            
+            # Create a details window
+            details_window = tk.Toplevel(self.master)
+            details_window.title(f"Event Details: {event.title}")
+            details_window.geometry("400x400")
+            
+            # Make the window modal
+            details_window.transient(self.master)
+            details_window.grab_set()
+            
+            # Add a text widget to display details
+            text_widget = tk.Text(details_window, wrap="word", padx=10, pady=10)
+            text_widget.insert("1.0", details)
+            text_widget.config(state="disabled")
+            text_widget.pack(fill="both", expand=True)
+            
+            # Add a close button
+            ttk.Button(details_window, text="Close", command=details_window.destroy).pack(pady=10)
+    
+    def view_registrations(self):
+        selected_item = self.my_events_tree.selection()
+        if not selected_item:
+            messagebox.showinfo("Info", "Please select an event to view registrations")
+            return
+        
+        event_id = selected_item[0]
+        event = self.system.event_manager.get_event(event_id)
+        
+        if event:
+            # Create a registrations window
+            reg_window = tk.Toplevel(self.master)
+            reg_window.title(f"Registrations for: {event.title}")
+            reg_window.geometry("400x400")
+            
+            # Make the window modal
+            reg_window.transient(self.master)
+            reg_window.grab_set()
+            
+            # Create a treeview for users
+            reg_tree = ttk.Treeview(reg_window, columns=("Username", "Email"))
+            reg_tree.pack(fill='both', expand=True, padx=10, pady=10)
+            
+            # Configure the treeview
+            reg_tree.heading("#0", text="ID")
+            reg_tree.heading("Username", text="Username")
+            reg_tree.heading("Email", text="Email")
+            
+            reg_tree.column("#0", width=50, stretch=tk.NO)
+            reg_tree.column("Username", width=150, stretch=tk.YES)
+            reg_tree.column("Email", width=200, stretch=tk.YES)
+            
+            # Add a scrollbar
+            scrollbar = ttk.Scrollbar(reg_window, orient="vertical", command=reg_tree.yview)
+            scrollbar.pack(side=tk.RIGHT, fill='y')
+            reg_pages = PagedTree(reg_tree, scrollbar, worker=self.worker)
+            
+            def fetch_page(limit, cursor):
+                user_ids, next_cursor = self.system.get_event_registrations_page(event_id, None, limit, cursor)
+                return {user_id: self.system.user_manager.get_user(user_id) for user_id in user_ids}, next_cursor
+            
+            def make_row(user_id, user):
+                if user:
+                    return user_id[:8], (user.username, user.email)
+            
+            # Populate the treeview with registered users, a page at a time
+            reg_pages.load(fetch_page, make_row)
+            
+            # Add a close button
+            ttk.Button(reg_window, text="Close", command=reg_window.destroy).pack(pady=10)
+    
+    def view_registration_details(self):
+        selected_item = self.registrations_tree.selection()
+        if not selected_item:
+            messagebox.showinfo("Info", "Please select a registration to view")
+            return
+        
+        event_id = selected_item[0]
+        event = self.system.event_manager.get_event(event_id)
+        
+        if event:
+            details = f"Title: {event.title}\n\n"
+            details += f"Description: {event.description}\n\n"
+            details += f"Date: {event.date.strftime('%Y-%m-%d %H:%M')}\n\n"
+            details += f"Venue: {event.venue}\n\n"
+            details += f"Category: {event.category}\n\n"
+            details += f"Available Seats: {event.seats_available()}/{event.capacity}"
+            
+            # Create a details window
+            details_window = tk.Toplevel(self.master)
+            details_window.title(f"Event Details: {event.title}")
+            details_window.geometry("400x400")
+            
+            # Make the window modal
+            details_window.transient(self.master)
+            details_window.grab_set()
+            
+            # Add a text widget to display details
+            text_widget = tk.Text(details_window, wrap="word", padx=10, pady=10)
+            text_widget.insert("1.0", details)
+            text_widget.config(state="disabled")
+            text_widget.pack(fill="both", expand=True)
+            
+            # Add a close button
+            ttk.Button(details_window, text="Close", command=details_window.destroy).pack(pady=10)
+    
+    def unregister_from_registration(self):
+        selected_item = self.registrations_tree.selection()
+        if not selected_item:
+            messagebox.showinfo("Info", "Please select a registration to unregister from")
+            return
+        
+        event_id = selected_item[0]
+        
+        # Confirm unregistration
+        confirm = messagebox.askyesno("Confirm", "Are you sure you want to unregister from this event?")
+        
+        def done(success):
+            if success:
+                messagebox.showinfo("Success", "Unregistration successful")
+                # Refresh registrations and available events
+                self.refresh_trees("registrations", "events")
+            else:
+                messagebox.showerror("Error", "Unregistration failed")
+        
+        if confirm:
+            # Unregister from the event
+            self.worker.submit(lambda: self.system.unregister_from_event(event_id, self.user_id), done)
+    
+    def edit_event(self):
+        selected_item = self.my_events_tree.selection()
+        if not selected_item:
+            messagebox.showinfo("Info", "Please select an event to edit")
+            return
+        
+        event_id = selected_item[0]
+        event = self.system.event_manager.get_event(event_id)
+        
+        if not event:
+            messagebox.showerror("Error", "Event not found")
+            return
+        
+        # Check if user is the organizer of this event
+        if event.organizer_id != self.user_id:
+            messagebox.showerror("Error", "You can only edit your own events")
+            return
+        
+        # Create a window for editing the event with improved style
+        edit_window = tk.Toplevel(self.master)
+        edit_window.title(f"Edit Event: {event.title}")
+        edit_window.geometry("550x650")
+        edit_window.configure(bg="#f5f7fa")  # Light blue-gray background
+        
+        # Make the window modal
+        edit_window.transient(self.master)
+        edit_window.grab_set()
+        
+        # Add a header
+        header_frame = tk.Frame(edit_window, bg="#4a6fa5", padx=10, pady=10)
+        header_frame.pack(fill='x')
+        
+        header_label = tk.Label(header_frame, text=f"Edit Event: {event.title}", 
+                            bg="#4a6fa5", fg="white", font=("Helvetica", 14, "bold"))
+        header_label.pack(anchor="w")
+        
+        # Create a styled form
+        form_frame = tk.Frame(edit_window, bg="#f5f7fa", padx=25, pady=20)
+        form_frame.pack(fill='both', expand=True)
+        
+        # Custom style for labels
+        label_style = {"bg": "#f5f7fa", "fg": "#333333", "font": ("Helvetica", 10, "bold")}
+        entry_style = {"bg": "white", "relief": "solid", "borderwidth": 1}
+        button_style = {"bg": "#5b87c7", "fg": "white", "font": ("Helvetica", 11, "bold"), 
+                    "activebackground": "#3a679f", "relief": "raised", "borderwidth": 2, "cursor": "hand2"}
+        
+        # Title
+        tk.Label(form_frame, text="Title:", **label_style).grid(row=0, column=0, sticky="w", pady=10, padx=5)
+        title_var = tk.StringVar(value=event.title)
+        title_entry = tk.Entry(form_frame, textvariable=title_var, width=40, **entry_style)
+        title_entry.grid(row=0, column=1, sticky="w", pady=10, padx=5)
+        
+        # Description
+        tk.Label(form_frame, text="Description:", **label_style).grid(row=1, column=0, sticky="nw", pady=10, padx=5)
+        description_frame = tk.Frame(form_frame, bg="#f5f7fa")
+        description_frame.grid(row=1, column=1, sticky="w", pady=10, padx=5)
+        
+        description_text = tk.Text(description_frame, width=40, height=5, **entry_style)
+        description_text.pack(side=tk.LEFT, fill="both", expand=True)
+        description_scroll = tk.Scrollbar(description_frame, command=description_text.yview)
+        description_scroll.pack(side=tk.RIGHT, fill="y")
+        description_text.configure(yscrollcommand=description_scroll.set)
+        description_text.insert("1.0", event.description)
+        
+        # Date
+        tk.Label(form_frame, text="Date:", **label_style).grid(row=2, column=0, sticky="w", pady=10, padx=5)
+        date_frame = tk.Frame(form_frame, bg="#f5f7fa")
+        date_frame.grid(row=2, column=1, sticky="w", pady=10, padx=5)
+        
+        # Use DateEntry for date with the current event date and better styling
+        event_date = event.date
+        date_picker = DateEntry(date_frame, width=12, background='#5b87c7',
+                                foreground='white', borderwidth=2, date_pattern='yyyy-mm-dd',
+                                year=event_date.year, month=event_date.month, day=event_date.day)
+        date_picker.pack(side=tk.LEFT)
+        
+        # Time selection with current event time
+        tk.Label(date_frame, text="  Time:", bg="#f5f7fa").pack(side=tk.LEFT)
+        hour_var = tk.StringVar(value=str(event_date.hour).zfill(2))
+        ttk.Combobox(date_frame, textvariable=hour_var, values=[str(i).zfill(2) for i in range(24)], 
+                    width=3, state="readonly").pack(side=tk.LEFT)
+        tk.Label(date_frame, text=":", bg="#f5f7fa").pack(side=tk.LEFT)
+        minute_var = tk.StringVar(value=str(event_date.minute).zfill(2))
+        ttk.Combobox(date_frame, textvariable=minute_var, values=[str(i).zfill(2) for i in range(0, 60, 5)], 
+                    width=3, state="readonly").pack(side=tk.LEFT)
+        
+        # Venue
+        tk.Label(form_frame, text="Venue:", **label_style).grid(row=3, column=0, sticky="w", pady=10, padx=5)
+        venue_var = tk.StringVar(value=event.venue)
+        tk.Entry(form_frame, textvariable=venue_var, width=40, **entry_style).grid(row=3, column=1, sticky="w", pady=10, padx=5)
+        
+        # Capacity
+        tk.Label(form_frame, text="Capacity:", **label_style).grid(row=4, column=0, sticky="w", pady=10, padx=5)
+        capacity_frame = tk.Frame(form_frame, bg="#f5f7fa")
+        capacity_frame.grid(row=4, column=1, sticky="w", pady=10, padx=5)
+        
+        capacity_var = tk.IntVar(value=event.capacity)
+        capacity_spinner = ttk.Spinbox(capacity_frame, from_=1, to=1000, textvariable=capacity_var, width=10)
+        capacity_spinner.pack(side=tk.LEFT)
+        
+        # Disable capacity field if there are registered users
+        if len(event.registered_users) > 0:
+            capacity_spinner.configure(state="disabled")
+            reg_label = tk.Label(capacity_frame, 
+                                text=f"({len(event.registered_users)} users registered)", 
+                                bg="#f5f7fa", fg="#e74c3c")
+            reg_label.pack(side=tk.LEFT, padx=10)
+        
+        # Category
+        tk.Label(form_frame, text="Category:", **label_style).grid(row=5, column=0, sticky="w", pady=10, padx=5)
+        category_var = tk.StringVar(value=event.category)
+        categories = ["Technology", "Music", "Art", "Sports", "Education", "Other"]
+        category_combo = ttk.Combobox(form_frame, textvariable=category_var, values=categories, width=20, state="readonly")
+        category_combo.grid(row=5, column=1, sticky="w", pady=10, padx=5)
+        category_combo.current(categories.index(event.category) if event.category in categories else 0)
+        
+        # Separator line
+        separator = ttk.Separator(form_frame, orient='horizontal')
+        separator.grid(row=6, column=0, columnspan=2, sticky="ew", pady=15)
+        
+        # Button frame
+        button_frame = tk.Frame(form_frame, bg="#f5f7fa")
+        button_frame.grid(row=7, column=0, columnspan=2, pady=10)
+        
+        # Update button
+        def update_event():
+            title = title_var.get()
+            description = description_text.get("1.0", "end-1c")
+            date_str = date_picker.get()
+            hour = hour_var.get()
+            minute = minute_var.get()
+            venue = venue_var.get()
+            capacity = capacity_var.get()
+            category = category_var.get()
+            
+            if not title or not description or not venue:
+                messagebox.showerror("Error", "Please fill all required fields")
+                return
+            
+            # Create a datetime object
+            try:
+                event_date = datetime.strptime(f"{date_str} {hour}:{minute}", "%Y-%m-%d %H:%M")
+                if event_date < datetime.now():
+                    messagebox.showerror("Error", "Event date cannot be in the past")
+                    return
+            except ValueError:
+                messagebox.showerror("Error", "Invalid date format")
+                return
+            
+            def done(result):
+                success, msg = result
+                if success:
+                    messagebox.showinfo("Success", "Event updated successfully")
+                    edit_window.destroy()
+                    # If user is admin, also refresh unapproved events
+                    # Also refresh available events
+                    self.refresh_trees("my_events", "approval", "events")
+                else:
+                    messagebox.showerror("Error", msg)
+            
+            # Update the event
+            self.worker.submit(lambda: self.system.update_event(event_id, title, description, event_date,
+                                                                venue, capacity, category, self.user_id), done)
+        
+        cancel_button = tk.Button(button_frame, text="Cancel", width=15, command=edit_window.destroy, 
+                                **button_style, bg="#6c757d")
+        cancel_button.pack(side=tk.LEFT, padx=10)
+        
+        update_button = tk.Button(button_frame, text="Update Event", width=15, command=update_event, **button_style)
+        update_button.pack(side=tk.LEFT, padx=10)
+        
+        # Add some styling to the window
+        edit_window.update_idletasks()
+        width = edit_window.winfo_width()
+        height = edit_window.winfo_height()
+        x = (edit_window.winfo_screenwidth() // 2) - (width // 2)
+        y = (edit_window.winfo_screenheight() // 2) - (height // 2)
+        edit_window.geometry('{}x{}+{}+{}'.format(width, height, x, y))
+
+
+class EventManagementApp:
+    def __init__(self, master, storage=None, make_storage=None):
+        self.master = master
+        self.master.title("Event Management System")
+        self.master.geometry("900x600")
+        
+        # Status bar with a progress indicator, shown while the worker is busy
+        self.status_bar = ttk.Frame(self.master)
+        self.status_bar.pack(side=tk.BOTTOM, fill='x')
+        self.status_label = ttk.Label(self.status_bar, text="")
+        self.status_label.pack(side=tk.LEFT, padx=5)
+        self.progress = ttk.Progressbar(self.status_bar, mode="indeterminate", length=120)
+        self.progress.pack(side=tk.RIGHT, padx=5, pady=2)
+        
+        # Loads and saves run on a worker thread, so the window stays responsive
+        self.worker = BackgroundWorker(self.master, self.show_busy)
+        
+        # The data storage: storage if given, else made on the worker by
+        # make_storage, or shared, so several windows can run on the same files
+        self.storage = storage
+        self.system = None
+        
+        def load_system():
+            # Create the event management system, browsing through a catalog file
+            # that every window on the same files shares. It is set here, on the
+            # worker, so anything queued after this finds it. Passwords are
+            # hashed on the worker too: one person logs in at a time, which
+            # doesn't need a pool of processes.
+            if self.storage is None:
+                self.storage = make_storage() if make_storage else DataStorage(shared=True)
+            self.system = EventManagementSystem(self.storage, catalog_file="events.catalog",
+                                                password_workers=0)
+        
+        self.worker.submit(load_system)
+        
+        # Initialize the user state
+        self.user_id = None
+        self.role = None
+        
+        # Show the login frame; logging in waits for the load in the worker's queue
+        self.show_login_frame()
+    
+    def show_busy(self, busy):
+        if busy:
+            self.status_label.config(text="Working...")
+            self.progress.start(10)
+        else:
+            self.status_label.config(text="")
+            self.progress.stop()
+    
+    def clear_window(self):
+        # Everything but the status bar
+        for widget in self.master.winfo_children():
+            if widget is not self.status_bar:
+                widget.destroy()
+    
+    def show_login_frame(self):
+        # Clear the window
+        self.clear_window()
+        
+        # Create and show the login frame
+        login_frame = LoginFrame(self.master, self.handle_login, self.show_register_frame)
+        login_frame.pack(fill='both', expand=True)
+    
+    def show_register_frame(self):
+        # Clear the window
+        self.clear_window()
+        
+        # Create and show the register frame
+        register_frame = RegisterFrame(self.master, self.handle_register, self.show_login_frame)
+        register_frame.pack(fill='both', expand=True)
+    
+    def show_dashboard(self):
+        # Clear the window
+        self.clear_window()
+        
+        # Create and show the dashboard
+        dashboard = UserDashboard(self.master, self.system, self.user_id, self.role, self.handle_logout,
+                                  self.worker)
+        dashboard.pack(fill='both', expand=True)
+    
+    def handle_login(self, username, password):
+        def done(result):
+            user_id, role = result
+            if user_id:
+                self.user_id = user_id
+                self.role = role
+                self.show_dashboard()
+            else:
+                messagebox.showerror("Login Failed", "Invalid username or password")
+        
+        self.worker.submit(lambda: self.system.login(username, password), done)
+    
+    def handle_register(self, username, password, email, role):
+        def done(result):
+            user_id, msg = result
+            if user_id:
+                messagebox.showinfo("Registration Successful", "You can now login with your credentials")
+                self.show_login_frame()
+            else:
+                messagebox.showerror("Registration Failed", msg)
+        
+        self.worker.submit(lambda: self.system.register_user(username, password, email, role), done)
+    
+    def handle_logout(self):
+        self.user_id = None
+        self.role = None
+        # Let a lazily loaded system drop the records this session read
+        self.worker.submit(self.system.evict)
+        self.show_login_frame()
+
+
+def main():
+    # Create the main window
+    root = tk.Tk()
+    
+    # --lazy reads records on demand instead of all at startup (large data
+    # directories). Opening it reads index sidecars, or indexes the files the
+    # first time, so it is made on the worker, after the window is up.
+    make_storage = LazyJsonStorage if "--lazy" in sys.argv[1:] else None
+    
+    # Create the application
+    app = EventManagementApp(root, make_storage=make_storage)
+    
+    # Start the main loop
+    root.mainloop()
+
+
+if __name__ == "__main__":
+    main()
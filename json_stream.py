@@ -0,0 +1,95 @@
+import json
+
+
+WHITESPACE = " \t\n\r"
+NUMBER_CHARS = "0123456789.eE+-"
+
+
+class _Reader:
+    # A growing window onto a text file; text before pos has been consumed
+    
+    def __init__(self, f, chunk_size):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+    
+    def read_more(self):
+        if self.eof:
+            return False
+        # Drop what has been consumed; read at least as much as is left over,
+        # so a value much larger than a chunk isn't re-parsed once per chunk
+        self.buf = self.buf[self.pos:]
+        self.pos = 0
+        chunk = self.f.read(max(self.chunk_size, len(self.buf)))
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf += chunk
+        return True
+    
+    def peek(self):
+        # Next non-whitespace character, "" at the end of the file
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self.read_more():
+                return ""
+    
+    def expect(self, chars):
+        char = self.peek()
+        if not char or char not in chars:
+            raise ValueError(f"Expected one of {chars!r}, got {char!r}")
+        self.pos += 1
+        return char
+    
+    def decode(self):
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if not self.read_more():
+                    raise
+                continue
+            # A number cut off by the chunk boundary ("12" of "12.5") still
+            # parses, so make sure the character after it was read too
+            if (end == len(self.buf) or self.buf[end] in NUMBER_CHARS) and self.read_more():
+                continue
+            self.pos = end
+            return value
+
+
+def iter_object_items(f, chunk_size=1 << 16):
+    """
+    Parse a file holding one JSON object and yield its members one by one.
+    
+    Only the member being parsed is held in memory, so a file of millions
+    of records can be turned into objects without first building the
+    whole dict.
+    
+    Args:
+        f: File opened in text mode
+        chunk_size: Characters to read at a time
+    
+    Yields:
+        (key, value) tuples in file order
+    """
+    reader = _Reader(f, chunk_size)
+    if not reader.peek():
+        return  # an empty file holds no records
+    reader.expect("{")
+    if reader.peek() == "}":
+        return
+    while True:
+        if reader.peek() != '"':
+            raise ValueError("Expected a string key")
+        key = reader.decode()
+        reader.expect(":")
+        yield key, reader.decode()
+        if reader.expect(",}") == "}":
+            return
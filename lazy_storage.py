@@ -0,0 +1,346 @@
+import json
+import os
+import pickle
+
+from main import DataStorage, LazyRecords, User, Event
+from storage_formats import read_records, detect_format, load_plain
+
+
+class _Index:
+    """
+    id -> (offset, length, *fields) for every record line of a JSON Lines
+    file, in file order, plus value -> ids maps for the fields, built on
+    first use. orders keeps the listings being paged through until the
+    file is next written, and previous_orders the ones before that.
+    """
+    
+    def __init__(self, fields):
+        self.fields = fields
+        self.rows = {}
+        self.orders = {}  # (filters, order) -> (ids, {id: position})
+        self.previous_orders = {}
+        self._by_field = {}
+    
+    def set_rows(self, rows):
+        self.rows = rows
+        self._reset_orders()
+        self._by_field = {}
+    
+    def _reset_orders(self):
+        if self.orders:
+            self.previous_orders = self.orders
+        self.orders = {}
+    
+    def ids_where(self, field, value):
+        by_value = self._by_field.get(field)
+        if by_value is None:
+            position = 2 + self.fields.index(field)
+            by_value = {}
+            for rid, row in self.rows.items():
+                by_value.setdefault(row[position], {})[rid] = None
+            self._by_field[field] = by_value
+        return by_value.get(value, {})
+    
+    def replace_rows(self, rows, changed_ids):
+        # Offsets move on every rewrite, but only the changed records can
+        # have moved between values of a field
+        for field, by_value in self._by_field.items():
+            position = 2 + self.fields.index(field)
+            for rid in changed_ids:
+                old = self.rows.get(rid)
+                if old is not None:
+                    by_value.get(old[position], {}).pop(rid, None)
+                new = rows.get(rid)
+                if new is not None:
+                    by_value.setdefault(new[position], {})[rid] = None
+        self.rows = rows
+        self._reset_orders()
+
+
+class LazyJsonStorage(DataStorage):
+    """
+    Storage backend that reads records only when they are used.
+    
+    Each file holds one [id, record] JSON line per record (the "jsonl"
+    format), and a "<file>.idx" sidecar keeps every record's offset and
+    length plus the fields the managers look up by. Startup reads just
+    the sidecars; load_users/load_events return LazyRecords that read
+    single lines on first access, and the manager lookups are answered
+    from the sidecar fields (supports_queries), so nothing else is loaded.
+    
+    Files in another format, or whose sidecar is missing or out of date,
+    are converted and indexed once on startup. A write rewrites the file
+    like DataStorage does, but copies unchanged records as raw bytes.
+    Use LazyRecords.evict() (EventManagementSystem.evict()) to drop
+    records that are no longer needed.
+    """
+    
+    supports_queries = True
+    
+    USER_FIELDS = ("username", "email", "role")
+    EVENT_FIELDS = ("category", "organizer_id", "is_approved", "date")
+    
+    def __init__(self, users_file="users.json", events_file="events.json"):
+        super().__init__(users_file, events_file, file_format="jsonl")
+        self._indexes = {
+            users_file: _Index(self.USER_FIELDS),
+            events_file: _Index(self.EVENT_FIELDS),
+        }
+        for path, index in self._indexes.items():
+            self._open_index(path, index)
+    
+    # Index
+    
+    def _stamp(self, path):
+        stat = os.stat(path)
+        return stat.st_size, stat.st_mtime_ns
+    
+    def _open_index(self, path, index):
+        if not os.path.exists(path):
+            return
+        try:
+            with open(path + ".idx", 'rb') as f:
+                saved = load_plain(f)
+            if saved["stamp"] == list(self._stamp(path)) and saved["fields"] == list(index.fields):
+                index.set_rows({row[0]: row[1:] for row in saved["rows"]})
+                return
+        except (OSError, ValueError, KeyError, EOFError, pickle.UnpicklingError):
+            pass
+        # No usable sidecar: convert the file to JSON Lines and index it
+        with self._locked(path):
+            if detect_format(path).name == "jsonl":
+                self._rewrite(path, index, {})
+            else:
+                self._rewrite(path, index, dict(read_records(path)), full=True)
+    
+    def _save_index(self, path, index):
+        saved = {
+            "stamp": list(self._stamp(path)),
+            "fields": list(index.fields),
+            "rows": [(rid,) + row for rid, row in index.rows.items()],
+        }
+        tmp_path = path + ".idx.tmp"
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(saved, f, protocol=5)
+        os.replace(tmp_path, path + ".idx")
+    
+    def _rewrite(self, path, index, changed, full=False):
+        """
+        Write path again with changed ({id: record dict, or None to delete})
+        applied, copying every other record line from the old file. Lines
+        stay in creation order, which is the order records are listed in.
+        
+        With full=True changed is the whole collection instead.
+        """
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        rows = {}
+        old = open(path, 'rb') if os.path.exists(path) and not full else None
+        try:
+            with open(tmp_path, 'wb') as out:
+                def write(rid, line, record):
+                    rows[rid] = (out.tell(), len(line)) + tuple(record[field] for field in index.fields)
+                    out.write(line)
+                
+                if old is not None and not index.rows:
+                    # A JSON Lines file without a sidecar: take the ids from the lines
+                    for line in old:
+                        if line.strip():
+                            rid, record = json.loads(line)
+                            write(rid, line, record)
+                elif old is not None:
+                    # Unchanged lines are copied in runs, as one read and write each
+                    run_start = run_end = 0
+                    for rid, row in index.rows.items():
+                        if rid not in changed:
+                            if row[0] != run_end:
+                                self._copy(old, out, run_start, run_end)
+                                run_start = row[0]
+                            run_end = row[0] + row[1]
+                            rows[rid] = (out.tell() + row[0] - run_start,) + row[1:]
+                            continue
+                        self._copy(old, out, run_start, run_end)
+                        run_start = run_end = 0
+                        if changed[rid] is not None:
+                            write(rid, self._encode(rid, changed[rid]), changed[rid])
+                    self._copy(old, out, run_start, run_end)
+                for rid, record in changed.items():
+                    if record is not None and rid not in rows:
+                        write(rid, self._encode(rid, record), record)
+                out.flush()
+                os.fsync(out.fileno())
+            if old is not None:
+                old.close()
+                old = None
+            os.replace(tmp_path, path)
+        finally:
+            if old is not None:
+                old.close()
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        if full or not index.rows:
+            index.set_rows(rows)
+        else:
+            index.replace_rows(rows, changed)
+        self._save_index(path, index)
+    
+    def _copy(self, old, out, start, end):
+        old.seek(start)
+        while start < end:
+            chunk = old.read(min(end - start, 1 << 20))
+            out.write(chunk)
+            start += len(chunk)
+    
+    def _encode(self, rid, record):
+        return (json.dumps([rid, record], separators=(",", ":")) + "\n").encode()
+    
+    # Reading
+    
+    def _fetch(self, path, index, build, ids):
+        with self._write_lock:
+            wanted = sorted((index.rows[rid][0], index.rows[rid][1], rid) for rid in ids if rid in index.rows)
+            if not wanted:
+                return {}
+            records = {}
+            with open(path, 'rb') as f:
+                for offset, length, rid in wanted:
+                    f.seek(offset)
+                    records[rid] = build(json.loads(f.read(length))[1])
+        return {rid: records[rid] for rid in ids if rid in records}
+    
+    def _lazy(self, path, build):
+        index = self._indexes[path]
+        return LazyRecords(
+            lambda ids: self._fetch(path, index, build, ids),
+            lambda: list(index.rows),
+            lambda: len(index.rows),
+        )
+    
+    def load_users(self):
+        return self._lazy(self.users_file, User.from_dict)
+    
+    def load_events(self):
+        return self._lazy(self.events_file, Event.from_dict)
+    
+    def query_user_ids(self, username=None, email=None, role=None):
+        index = self._indexes[self.users_file]
+        with self._write_lock:
+            return self._match(index, {"username": username, "email": email, "role": role})
+    
+    def query_event_ids(self, category=None, organizer_id=None, approved=None, user_id=None,
+                        order_by_date=None):
+        """
+        Return the ids of events matching every given filter.
+        
+        Args:
+            category: Only events in this category
+            organizer_id: Only events created by this organizer
+            approved: True/False to filter on approval state
+            user_id: Only events this user is registered for
+            order_by_date: "asc" or "desc"; creation order otherwise
+        
+        Returns:
+            List of event IDs
+        """
+        index = self._indexes[self.events_file]
+        registered = None
+        if user_id is not None:
+            # Registrations are kept on the user's record too
+            user = self._fetch(self.users_file, self._indexes[self.users_file], dict, [user_id]).get(user_id)
+            registered = set(user.get("registered_events", ())) if user else set()
+        with self._write_lock:
+            ids = self._match(index, {"category": category, "organizer_id": organizer_id,
+                                      "is_approved": approved})
+            if registered is not None:
+                ids = [rid for rid in ids if rid in registered]
+            if order_by_date:
+                position = 2 + index.fields.index("date")
+                ids.sort(key=lambda rid: index.rows[rid][position], reverse=order_by_date == "desc")
+        return ids
+    
+    def page_user_ids(self, limit, cursor=None, role=None):
+        """
+        One page of query_user_ids(role=role): (ids, next_cursor). See _page.
+        """
+        return self._page(self._indexes[self.users_file], ("role", role), limit, cursor,
+                          lambda: self.query_user_ids(role=role))
+    
+    def page_event_ids(self, limit, cursor=None, category=None, approved=None, order_by_date=None):
+        """
+        One page of query_event_ids with the same filters: (ids, next_cursor).
+        See _page.
+        """
+        return self._page(self._indexes[self.events_file], (category, approved, order_by_date), limit, cursor,
+                          lambda: self.query_event_ids(category=category, approved=approved,
+                                                       order_by_date=order_by_date))
+    
+    def _page(self, index, key, limit, cursor, query):
+        # The listing is worked out on its first page and kept until the
+        # next write (which rewrites the whole file anyway), so later pages
+        # cost only their own length. The cursor is the last ID of the
+        # page before.
+        with self._write_lock:
+            listing = index.orders.get(key)
+            if listing is None:
+                ids = query()
+                listing = index.orders[key] = (ids, {rid: position for position, rid in enumerate(ids)})
+            ids, positions = listing
+            start = 0
+            if cursor is not None:
+                start = positions.get(cursor)
+                start = self._resume(index, key, cursor, positions, len(ids)) if start is None else start + 1
+            page = ids[start:start + limit]
+            more = start + limit < len(ids)
+        return page, page[-1] if more else None
+    
+    def _resume(self, index, key, cursor, positions, end):
+        # The cursor's record is gone: carry on from the first record after
+        # it in the listing as it was before, that is still listed
+        previous = index.previous_orders.get(key)
+        if previous is None or cursor not in previous[1]:
+            raise ValueError(f"Unknown cursor {cursor!r}")
+        previous_ids, previous_positions = previous
+        for rid in previous_ids[previous_positions[cursor] + 1:]:
+            if rid in positions:
+                return positions[rid]
+        return end
+    
+    def _match(self, index, filters):
+        matches = None
+        for field, value in filters.items():
+            if value is None:
+                continue
+            ids = index.ids_where(field, value)
+            matches = dict(ids) if matches is None else {rid: None for rid in matches if rid in ids}
+        if matches is None:
+            return list(index.rows)
+        # Creation order, like the other backends
+        return sorted(matches, key=lambda rid: index.rows[rid][0])
+    
+    # Writing
+    
+    def _write_records(self, path, records, changed):
+        index = self._indexes[path]
+        with self._locked(path):
+            for record in changed.values():
+                if record is not None:
+                    record.version += 1
+            self._rewrite(path, index, {rid: record.to_dict() if record is not None else None
+                                        for rid, record in changed.items()})
+    
+    def _save_all(self, path, records):
+        if isinstance(records, LazyRecords):
+            # Anything not materialized is already on disk unchanged
+            changed = dict(records.loaded())
+            with self._locked(path):
+                self._rewrite(path, self._indexes[path],
+                              {rid: record.to_dict() for rid, record in changed.items()})
+            return
+        with self._locked(path):
+            self._rewrite(path, self._indexes[path],
+                          {rid: record.to_dict() for rid, record in list(records.items())}, full=True)
+    
+    def save_users(self, users):
+        self._save_all(self.users_file, users)
+    
+    def save_events(self, events):
+        self._save_all(self.events_file, events)
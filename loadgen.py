@@ -0,0 +1,120 @@
+import argparse
+import http.client
+import json
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+
+
+class Client:
+    """One keep-alive connection to the server."""
+    
+    def __init__(self, host, port):
+        self.conn = http.client.HTTPConnection(host, port)
+    
+    def request(self, method, path, body=None, token=None):
+        data = json.dumps(body).encode() if body is not None else None
+        headers = {"Content-Type": "application/json"} if data else {}
+        if token:
+            headers["Authorization"] = f"Bearer {token}"
+        self.conn.request(method, path, body=data, headers=headers)
+        response = self.conn.getresponse()
+        return response.status, json.loads(response.read())
+    
+    def close(self):
+        self.conn.close()
+
+
+def setup(client, users, capacity):
+    # An organizer with one approved event and enough users to register for it;
+    # returns the event's id and each user's sign-in token
+    tag = uuid.uuid4().hex[:8]
+    _, admin = client.request("POST", "/login", {"username": "admin", "password": "admin123"})
+    _, organizer = client.request("POST", "/users", {"username": f"org-{tag}", "password": "pw",
+                                                     "email": f"org-{tag}@example.com", "role": "organizer"})
+    date = (datetime.now() + timedelta(days=30)).isoformat()
+    _, event = client.request("POST", "/events", {
+        "title": f"Load test {tag}", "description": "", "date": date, "venue": "Hall",
+        "capacity": capacity, "category": "Load test"}, organizer["token"])
+    client.request("POST", f"/events/{event['event_id']}/approve", token=admin["token"])
+    tokens = []
+    for i in range(users):
+        _, user = client.request("POST", "/users", {"username": f"user-{tag}-{i}", "password": "pw",
+                                                    "email": f"user-{tag}-{i}@example.com"})
+        tokens.append(user["token"])
+    return event["event_id"], tokens
+
+
+def run(host, port, connections, requests_per_connection, make_request):
+    """
+    Send requests from several connections at once.
+    
+    Args:
+        make_request: (connection number, request number) -> (method, path, body, token)
+    
+    Returns:
+        Tuple of (elapsed seconds, sorted latencies in seconds, error count)
+    """
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+    
+    def worker(n):
+        client = Client(host, port)
+        mine, failed = [], 0
+        for i in range(requests_per_connection):
+            method, path, body, token = make_request(n, i)
+            start = time.perf_counter()
+            status, _ = client.request(method, path, body, token)
+            mine.append(time.perf_counter() - start)
+            if status >= 500:
+                failed += 1
+        client.close()
+        with lock:
+            latencies.extend(mine)
+            errors[0] += failed
+    
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(connections)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start, sorted(latencies), errors[0]
+
+
+def report(name, elapsed, latencies, errors):
+    def percentile(p):
+        return latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000
+    print(f"{name}: {len(latencies)} requests in {elapsed:.2f}s = {len(latencies) / elapsed:.0f} req/s, "
+          f"p50 {percentile(0.5):.2f}ms p99 {percentile(0.99):.2f}ms, {errors} errors")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure registration and listing throughput of server.py")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--connections", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=200, help="requests per connection")
+    parser.add_argument("--only", choices=["register", "list"], help="run a single scenario")
+    args = parser.parse_args()
+    
+    total = args.connections * args.requests
+    client = Client(args.host, args.port)
+    event_id, tokens = setup(client, total if args.only != "list" else 0, total)
+    client.close()
+    
+    if args.only in (None, "register"):
+        def register(n, i):
+            return "POST", f"/events/{event_id}/register", None, tokens[n * args.requests + i]
+        report("register", *run(args.host, args.port, args.connections, args.requests, register))
+    
+    if args.only in (None, "list"):
+        def listing(n, i):
+            return "GET", "/events?sort_by_date=1", None, None
+        report("list", *run(args.host, args.port, args.connections, args.requests, listing))
+
+
+if __name__ == "__main__":
+    main()
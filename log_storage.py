@@ -0,0 +1,242 @@
+import json
+import os
+import shutil
+import threading
+
+from main import DataStorage, User, Event
+
+
+class LogStorage(DataStorage):
+    """
+    Storage backend that appends one JSON line per change instead of
+    rewriting users.json / events.json on every mutation.
+    
+    The JSON files act as the snapshot and users.log / events.log hold the
+    changes made since. Loading reads the snapshot and replays the log on
+    top of it, so a write costs the size of the change, not the dataset.
+    
+    Once the logs pass max_log_records lines or max_log_bytes bytes, a
+    compaction writes a fresh snapshot from the loaded collections and
+    drops the log behind it, on a background thread unless background=False.
+    """
+    
+    def __init__(self, users_file="users.json", events_file="events.json", sync=False,
+                 max_log_records=10000, max_log_bytes=None, background=True, file_format="json"):
+        super().__init__(users_file, events_file, file_format=file_format)
+        self.users_log = os.path.splitext(users_file)[0] + ".log"
+        self.events_log = os.path.splitext(events_file)[0] + ".log"
+        # fsync every record; slower, but survives power loss and not just a crash
+        self.sync = sync
+        self.max_log_records = max_log_records
+        self.max_log_bytes = max_log_bytes
+        self.background = background
+        self._log_handles = {}
+        # log path -> [records, bytes] in it since the last compaction
+        self._log_sizes = {}
+        # The dicts handed out by load_users/load_events are the ones the
+        # managers keep mutating, so compaction snapshots straight from them
+        self._users = None
+        self._events = None
+        self._lock = threading.RLock()
+        self._compaction = None
+    
+    def _append(self, entries):
+        # entries: list of (log path, record); written together and flushed once
+        lines = [(path, json.dumps(record, separators=(",", ":")) + "\n") for path, record in entries]
+        with self._lock:
+            touched = {}
+            for path, line in lines:
+                handle = self._log_handles.get(path)
+                if handle is None:
+                    handle = open(path, 'a')
+                    self._log_handles[path] = handle
+                handle.write(line)
+                touched[path] = handle
+                size = self._log_sizes.setdefault(path, [0, 0])
+                size[0] += 1
+                size[1] += len(line)
+            for handle in touched.values():
+                handle.flush()
+                if self.sync:
+                    os.fsync(handle.fileno())
+            if self._should_compact():
+                self.compact(wait=not self.background)
+    
+    def _should_compact(self):
+        if self._compaction is not None and self._compaction.is_alive():
+            return False
+        records = sum(size[0] for size in self._log_sizes.values())
+        if self.max_log_records and records >= self.max_log_records:
+            return True
+        log_bytes = sum(size[1] for size in self._log_sizes.values())
+        if self.max_log_bytes and log_bytes >= self.max_log_bytes:
+            return True
+        return False
+    
+    def _read_log(self, path):
+        # Records not yet folded into the snapshot: an interrupted
+        # compaction's segment first, then the active log. Counted afresh,
+        # as a reload reads the same log again.
+        size = self._log_sizes[path] = [0, 0]
+        for segment in (path + ".compacting", path):
+            if not os.path.exists(segment):
+                continue
+            with open(segment, 'r') as f:
+                for line in f:
+                    size[0] += 1
+                    size[1] += len(line)
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        # A torn last line from a crash mid-append; the change never completed
+                        print(f"Skipping unreadable record in {segment}")
+    
+    def _close_log(self, path):
+        handle = self._log_handles.pop(path, None)
+        if handle is not None:
+            handle.close()
+    
+    def _rotate_log(self, path):
+        # Move the active log aside so appends can continue into a fresh one
+        # while the snapshot is written
+        self._close_log(path)
+        pending = path + ".compacting"
+        if not os.path.exists(path):
+            return
+        if os.path.exists(pending):
+            # Left behind by an interrupted compaction; it still has to be covered
+            with open(pending, 'a') as out, open(path, 'r') as f:
+                shutil.copyfileobj(f, out)
+            os.remove(path)
+        else:
+            os.replace(path, pending)
+    
+    def compact(self, wait=True):
+        """
+        Write a snapshot of the loaded users and events and discard the
+        log records it covers.
+        
+        The snapshot is taken from live objects while new changes keep
+        going to a fresh log; since replay is idempotent, records that
+        end up both in the snapshot and in the new log are harmless.
+        
+        Args:
+            wait: Block until the snapshot is on disk instead of writing it
+                on a background thread
+        """
+        with self._lock:
+            if self._compaction is not None:
+                self._compaction.join()
+            jobs = []
+            if self._users is not None:
+                self._rotate_log(self.users_log)
+                jobs.append((self.users_file, self.users_log, "user_id", list(self._users.values())))
+            if self._events is not None:
+                self._rotate_log(self.events_log)
+                jobs.append((self.events_file, self.events_log, "event_id", list(self._events.values())))
+            self._log_sizes.clear()
+            self._compaction = threading.Thread(target=self._run_compaction, args=(jobs,), daemon=True)
+            self._compaction.start()
+        if wait:
+            self._compaction.join()
+    
+    def _run_compaction(self, jobs):
+        for snapshot_file, log_file, id_field, records in jobs:
+            try:
+                dicts = {getattr(record, id_field): record.to_dict() for record in records}
+                self._write_file(snapshot_file, dicts)
+                if os.path.exists(log_file + ".compacting"):
+                    os.remove(log_file + ".compacting")
+            except Exception as e:
+                # The pending segment stays on disk and is replayed on the next load
+                print(f"Error compacting {snapshot_file}: {e}")
+    
+    def load_users(self):
+        users = super().load_users()
+        for record in self._read_log(self.users_log):
+            if record["op"] == "put":
+                users[record["user"]["user_id"]] = User.from_dict(record["user"])
+            elif record["op"] == "delete":
+                users.pop(record["user_id"], None)
+        self._users = users
+        return users
+    
+    def load_events(self):
+        events = super().load_events()
+        # Every op is idempotent, so replaying changes already contained in
+        # the snapshot (e.g. after a crash between snapshot and truncate) is harmless
+        for record in self._read_log(self.events_log):
+            op = record["op"]
+            if op == "put":
+                events[record["event"]["event_id"]] = Event.from_dict(record["event"])
+            elif op == "delete":
+                events.pop(record["event_id"], None)
+            elif op == "register":
+                event = events.get(record["event_id"])
+                if event:
+                    event.registered_users.add(record["user_id"])
+            elif op == "unregister":
+                event = events.get(record["event_id"])
+                if event:
+                    event.registered_users.discard(record["user_id"])
+        self._events = events
+        return events
+    
+    # A full save writes a fresh snapshot, after which the log is redundant
+    def save_users(self, users):
+        with self._lock:
+            self._users = users
+            self.compact()
+    
+    def save_events(self, events):
+        with self._lock:
+            self._events = events
+            self.compact()
+    
+    def save_user(self, user, users):
+        self.write_batch([("save_user", (user, users))])
+    
+    def delete_user(self, user_id, users):
+        self.write_batch([("delete_user", (user_id, users))])
+    
+    def save_event(self, event, events):
+        self.write_batch([("save_event", (event, events))])
+    
+    def delete_event(self, event_id, events):
+        self.write_batch([("delete_event", (event_id, events))])
+    
+    def save_registration(self, event_id, user_id, events):
+        self.write_batch([("save_registration", (event_id, user_id, events))])
+    
+    def delete_registration(self, event_id, user_id, events):
+        self.write_batch([("delete_registration", (event_id, user_id, events))])
+    
+    def write_batch(self, changes):
+        entries = []
+        for name, args in changes:
+            if name == "save_user":
+                user, self._users = args
+                entries.append((self.users_log, {"op": "put", "user": user.to_dict()}))
+            elif name == "delete_user":
+                user_id, self._users = args
+                entries.append((self.users_log, {"op": "delete", "user_id": user_id}))
+            elif name == "save_event":
+                event, self._events = args
+                entries.append((self.events_log, {"op": "put", "event": event.to_dict()}))
+            elif name == "delete_event":
+                event_id, self._events = args
+                entries.append((self.events_log, {"op": "delete", "event_id": event_id}))
+            elif name == "save_registration":
+                event_id, user_id, self._events = args
+                entries.append((self.events_log, {"op": "register", "event_id": event_id, "user_id": user_id}))
+            elif name == "delete_registration":
+                event_id, user_id, self._events = args
+                entries.append((self.events_log, {"op": "unregister", "event_id": event_id, "user_id": user_id}))
+        self._append(entries)
+    
+    def close(self):
+        with self._lock:
+            if self._compaction is not None:
+                self._compaction.join()
+            for path in list(self._log_handles):
+                self._close_log(path)
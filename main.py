@@ -1,521 +1,2201 @@
-import json
-import os
-from abc import ABC, abstractmethod
-from datetime import datetime
-import uuid
-
-class User(ABC):
-    def __init__(self, user_id, username, password, email):
-        self.user_id = user_id
-        self.username = username
-        self.password = password  
-        self.email = email
-        self.is_active = True
-
-    def update_profile(self, username=None, email=None):
-        if username:
-            self.username = username
-        if email:
-            self.email = email
-        return True
-    
-    @abstractmethod
-    def get_role(self):
-        pass
-    
-    def to_dict(self):
-        return {
-            "user_id": self.user_id,
-            "username": self.username,
-            "password": self.password,
-            "email": self.email,
-            "is_active": self.is_active,
-            "role": self.get_role()
-        }
-    
-    @classmethod
-    def from_dict(cls, data):
-        if data["role"] == "admin":
-            return Admin(data["user_id"], data["username"], data["password"], data["email"])
-        elif data["role"] == "organizer":
-            org = Organizer(data["user_id"], data["username"], data["password"], data["email"])
-            org.events = data.get("events", [])
-            return org
-        else:
-            user = RegularUser(data["user_id"], data["username"], data["password"], data["email"])
-            user.registered_events = data.get("registered_events", [])
-            return user
-
-
-class Admin(User):
-    def __init__(self, user_id, username, password, email):
-        super().__init__(user_id, username, password, email)
-    
-    def get_role(self):
-        return "admin"
-
-
-class Organizer(User):
-    def __init__(self, user_id, username, password, email):
-        super().__init__(user_id, username, password, email)
-        self.events = []  # List of event IDs created by this organizer
-    
-    def get_role(self):
-        return "organizer"
-    
-    def add_event(self, event_id):
-        self.events.append(event_id)
-    
-    def remove_event(self, event_id):
-        if event_id in self.events:
-            self.events.remove(event_id)
-    
-    def to_dict(self):
-        data = super().to_dict()
-        data["events"] = self.events
-        return data
-
-
-class RegularUser(User):
-    def __init__(self, user_id, username, password, email):
-        super().__init__(user_id, username, password, email)
-        self.registered_events = []  # List of event IDs the user has registered for
-    
-    def get_role(self):
-        return "user"
-    
-    def register_for_event(self, event_id):
-        self.registered_events.append(event_id)
-        return True
-    
-    def unregister_from_event(self, event_id):
-        if event_id in self.registered_events:
-            self.registered_events.remove(event_id)
-            return True
-        return False
-    
-    def to_dict(self):
-        data = super().to_dict()
-        data["registered_events"] = self.registered_events
-        return data
-
-
-class Event:
-    def __init__(self, event_id, title, description, date, venue, capacity, category, organizer_id):
-        self.event_id = event_id
-        self.title = title
-        self.description = description
-        self.date = date  # datetime object
-        self.venue = venue
-        self.capacity = capacity
-        self.category = category
-        self.organizer_id = organizer_id
-        self.is_approved = False
-        self.registered_users = []  # List of user IDs registered for this event
-    
-    def register_user(self, user_id):
-        if len(self.registered_users) < self.capacity:
-            self.registered_users.append(user_id)
-            return True
-        return False
-    
-    def unregister_user(self, user_id):
-        if user_id in self.registered_users:
-            self.registered_users.remove(user_id)
-            return True
-        return False
-    
-    def approve_event(self):
-        self.is_approved = True
-        return True
-    
-    def is_full(self):
-        return len(self.registered_users) >= self.capacity
-    
-    def seats_available(self):
-        return self.capacity - len(self.registered_users)
-    
-    def to_dict(self):
-        return {
-            "event_id": self.event_id,
-            "title": self.title,
-            "description": self.description,
-            "date": self.date.isoformat(),
-            "venue": self.venue,
-            "capacity": self.capacity,
-            "category": self.category,
-            "organizer_id": self.organizer_id,
-            "is_approved": self.is_approved,
-            "registered_users": self.registered_users
-        }
-    
-    @classmethod
-    def from_dict(cls, data):
-        event = cls(
-            data["event_id"],
-            data["title"],
-            data["description"],
-            datetime.fromisoformat(data["date"]),
-            data["venue"],
-            data["capacity"],
-            data["category"],
-            data["organizer_id"]
-        )
-        event.is_approved = data["is_approved"]
-        event.registered_users = data["registered_users"]
-        return event
-
-
-class DataStorage:
-    def __init__(self, users_file="users.json", events_file="events.json"):
-        self.users_file = users_file
-        self.events_file = events_file
-    
-    def save_users(self, users):
-        # Convert users to dictionary of dictionaries
-        user_dicts = {uid: user.to_dict() for uid, user in users.items()}
-        with open(self.users_file, 'w') as f:
-            json.dump(user_dicts, f, indent=2)
-    
-    def load_users(self):
-        if not os.path.exists(self.users_file):
-            return {}
-        
-        try:
-            with open(self.users_file, 'r') as f:
-                user_dicts = json.load(f)
-            
-            # Convert back to User objects
-            users = {}
-            for uid, user_data in user_dicts.items():
-                users[uid] = User.from_dict(user_data)
-            
-            return users
-        except Exception as e:
-            print(f"Error loading users: {e}")
-            return {}
-    
-    def save_events(self, events):
-        # Convert events to dictionary of dictionaries
-        event_dicts = {eid: event.to_dict() for eid, event in events.items()}
-        with open(self.events_file, 'w') as f:
-            json.dump(event_dicts, f, indent=2)
-    
-    def load_events(self):
-        if not os.path.exists(self.events_file):
-            return {}
-        
-        try:
-            with open(self.events_file, 'r') as f:
-                event_dicts = json.load(f)
-            
-            # Convert back to Event objects
-            events = {}
-            for eid, event_data in event_dicts.items():
-                events[eid] = Event.from_dict(event_data)
-            
-            return events
-        except Exception as e:
-            print(f"Error loading events: {e}")
-            return {}
-
-
-class UserManager:
-    def __init__(self, storage):
-        self.storage = storage
-        self.users = self.storage.load_users()
-    
-    def add_user(self, username, password, email, role):
-        # Check if username already exists
-        for user in self.users.values():
-            if user.username == username:
-                return None, "Username already exists"
-        
-        user_id = str(uuid.uuid4())
-        
-        if role == "admin":
-            user = Admin(user_id, username, password, email)
-        elif role == "organizer":
-            user = Organizer(user_id, username, password, email)
-        else:  # default to regular user
-            user = RegularUser(user_id, username, password, email)
-        
-        self.users[user_id] = user
-        self._save_users()
-        return user_id, "User created successfully"
-    
-    def get_user(self, user_id):
-        return self.users.get(user_id)
-    
-    def authenticate(self, username, password):
-        for user_id, user in self.users.items():
-            if user.username == username and user.password == password and user.is_active:
-                return user_id
-        return None
-    
-    def delete_user(self, user_id):
-        if user_id in self.users:
-            del self.users[user_id]
-            self._save_users()
-            return True
-        return False
-    
-    def get_all_users(self):
-        return self.users
-    
-    def get_users_by_role(self, role):
-        return {uid: user for uid, user in self.users.items() if user.get_role() == role}
-    
-    def _save_users(self):
-        self.storage.save_users(self.users)
-
-
-class EventManager:
-    def __init__(self, storage):
-        self.storage = storage
-        self.events = self.storage.load_events()
-    
-    def create_event(self, title, description, date, venue, capacity, category, organizer_id):
-        # Check if event date is not before today
-        if date < datetime.now():
-            return None, "Event date cannot be before today"
-        
-        event_id = str(uuid.uuid4())
-        event = Event(event_id, title, description, date, venue, capacity, category, organizer_id)
-        self.events[event_id] = event
-        self._save_events()
-        return event_id, "Event created successfully"
-    
-    def get_event(self, event_id):
-        return self.events.get(event_id)
-    
-    def approve_event(self, event_id):
-        event = self.get_event(event_id)
-        if event:
-            event.approve_event()
-            self._save_events()
-            return True
-        return False
-    
-    def delete_event(self, event_id):
-        if event_id in self.events:
-            del self.events[event_id]
-            self._save_events()
-            return True
-        return False
-    
-    def get_all_events(self):
-        return self.events
-    
-    def get_approved_events(self):
-        return {eid: event for eid, event in self.events.items() if event.is_approved}
-    
-    def get_unapproved_events(self):
-        return {eid: event for eid, event in self.events.items() if not event.is_approved}
-    
-    def get_events_by_organizer(self, organizer_id):
-        return {eid: event for eid, event in self.events.items() if event.organizer_id == organizer_id}
-    
-    def get_events_by_category(self, category):
-        return {eid: event for eid, event in self.events.items() if event.category == category and event.is_approved}
-    
-    def get_events_sorted_by_date(self, ascending=True):
-        sorted_events = sorted(self.events.values(), key=lambda e: e.date, reverse=not ascending)
-        return {event.event_id: event for event in sorted_events if event.is_approved}
-    
-    def register_user_for_event(self, event_id, user_id):
-        event = self.get_event(event_id)
-        if event and not event.is_full() and event.is_approved:
-            success = event.register_user(user_id)
-            if success:
-                self._save_events()
-            return success
-        return False
-    
-    def unregister_user_from_event(self, event_id, user_id):
-        event = self.get_event(event_id)
-        if event:
-            success = event.unregister_user(user_id)
-            if success:
-                self._save_events()
-            return success
-        return False
-    
-    def get_events_for_user(self, user_id):
-        return {eid: event for eid, event in self.events.items() 
-                if user_id in event.registered_users and event.is_approved}
-    
-    def _save_events(self):
-        self.storage.save_events(self.events)
-
-
-class EventManagementSystem:
-    def __init__(self, storage=None):
-        if storage is None:
-            storage = DataStorage()
-        
-        self.storage = storage
-        self.user_manager = UserManager(storage)
-        self.event_manager = EventManager(storage)
-        
-        # Create a default admin user if no users exist
-        if not self.user_manager.get_users_by_role("admin"):
-            self.user_manager.add_user("admin", "admin123", "admin@example.com", "admin")
-    
-    def login(self, username, password):
-        user_id = self.user_manager.authenticate(username, password)
-        if user_id:
-            user = self.user_manager.get_user(user_id)
-            return user_id, user.get_role()
-        return None, None
-    
-    def register_user(self, username, password, email, role="user"):
-        return self.user_manager.add_user(username, password, email, role)
-    
-    def create_event(self, title, description, date, venue, capacity, category, organizer_id):
-        event_id, msg = self.event_manager.create_event(title, description, date, venue, capacity, category, organizer_id)
-        if event_id:
-            organizer = self.user_manager.get_user(organizer_id)
-            if organizer and isinstance(organizer, Organizer):
-                organizer.add_event(event_id)
-                self.storage.save_users(self.user_manager.users)
-        return event_id, msg
-    
-    def approve_event(self, event_id, admin_id):
-        admin = self.user_manager.get_user(admin_id)
-        if admin and admin.get_role() == "admin":
-            return self.event_manager.approve_event(event_id)
-        return False
-    
-    def register_for_event(self, event_id, user_id):
-        user = self.user_manager.get_user(user_id)
-        if user and user.get_role() == "user" and isinstance(user, RegularUser):
-            success = self.event_manager.register_user_for_event(event_id, user_id)
-            if success:
-                user.register_for_event(event_id)
-                self.storage.save_users(self.user_manager.users)
-            return success
-        return False
-    
-    def unregister_from_event(self, event_id, user_id):
-        user = self.user_manager.get_user(user_id)
-        if user and user.get_role() == "user" and isinstance(user, RegularUser):
-            success = self.event_manager.unregister_user_from_event(event_id, user_id)
-            if success:
-                user.unregister_from_event(event_id)
-                self.storage.save_users(self.user_manager.users)
-            return success
-        return False
-    
-    def delete_user(self, target_user_id, admin_id):
-        admin = self.user_manager.get_user(admin_id)
-        if not admin or admin.get_role() != "admin":
-            return False, "Only admin can delete users"
-        
-        user = self.user_manager.get_user(target_user_id)
-        if not user:
-            return False, "User not found"
-        
-        # If deleting an organizer, delete all their events
-        if user.get_role() == "organizer" and isinstance(user, Organizer):
-            organizer_events = self.event_manager.get_events_by_organizer(target_user_id)
-            for event_id in list(organizer_events.keys()):
-                # Unregister all users from this event
-                event = self.event_manager.get_event(event_id)
-                for registered_user_id in list(event.registered_users):
-                    registered_user = self.user_manager.get_user(registered_user_id)
-                    if registered_user and isinstance(registered_user, RegularUser):
-                        registered_user.unregister_from_event(event_id)
-                # Delete the event
-                self.event_manager.delete_event(event_id)
-        
-        # If deleting a user, unregister them from all events
-        elif user.get_role() == "user" and isinstance(user, RegularUser):
-            for event_id in list(user.registered_events):
-                self.event_manager.unregister_user_from_event(event_id, target_user_id)
-        
-        # Finally delete the user
-        self.user_manager.delete_user(target_user_id)
-        return True, "User deleted successfully"
-    
-    def get_available_events(self, user_id=None, category=None, sort_by_date=False):
-        events = self.event_manager.get_approved_events()
-        
-        if category:
-            events = {eid: event for eid, event in events.items() if event.category == category}
-        
-        if sort_by_date:
-            sorted_events = sorted(events.values(), key=lambda e: e.date)
-            events = {event.event_id: event for event in sorted_events}
-        
-        return events
-    
-    def get_user_registrations(self, user_id):
-        user = self.user_manager.get_user(user_id)
-        if user and user.get_role() == "user" and isinstance(user, RegularUser):
-            return user.registered_events
-        return []
-    
-    def get_event_registrations(self, event_id, organizer_id=None):
-        event = self.event_manager.get_event(event_id)
-        if not event:
-            return []
-        
-        # Check if the requesting user is the organizer of this event
-        if organizer_id and event.organizer_id != organizer_id:
-            return []
-        
-        return event.registered_users
-    
-    def get_user_events(self, organizer_id):
-        return self.event_manager.get_events_by_organizer(organizer_id)
-    
-    def update_event(self, event_id, title, description, date, venue, capacity, category, organizer_id):
-        """
-        Update an existing event.
-        Only the organizer of the event can update it.
-        
-        Args:
-            event_id: ID of the event to update
-            title: New event title
-            description: New event description
-            date: New event date (datetime object)
-            venue: New event venue
-            capacity: New event capacity
-            category: New event category
-            organizer_id: ID of the user attempting to update the event
-            
-        Returns:
-            Tuple of (success, message)
-        """
-        # Get the event
-        event = self.event_manager.get_event(event_id)
-        if not event:
-            return False, "Event not found"
-        
-        # Check if user is authorized to update this event
-        if event.organizer_id != organizer_id:
-            return False, "You can only edit your own events"
-        
-        # Check if capacity can be changed (can't reduce below current registrations)
-        if capacity < len(event.registered_users):
-            return False, f"Cannot reduce capacity below current registrations ({len(event.registered_users)})"
-        
-        # Update event details
-        event.title = title
-        event.description = description
-        event.date = date
-        event.venue = venue
-        event.capacity = capacity
-        event.category = category
-        
-        # Events may need re-approval after significant changes
-        # Uncomment the following line if you want edited events to require re-approval
-        # event.is_approved = False
-        
-        # Save changes
-        self.event_manager.save_events()
-        
-        return True, "Event updated successfully"
-
-
+import os
+from abc import ABC, abstractmethod
+from array import array
+from collections import OrderedDict, deque, namedtuple
+from collections.abc import MutableMapping, ItemsView, ValuesView
+from contextlib import contextmanager
+from datetime import datetime
+from types import MappingProxyType
+import atexit
+import bisect
+import functools
+import queue
+import random
+import threading
+import time
+import uuid
+
+from catalog import EventCatalog
+from passwords import DEFAULT_COST, PasswordHasher
+from storage_formats import get_format, read_records, write_records
+
+# Advisory file locks for storage shared between processes
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    try:
+        import msvcrt
+    except ImportError:
+        msvcrt = None
+
+class IdTable:
+    """
+    Dictionary encoding for the strings repeated across records: ids,
+    categories and venues.
+    
+    Each distinct string is kept once and given a small int handle.
+    intern() returns the shared copy, so equal values are the same object;
+    registration sets store just the handles. Handles are never reused,
+    so the table only grows, by one entry per distinct string.
+    """
+    
+    def __init__(self):
+        self._handles = {}
+        self._strings = []
+        self._lock = threading.Lock()
+    
+    def handle(self, value):
+        handle = self._handles.get(value)
+        if handle is None:
+            with self._lock:
+                handle = self._handles.get(value)
+                if handle is None:
+                    handle = len(self._strings)
+                    self._strings.append(value)
+                    self._handles[value] = handle
+        return handle
+    
+    def find(self, value):
+        # The handle of a string seen before, None otherwise
+        return self._handles.get(value)
+    
+    def string(self, handle):
+        return self._strings[handle]
+    
+    def intern(self, value):
+        if value is None:
+            return None
+        return self._strings[self.handle(value)]
+    
+    def __len__(self):
+        return len(self._strings)
+
+
+# One table for the whole process, so a handle means the same id everywhere
+ids = IdTable()
+
+
+class RegistrationSet:
+    """
+    Insertion-ordered set of IDs used for registration lists.
+    
+    Behaves like the list it replaces (append, remove, iteration, len)
+    and yields the ID strings, but stores 4-byte handles from the shared
+    IdTable in an array. Removing an ID leaves a tombstone in its slot,
+    so the entries after it don't shift, and the array is compacted once
+    tombstones fill half of it. Small sets are scanned; past
+    INDEX_SIZE entries a handle -> slot map is kept too, so membership,
+    removal and finding a page cursor stay O(1).
+    Serialized back to a plain list by to_dict, so the JSON format is
+    unchanged.
+    """
+    
+    __slots__ = ("_handles", "_index", "_dead", "_removed")
+    
+    INDEX_SIZE = 16
+    TOMBSTONE = 0xFFFFFFFF  # never a handle; IdTable would need 4 billion strings
+    # Slots of recently removed IDs, so a page cursor naming one still works
+    REMEMBER_REMOVED = 64
+    # Check-then-change sequences must not interleave. Event sets are also
+    # guarded by their event's lock, but a user's reverse-index set can be
+    # changed by registrations for different events at once. Sets share a
+    # few striped locks rather than each carrying one.
+    _locks = tuple(threading.Lock() for _ in range(64))
+    
+    def __init__(self, items=()):
+        self._handles = array("I")
+        self._index = None  # handle -> slot, for large sets
+        self._dead = 0
+        self._removed = None  # handle -> slot of recently removed IDs
+        for item in items:
+            self.add(item)
+    
+    @property
+    def _lock(self):
+        return self._locks[(id(self) >> 4) % len(self._locks)]
+    
+    def _slot(self, handle):
+        # Slot of a live handle, None if it isn't in the set
+        if self._index is not None:
+            return self._index.get(handle)
+        try:
+            return self._handles.index(handle)
+        except ValueError:
+            return None
+    
+    def append(self, item):
+        handle = ids.handle(item)
+        with self._lock:
+            if self._slot(handle) is not None:
+                return
+            self._handles.append(handle)
+            if self._removed:
+                self._removed.pop(handle, None)
+            if self._index is not None:
+                self._index[handle] = len(self._handles) - 1
+            elif len(self) > self.INDEX_SIZE:
+                self._index = {h: slot for slot, h in enumerate(self._handles) if h != self.TOMBSTONE}
+    
+    add = append
+    
+    def remove(self, item):
+        handle = ids.find(item)
+        with self._lock:
+            slot = None if handle is None else self._slot(handle)
+            if slot is None:
+                raise ValueError(f"{item!r} not in registrations")
+            self._handles[slot] = self.TOMBSTONE
+            self._dead += 1
+            if self._index is not None:
+                del self._index[handle]
+            if self._removed is None:
+                self._removed = {}
+            elif len(self._removed) >= self.REMEMBER_REMOVED:
+                del self._removed[next(iter(self._removed))]
+            self._removed[handle] = slot
+            if self._dead > self.INDEX_SIZE and 2 * self._dead > len(self._handles):
+                self._compact()
+    
+    def _compact(self):
+        # Drop the tombstones; remembered slots move to where the entry
+        # after them went
+        live = array("I")
+        new_slots = array("I")  # old slot -> new slot
+        for handle in self._handles:
+            new_slots.append(len(live))
+            if handle != self.TOMBSTONE:
+                live.append(handle)
+        if self._removed:
+            self._removed = {handle: new_slots[slot] for handle, slot in self._removed.items()}
+        if self._index is not None:
+            self._index = {handle: slot for slot, handle in enumerate(live)}
+        # A new array rather than changing it in place, so iterations
+        # under way carry on over the old one
+        self._handles = live
+        self._dead = 0
+    
+    def discard(self, item):
+        try:
+            self.remove(item)
+        except ValueError:
+            pass
+    
+    def __contains__(self, item):
+        handle = ids.find(item)
+        if handle is None:
+            return False
+        if self._index is not None:
+            return handle in self._index
+        return handle in self._handles
+    
+    def __iter__(self):
+        return (ids.string(handle) for handle in self._handles if handle != self.TOMBSTONE)
+    
+    def __reversed__(self):
+        return (ids.string(handle) for handle in reversed(self._handles) if handle != self.TOMBSTONE)
+    
+    def __len__(self):
+        return len(self._handles) - self._dead
+    
+    def __eq__(self, other):
+        if isinstance(other, RegistrationSet):
+            return list(self) == list(other)
+        if isinstance(other, (list, tuple)):
+            return list(self) == list(other)
+        return NotImplemented
+    
+    def page(self, limit, cursor=None):
+        # (ids, next_cursor) like SortedIds.page, in registration order
+        with self._lock:
+            start = 0
+            if cursor is not None:
+                handle = ids.find(cursor)
+                slot = None if handle is None else self._slot(handle)
+                if slot is not None:
+                    start = slot + 1
+                elif handle is not None and self._removed and handle in self._removed:
+                    # Removed since it was handed out; carry on from its slot
+                    start = self._removed[handle]
+                else:
+                    raise ValueError(f"Unknown cursor {cursor!r}")
+            handles = []
+            more = False
+            for slot in range(start, len(self._handles)):
+                handle = self._handles[slot]
+                if handle == self.TOMBSTONE:
+                    continue
+                if len(handles) == limit:
+                    more = True
+                    break
+                handles.append(handle)
+        page = [ids.string(handle) for handle in handles]
+        return page, page[-1] if page and more else None
+    
+    def __repr__(self):
+        return f"RegistrationSet({list(self)!r})"
+
+
+# One page of a listing: the records as an {id: record} dict (or a list of
+# IDs), and the cursor to ask for the next page with, None after the last
+Page = namedtuple("Page", "items next_cursor")
+
+
+class SortedIds:
+    """
+    IDs kept sorted by a key given when each is added (ties by ID), for
+    paging through a listing.
+    
+    A page starts after a cursor, the ID of the last entry of the page
+    before, and costs O(log n + limit) however far into the listing it
+    is. The keys of recently removed IDs are remembered, so a cursor still
+    works after the entry it names was deleted.
+    """
+    
+    REMEMBER_REMOVED = 1024
+    
+    def __init__(self):
+        self._entries = []  # sorted (key, id)
+        self._key_of = {}
+        self._removed = OrderedDict()
+    
+    def add(self, item_id, key):
+        self.discard(item_id)
+        self._key_of[item_id] = key
+        bisect.insort(self._entries, (key, item_id))
+        self._removed.pop(item_id, None)
+    
+    def discard(self, item_id):
+        key = self._key_of.pop(item_id, None)
+        if key is None:
+            return
+        del self._entries[bisect.bisect_left(self._entries, (key, item_id))]
+        self._removed[item_id] = key
+        if len(self._removed) > self.REMEMBER_REMOVED:
+            self._removed.popitem(last=False)
+    
+    def key(self, item_id):
+        return self._key_of.get(item_id)
+    
+    def page(self, limit, cursor=None):
+        """
+        Return (ids, next_cursor) for up to limit IDs after cursor.
+        
+        Raises:
+            ValueError: If cursor is not an ID this listing has (had)
+        """
+        start = 0
+        if cursor is not None:
+            key = self._key_of.get(cursor, self._removed.get(cursor))
+            if key is None:
+                raise ValueError(f"Unknown cursor {cursor!r}")
+            start = bisect.bisect_right(self._entries, (key, cursor))
+        page = [item_id for _, item_id in self._entries[start:start + limit]]
+        return page, page[-1] if page and start + limit < len(self._entries) else None
+    
+    def __contains__(self, item_id):
+        return item_id in self._key_of
+    
+    def __iter__(self):
+        return (item_id for _, item_id in self._entries)
+    
+    def __reversed__(self):
+        return (item_id for _, item_id in reversed(self._entries))
+    
+    def __len__(self):
+        return len(self._entries)
+
+
+class User(ABC):
+    # Slots instead of a per-instance __dict__; there can be millions of users
+    __slots__ = ("user_id", "username", "password", "email", "is_active", "version")
+    
+    def __init__(self, user_id, username, password, email):
+        self.user_id = ids.intern(user_id)
+        self.username = username
+        self.password = password  
+        self.email = email
+        self.is_active = True
+        # Bumped by the storage on every write; see DataStorage(shared=True)
+        self.version = 0
+
+    def update_profile(self, username=None, email=None):
+        if username:
+            self.username = username
+        if email:
+            self.email = email
+        return True
+    
+    @abstractmethod
+    def get_role(self):
+        pass
+    
+    def to_dict(self):
+        return {
+            "user_id": self.user_id,
+            "username": self.username,
+            "password": self.password,
+            "email": self.email,
+            "is_active": self.is_active,
+            "role": self.get_role(),
+            "version": self.version
+        }
+    
+    @classmethod
+    def from_dict(cls, data):
+        if data["role"] == "admin":
+            user = Admin(data["user_id"], data["username"], data["password"], data["email"])
+        elif data["role"] == "organizer":
+            user = Organizer(data["user_id"], data["username"], data["password"], data["email"])
+            user.events = [ids.intern(event_id) for event_id in data.get("events", [])]
+        else:
+            user = RegularUser(data["user_id"], data["username"], data["password"], data["email"])
+            user.registered_events = RegistrationSet(data.get("registered_events", []))
+        user.version = data.get("version", 0)
+        return user
+
+
+class Admin(User):
+    __slots__ = ()
+    
+    def __init__(self, user_id, username, password, email):
+        super().__init__(user_id, username, password, email)
+    
+    def get_role(self):
+        return "admin"
+
+
+class Organizer(User):
+    __slots__ = ("events",)
+    
+    def __init__(self, user_id, username, password, email):
+        super().__init__(user_id, username, password, email)
+        self.events = []  # List of event IDs created by this organizer
+    
+    def get_role(self):
+        return "organizer"
+    
+    def add_event(self, event_id):
+        self.events.append(ids.intern(event_id))
+    
+    def remove_event(self, event_id):
+        if event_id in self.events:
+            self.events.remove(event_id)
+    
+    def to_dict(self):
+        data = super().to_dict()
+        data["events"] = self.events
+        return data
+
+
+class RegularUser(User):
+    __slots__ = ("registered_events",)
+    
+    def __init__(self, user_id, username, password, email):
+        super().__init__(user_id, username, password, email)
+        self.registered_events = RegistrationSet()  # IDs of events the user has registered for
+    
+    def get_role(self):
+        return "user"
+    
+    def register_for_event(self, event_id):
+        self.registered_events.add(event_id)
+        return True
+    
+    def unregister_from_event(self, event_id):
+        if event_id in self.registered_events:
+            self.registered_events.remove(event_id)
+            return True
+        return False
+    
+    def to_dict(self):
+        data = super().to_dict()
+        data["registered_events"] = list(self.registered_events)
+        return data
+
+
+# Guard the seat check and the change to registered_users, so concurrent
+# registrations can't oversell. Events share a fixed set of locks by id
+# rather than carrying one each, which would cost more than the rest of
+# a small event; registrations for different events still mostly run
+# in parallel.
+_EVENT_LOCKS = [threading.RLock() for _ in range(64)]
+
+
+class Event:
+    __slots__ = ("event_id", "title", "description", "date", "venue", "capacity", "category",
+                 "organizer_id", "is_approved", "registered_users", "version")
+    
+    def __init__(self, event_id, title, description, date, venue, capacity, category, organizer_id):
+        # Ids, venues and categories repeat across records; keep one copy of each
+        self.event_id = ids.intern(event_id)
+        self.title = title
+        self.description = description
+        self.date = date  # datetime object
+        self.venue = ids.intern(venue)
+        self.capacity = capacity
+        self.category = ids.intern(category)
+        self.organizer_id = ids.intern(organizer_id)
+        self.is_approved = False
+        self.registered_users = RegistrationSet()  # IDs of users registered for this event
+        self.version = 0
+    
+    @property
+    def _lock(self):
+        return _EVENT_LOCKS[hash(self.event_id) % len(_EVENT_LOCKS)]
+    
+    def register_user(self, user_id):
+        with self._lock:
+            if user_id in self.registered_users:
+                return False
+            if len(self.registered_users) < self.capacity:
+                self.registered_users.add(user_id)
+                return True
+            return False
+    
+    def unregister_user(self, user_id):
+        with self._lock:
+            if user_id in self.registered_users:
+                self.registered_users.remove(user_id)
+                return True
+            return False
+    
+    def set_capacity(self, capacity):
+        # Under the registration lock, so a registration can't slip in above the new capacity
+        with self._lock:
+            if capacity < len(self.registered_users):
+                return False
+            self.capacity = capacity
+            return True
+    
+    def approve_event(self):
+        self.is_approved = True
+        return True
+    
+    def is_full(self):
+        return len(self.registered_users) >= self.capacity
+    
+    def seats_available(self):
+        return self.capacity - len(self.registered_users)
+    
+    def to_dict(self):
+        return {
+            "event_id": self.event_id,
+            "title": self.title,
+            "description": self.description,
+            "date": self.date.isoformat(),
+            "venue": self.venue,
+            "capacity": self.capacity,
+            "category": self.category,
+            "organizer_id": self.organizer_id,
+            "is_approved": self.is_approved,
+            "registered_users": list(self.registered_users),
+            "version": self.version
+        }
+    
+    @classmethod
+    def from_dict(cls, data):
+        event = cls(
+            data["event_id"],
+            data["title"],
+            data["description"],
+            datetime.fromisoformat(data["date"]),
+            data["venue"],
+            data["capacity"],
+            data["category"],
+            data["organizer_id"]
+        )
+        event.is_approved = data["is_approved"]
+        event.registered_users = RegistrationSet(data["registered_users"])
+        event.version = data.get("version", 0)
+        return event
+
+
+class LazyRecords(MutableMapping):
+    """
+    Dict-like view over records that live in a storage backend.
+    
+    Records are materialized on first access and kept afterwards, while
+    iteration and len() are answered by the backend, so nothing has to be
+    loaded up front. Iterating items() or values() fetches in batches.
+    """
+    
+    def __init__(self, fetch_many, ids, count, batch_size=500):
+        self._fetch_many = fetch_many  # list of ids -> {id: record}
+        self._ids = ids  # () -> iterable of every id
+        self._count = count  # () -> number of records
+        self.batch_size = batch_size
+        self._loaded = {}
+        # Called as on_evict(keys) after evict(), so whoever holds on to
+        # records (a listing cache) can let go of them too
+        self.on_evict = None
+        # Called before every read from the backend, so a write-behind queue
+        # can be written first and records deleted or added in it aren't
+        # read back as they were
+        self.before_read = None
+    
+    def _backend_read(self):
+        if self.before_read is not None:
+            self.before_read()
+    
+    def __getitem__(self, key):
+        record = self._loaded.get(key)
+        if record is None:
+            self._backend_read()
+            record = self._fetch_many([key]).get(key)
+            if record is None:
+                raise KeyError(key)
+            # If another thread materialized it meanwhile, use that copy so
+            # everyone shares one object (and one registration lock)
+            record = self._loaded.setdefault(key, record)
+        return record
+    
+    def __setitem__(self, key, record):
+        self._loaded[key] = record
+    
+    def __delitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+        self._loaded.pop(key, None)
+    
+    def __iter__(self):
+        self._backend_read()
+        return iter(self._ids())
+    
+    def __len__(self):
+        self._backend_read()
+        return self._count()
+    
+    def get_many(self, keys):
+        # Fetch whatever is not materialized yet in one round trip, keeping the order of keys
+        missing = [key for key in keys if key not in self._loaded]
+        if missing:
+            self._backend_read()
+            for key, record in self._fetch_many(missing).items():
+                self._loaded.setdefault(key, record)
+        return {key: self._loaded[key] for key in keys if key in self._loaded}
+    
+    def loaded(self):
+        return self._loaded
+    
+    def evict(self, keys=None):
+        # Forget materialized records (all of them by default); they are read
+        # again from the backend on next access. Only safe once their changes
+        # have been written, and while nobody else holds on to them.
+        if keys is None:
+            self._loaded.clear()
+        else:
+            keys = list(keys)
+            for key in keys:
+                self._loaded.pop(key, None)
+        if self.on_evict is not None:
+            self.on_evict(keys)
+    
+    def _iter_batches(self):
+        batch = []
+        self._backend_read()
+        for key in self._ids():
+            batch.append(key)
+            if len(batch) >= self.batch_size:
+                yield from self.get_many(batch).items()
+                batch = []
+        if batch:
+            yield from self.get_many(batch).items()
+    
+    def items(self):
+        return _BatchedItemsView(self)
+    
+    def values(self):
+        return _BatchedValuesView(self)
+
+
+class _BatchedItemsView(ItemsView):
+    def __iter__(self):
+        return self._mapping._iter_batches()
+
+
+class _BatchedValuesView(ValuesView):
+    def __iter__(self):
+        return (record for _, record in self._mapping._iter_batches())
+
+
+class StorageConflictError(Exception):
+    """Raised when a record changed on disk since this process last read it."""
+    
+    def __init__(self, message, record_ids=()):
+        super().__init__(message)
+        # Every conflicting record of the write, none of which was written
+        self.record_ids = set(record_ids)
+
+
+def _lock_file(f, exclusive):
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+    elif msvcrt is not None:
+        # No shared locks on Windows; readers simply take the exclusive one
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+
+
+def _unlock_file(f):
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+    elif msvcrt is not None:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class DataStorage:
+    """
+    Storage backend keeping users and events in two files.
+    
+    file_format picks how they are written: "json" (indented, the
+    default), "json-compact", "jsonl" or "binary"; see storage_formats.
+    Loading detects the format of each file, so switching formats just
+    takes effect on the next save. Files are always replaced by writing a temporary file beside them and
+    renaming it over, so readers never see a half-written file.
+    
+    With shared=True several processes can work on the same files: every
+    write takes an advisory lock on a "<file>.lock" file, re-reads the
+    file and merges in just the records this process changed. Each record
+    carries a version number that goes up on every write; if the copy on
+    disk has moved on since this process read it, the write is refused
+    with StorageConflictError instead of overwriting the other process's
+    change. Deletes always win. A write is also refused if it would give
+    a user a username or email another process's user already has.
+    stale tells when another process has written a file since this one
+    read it; EventManagementSystem then reloads before its next call.
+    """
+    
+    # Backends that can answer the manager lookups themselves (see SQLiteStorage)
+    # set this and implement query_user_ids / query_event_ids, and
+    # page_user_ids / page_event_ids for the paged listings
+    supports_queries = False
+    
+    def __init__(self, users_file="users.json", events_file="events.json", shared=False, file_format="json"):
+        self.users_file = users_file
+        self.events_file = events_file
+        self.shared = shared
+        self.file_format = get_format(file_format)
+        # Serializes rewrites so two threads never write the same file at once
+        self._write_lock = threading.RLock()
+        # path -> stamp of the file as this process last read or wrote it
+        self._stamps = {}
+    
+    @staticmethod
+    def _stamp(path):
+        # Changes whenever the file is replaced, which every write does
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+    
+    @property
+    def stale(self):
+        return self.shared and any(self._stamp(path) != stamp for path, stamp in self._stamps.items())
+    
+    @contextmanager
+    def _locked(self, path):
+        # The thread lock for this process, plus the file lock for the others
+        with self._write_lock:
+            if not self.shared:
+                yield
+                return
+            with open(path + ".lock", 'a+') as lock_file:
+                _lock_file(lock_file, exclusive=True)
+                try:
+                    yield
+                finally:
+                    _unlock_file(lock_file)
+    
+    def _write_file(self, path, data):
+        write_records(path, data, self.file_format)
+    
+    def _read_file(self, path):
+        if not os.path.exists(path):
+            return {}
+        return dict(read_records(path))
+    
+    def save_users(self, users):
+        # Convert users to dictionary of dictionaries. list() takes the items
+        # in one step, so other threads may keep adding users meanwhile.
+        user_dicts = {uid: user.to_dict() for uid, user in list(users.items())}
+        with self._locked(self.users_file):
+            self._write_file(self.users_file, user_dicts)
+    
+    def load_users(self):
+        self._stamps[self.users_file] = self._stamp(self.users_file)
+        if not os.path.exists(self.users_file):
+            return {}
+        
+        try:
+            # Convert back to User objects one record at a time, so the
+            # raw dicts for the whole file are never in memory at once
+            users = {}
+            for uid, user_data in read_records(self.users_file):
+                users[uid] = User.from_dict(user_data)
+            
+            return users
+        except Exception as e:
+            print(f"Error loading users: {e}")
+            return {}
+    
+    def save_events(self, events):
+        # Convert events to dictionary of dictionaries
+        event_dicts = {eid: event.to_dict() for eid, event in list(events.items())}
+        with self._locked(self.events_file):
+            self._write_file(self.events_file, event_dicts)
+    
+    def load_events(self):
+        self._stamps[self.events_file] = self._stamp(self.events_file)
+        if not os.path.exists(self.events_file):
+            return {}
+        
+        try:
+            # Convert back to Event objects one record at a time, so the
+            # raw dicts for the whole file are never in memory at once
+            events = {}
+            for eid, event_data in read_records(self.events_file):
+                events[eid] = Event.from_dict(event_data)
+            
+            return events
+        except Exception as e:
+            print(f"Error loading events: {e}")
+            return {}
+    
+    # Record-level hooks called by the managers after a single change.
+    # The JSON files hold whole collections, so the affected file is
+    # rewritten; other backends can persist just the one record.
+    def save_user(self, user, users):
+        self._write_records(self.users_file, users, {user.user_id: user})
+    
+    def delete_user(self, user_id, users):
+        self._write_records(self.users_file, users, {user_id: None})
+    
+    def save_event(self, event, events):
+        self._write_records(self.events_file, events, {event.event_id: event})
+    
+    def delete_event(self, event_id, events):
+        self._write_records(self.events_file, events, {event_id: None})
+    
+    def save_registration(self, event_id, user_id, events):
+        self._write_records(self.events_file, events, {event_id: events.get(event_id)})
+    
+    def delete_registration(self, event_id, user_id, events):
+        self._write_records(self.events_file, events, {event_id: events.get(event_id)})
+    
+    def write_batch(self, changes):
+        """
+        Persist several record-level changes at once.
+        
+        Args:
+            changes: List of (method_name, args) tuples, one per call to the
+                record-level hooks above, in the order they happened
+        """
+        # However many changes there were, each file only needs rewriting once
+        users = events = None
+        changed_users, changed_events = {}, {}
+        for name, args in changes:
+            if name == "save_user":
+                user, users = args
+                changed_users[user.user_id] = user
+            elif name == "delete_user":
+                user_id, users = args
+                changed_users[user_id] = None
+            elif name == "save_event":
+                event, events = args
+                changed_events[event.event_id] = event
+            elif name == "delete_event":
+                event_id, events = args
+                changed_events[event_id] = None
+            else:
+                event_id, user_id, events = args
+                changed_events[event_id] = events.get(event_id)
+        if users is not None:
+            self._write_records(self.users_file, users, changed_users)
+        if events is not None:
+            self._write_records(self.events_file, events, changed_events)
+    
+    def _write_records(self, path, records, changed):
+        """
+        Write the records in changed ({id: record, or None if deleted}),
+        bumping their version numbers.
+        
+        Raises:
+            StorageConflictError: In shared mode, if another process wrote
+                one of the changed records since this one last read it
+        """
+        with self._locked(path):
+            if not self.shared:
+                for record in changed.values():
+                    if record is not None:
+                        record.version += 1
+                data = {rid: record.to_dict() for rid, record in list(records.items())}
+                self._write_file(path, data)
+                return
+            
+            # Merge into what is on disk now, leaving other processes' records alone
+            stamp = self._stamp(path)
+            data = self._read_file(path)
+            conflicts = {}
+            for rid, record in changed.items():
+                if record is None:
+                    continue
+                current = data.get(rid)
+                if current is None and record.version > 0:
+                    conflicts[rid] = "deleted"
+                elif current is not None and current.get("version", 0) != record.version:
+                    conflicts[rid] = "changed"
+            if path == self.users_file:
+                conflicts.update(self._taken(data, changed))
+            if conflicts:
+                raise StorageConflictError(
+                    ", ".join(f"{rid} was {what} by another process" for rid, what in conflicts.items()),
+                    conflicts)
+            for rid, record in changed.items():
+                if record is None:
+                    data.pop(rid, None)
+                    continue
+                record_dict = record.to_dict()
+                record_dict["version"] = record.version + 1
+                data[rid] = record_dict
+            self._write_file(path, data)
+            # Only once the write is through, so a failed write can be retried
+            for record in changed.values():
+                if record is not None:
+                    record.version += 1
+            if self._stamps.get(path, stamp) == stamp:
+                # Nobody else wrote the file since it was read, so it is
+                # still current for this process
+                self._stamps[path] = self._stamp(path)
+    
+    @staticmethod
+    def _taken(data, changed):
+        # {user_id: why} for changed users given a username or email that
+        # another user in data (the users file as it is now) already has
+        owners = None
+        taken = {}
+        for rid, user in changed.items():
+            if user is None:
+                continue
+            current = data.get(rid) or {}
+            for field in ("username", "email"):
+                value = getattr(user, field)
+                if value == current.get(field):
+                    continue
+                if owners is None:
+                    owners = {(f, other[f]): oid for oid, other in data.items() for f in ("username", "email")}
+                owner = owners.get((field, value))
+                if owner is not None and owner != rid and owner not in changed:
+                    taken[rid] = f"given a {field} taken"
+        return taken
+    
+    def close(self):
+        pass
+
+
+class WriteBehindStorage:
+    """
+    Wraps a storage backend and defers the record-level writes.
+    
+    Changes are queued and handed to the backend's write_batch at most
+    every flush_interval_ms, or as soon as max_pending have queued up,
+    and on flush(), close() and interpreter exit. With the JSON files
+    this turns a burst of registrations into a single rewrite.
+    
+    With shared storage, changes to records another process wrote in the
+    meantime are dropped when they are flushed (the rest of the batch is
+    still written) and stale is set; EventManagementSystem then reloads
+    before its next call, so it stops serving the dropped changes.
+    """
+    
+    def __init__(self, storage, flush_interval_ms=200, max_pending=1000):
+        self.storage = storage
+        self._dropped = False
+        self.flush_interval_ms = flush_interval_ms
+        self.max_pending = max_pending
+        self._pending = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._flushing = None  # ident of the thread writing the queue
+        self._timer = None
+        atexit.register(self.flush)
+    
+    def __getattr__(self, name):
+        # Everything else (file names, compact(), ...) is the backend's
+        return getattr(self.storage, name)
+    
+    @property
+    def stale(self):
+        # Changes were dropped, or the backend was written by someone else
+        return self._dropped or getattr(self.storage, "stale", False)
+    
+    @stale.setter
+    def stale(self, value):
+        self._dropped = value
+    
+    def _defer(self, name, args):
+        with self._lock:
+            self._pending.append((name, args))
+            if len(self._pending) >= self.max_pending:
+                flush_now = True
+            else:
+                flush_now = False
+                if self._timer is None:
+                    self._timer = threading.Timer(self.flush_interval_ms / 1000, self.flush)
+                    self._timer.daemon = True
+                    self._timer.start()
+        if flush_now:
+            self.flush()
+    
+    def flush(self):
+        with self._flush_lock:
+            self._flushing = threading.get_ident()
+            try:
+                self._flush()
+            finally:
+                self._flushing = None
+    
+    def _flush(self):
+        with self._lock:
+            changes, self._pending = self._pending, []
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        while changes:
+            try:
+                self.storage.write_batch(changes)
+                return
+            except StorageConflictError as e:
+                # Retrying can't help the conflicting records: they are
+                # stale. Drop their changes and write the others.
+                print(f"Dropping changes that conflict with another process: {e}")
+                self.stale = True
+                kept = [change for change in changes if self._record_id(change) not in e.record_ids]
+                if len(kept) == len(changes):
+                    return
+                changes = kept
+            except Exception as e:
+                # Keep the changes so the next flush retries them
+                print(f"Error writing changes: {e}")
+                with self._lock:
+                    self._pending[:0] = changes
+                return
+    
+    @staticmethod
+    def _record_id(change):
+        # The user or event a queued change writes
+        name, args = change
+        record = args[0]
+        if name == "save_user":
+            return record.user_id
+        if name == "save_event":
+            return record.event_id
+        return record  # an id already
+    
+    def load_users(self):
+        return self._read_after_flush(self.storage.load_users())
+    
+    def load_events(self):
+        return self._read_after_flush(self.storage.load_events())
+    
+    def _read_after_flush(self, records):
+        # Lazily loaded records are read from the backend as they are used;
+        # write the queue first, as for the queries below. Not while the
+        # queue is being written, which may itself read records.
+        if isinstance(records, LazyRecords):
+            def flush_first():
+                if self._flushing != threading.get_ident():
+                    self.flush()
+            records.before_read = flush_first
+        return records
+    
+    # Reads and full saves go straight to the backend, after the queue, so
+    # they never see or overwrite stale data
+    def query_user_ids(self, *args, **kwargs):
+        self.flush()
+        return self.storage.query_user_ids(*args, **kwargs)
+    
+    def query_event_ids(self, *args, **kwargs):
+        self.flush()
+        return self.storage.query_event_ids(*args, **kwargs)
+    
+    def page_user_ids(self, *args, **kwargs):
+        self.flush()
+        return self.storage.page_user_ids(*args, **kwargs)
+    
+    def page_event_ids(self, *args, **kwargs):
+        self.flush()
+        return self.storage.page_event_ids(*args, **kwargs)
+    
+    def save_users(self, users):
+        self.flush()
+        self.storage.save_users(users)
+    
+    def save_events(self, events):
+        self.flush()
+        self.storage.save_events(events)
+    
+    def save_user(self, user, users):
+        self._defer("save_user", (user, users))
+    
+    def delete_user(self, user_id, users):
+        self._defer("delete_user", (user_id, users))
+    
+    def save_event(self, event, events):
+        self._defer("save_event", (event, events))
+    
+    def delete_event(self, event_id, events):
+        self._defer("delete_event", (event_id, events))
+    
+    def save_registration(self, event_id, user_id, events):
+        self._defer("save_registration", (event_id, user_id, events))
+    
+    def delete_registration(self, event_id, user_id, events):
+        self._defer("delete_registration", (event_id, user_id, events))
+    
+    def write_batch(self, changes):
+        # Queued like the single changes, so they stay in order with them
+        for name, args in changes:
+            self._defer(name, args)
+    
+    def close(self):
+        self.flush()
+        atexit.unregister(self.flush)
+        self.storage.close()
+
+
+class UserManager:
+    def __init__(self, storage, changes=None, hasher=None):
+        self.storage = storage
+        # Passwords are stored as salted hashes made by this
+        self.hasher = hasher if hasher is not None else PasswordHasher(workers=0)
+        # Users added, edited or deleted are published here
+        self.changes = changes if changes is not None else ChangeFeed()
+        self.users = self.storage.load_users()
+        
+        # username -> user_id and email -> user_id, so logins and signups
+        # don't scan every user. Not kept for backends with supports_queries.
+        self._by_username = {}
+        self._by_email = {}
+        # Creation order, overall and per role, for paging
+        self._order = SortedIds()
+        self._by_role = {}  # role -> SortedIds
+        self._next_seq = 0
+        # Makes check-then-change sequences (duplicate checks, index updates)
+        # atomic across threads. Storage calls happen outside it, except the
+        # saves after a duplicate check: with supports_queries the check asks
+        # storage, so the new username or email must be there before the next.
+        self._lock = threading.RLock()
+        if not self.storage.supports_queries:
+            for user in self.users.values():
+                self._index_user(user)
+                self._order_user(user)
+    
+    def add_user(self, username, password, email, role):
+        # Hashed before taking the lock; it is the slow part
+        password = self.hasher.hash(password)
+        with self._lock:
+            # Check if username or email already exists
+            if self.find_user_id(username=username):
+                return None, "Username already exists"
+            if self.find_user_id(email=email):
+                return None, "Email already exists"
+            
+            user_id = str(uuid.uuid4())
+            
+            if role == "admin":
+                user = Admin(user_id, username, password, email)
+            elif role == "organizer":
+                user = Organizer(user_id, username, password, email)
+            else:  # default to regular user
+                user = RegularUser(user_id, username, password, email)
+            
+            self.users[user_id] = user
+            self._index_user(user)
+            self._order_user(user)
+            self.changes.publish(UserCreated(user_id))
+            self.storage.save_user(user, self.users)
+        return user_id, "User created successfully"
+    
+    def get_user(self, user_id):
+        return self.users.get(user_id)
+    
+    def find_user_id(self, username=None, email=None):
+        if self.storage.supports_queries:
+            user_ids = self.storage.query_user_ids(username=username, email=email)
+            return user_ids[0] if user_ids else None
+        if username is not None:
+            return self._by_username.get(username)
+        return self._by_email.get(email)
+    
+    def authenticate(self, username, password):
+        user_id = self.find_user_id(username=username)
+        if user_id:
+            user = self.get_user(user_id)
+            if user and user.is_active:
+                matches, outdated = self.hasher.verify(password, user.password)
+                if matches:
+                    if outdated:
+                        self._rehash_password(user, password)
+                    return user_id
+        return None
+    
+    def _rehash_password(self, user, password):
+        # Replace a plaintext password from before hashing, or a hash made
+        # at another cost, now that the password is known to be right
+        password_hash = self.hasher.hash(password)
+        with self._lock:
+            if self.users.get(user.user_id) is not user:
+                return
+            user.password = password_hash
+            self.changes.publish(UserUpdated(user.user_id))
+        try:
+            self.storage.save_user(user, self.users)
+        except StorageConflictError:
+            # Changed by another process; upgraded on a later login instead
+            pass
+    
+    def update_profile(self, user_id, username=None, email=None):
+        user = self.get_user(user_id)
+        if not user:
+            return False, "User not found"
+        
+        with self._lock:
+            if username and username != user.username and self.find_user_id(username=username):
+                return False, "Username already exists"
+            if email and email != user.email and self.find_user_id(email=email):
+                return False, "Email already exists"
+            
+            self._unindex_user(user)
+            user.update_profile(username, email)
+            self._index_user(user)
+            self.changes.publish(UserUpdated(user_id))
+            self.storage.save_user(user, self.users)
+        return True, "Profile updated successfully"
+    
+    def delete_user(self, user_id):
+        with self._lock:
+            user = self.users.get(user_id)
+            if not user:
+                return False
+            self._unindex_user(user)
+            self._order.discard(user_id)
+            role_order = self._by_role.get(user.get_role())
+            if role_order is not None:
+                role_order.discard(user_id)
+            del self.users[user_id]
+            self.changes.publish(UserDeleted(user_id))
+        self.storage.delete_user(user_id, self.users)
+        return True
+    
+    def _index_user(self, user):
+        if self.storage.supports_queries:
+            return
+        # setdefault keeps the first account if old data has duplicates
+        self._by_username.setdefault(user.username, user.user_id)
+        self._by_email.setdefault(user.email, user.user_id)
+    
+    def _order_user(self, user):
+        # Not redone on profile updates, so users keep their place
+        if self.storage.supports_queries:
+            return
+        self._order.add(user.user_id, self._next_seq)
+        self._by_role.setdefault(user.get_role(), SortedIds()).add(user.user_id, self._next_seq)
+        self._next_seq += 1
+    
+    def _unindex_user(self, user):
+        if self._by_username.get(user.username) == user.user_id:
+            del self._by_username[user.username]
+        if self._by_email.get(user.email) == user.user_id:
+            del self._by_email[user.email]
+    
+    def get_all_users(self):
+        return self.users
+    
+    def get_users_by_role(self, role):
+        if self.storage.supports_queries:
+            return self.users.get_many(self.storage.query_user_ids(role=role))
+        return {uid: user for uid, user in list(self.users.items()) if user.get_role() == role}
+    
+    def get_users_page(self, role=None, limit=50, cursor=None):
+        """
+        One page of the users, optionally of one role, in creation order.
+        
+        Args:
+            role: Only users with this role
+            limit: Maximum number of users on the page
+            cursor: next_cursor of the previous page; None for the first
+        
+        Returns:
+            Page of {user_id: User}
+        """
+        if self.storage.supports_queries:
+            user_ids, next_cursor = self.storage.page_user_ids(limit, cursor, role=role)
+            return Page(self.users.get_many(user_ids), next_cursor)
+        with self._lock:
+            order = self._order if role is None else self._by_role.get(role, SortedIds())
+            user_ids, next_cursor = order.page(limit, cursor)
+        return Page({uid: self.users[uid] for uid in user_ids if uid in self.users}, next_cursor)
+    
+    def _save_users(self):
+        self.storage.save_users(self.users)
+
+
+class Change:
+    """
+    A change published on a ChangeFeed. seq is set on publishing and
+    numbers the changes in the order subscribers see them.
+    """
+    
+    __slots__ = ("seq",)
+    fields = ()
+    
+    def __init__(self, *values):
+        self.seq = None
+        for field, value in zip(self.fields, values):
+            setattr(self, field, value)
+    
+    @property
+    def record_id(self):
+        # ID of the record that changed, if the change is about one
+        return None
+    
+    def __repr__(self):
+        values = ", ".join(f"{field}={getattr(self, field)!r}" for field in self.fields)
+        return f"{type(self).__name__}(seq={self.seq}, {values})" if values else f"{type(self).__name__}(seq={self.seq})"
+
+
+class EventChange(Change):
+    __slots__ = ("event_id",)
+    fields = ("event_id",)
+    
+    @property
+    def record_id(self):
+        return self.event_id
+
+
+class EventCreated(EventChange):
+    __slots__ = ()
+
+
+class EventUpdated(EventChange):
+    __slots__ = ()
+
+
+class EventApproved(EventChange):
+    __slots__ = ()
+
+
+class EventDeleted(EventChange):
+    __slots__ = ()
+
+
+class RegistrationAdded(EventChange):
+    __slots__ = ("user_id",)
+    fields = ("event_id", "user_id")
+
+
+class RegistrationRemoved(EventChange):
+    __slots__ = ("user_id",)
+    fields = ("event_id", "user_id")
+
+
+class UserChange(Change):
+    __slots__ = ("user_id",)
+    fields = ("user_id",)
+    
+    @property
+    def record_id(self):
+        return self.user_id
+
+
+class UserCreated(UserChange):
+    __slots__ = ()
+
+
+class UserUpdated(UserChange):
+    __slots__ = ()
+
+
+class UserDeleted(UserChange):
+    __slots__ = ()
+
+
+class Reloaded(Change):
+    # Everything was read back from storage; any record may have changed
+    __slots__ = ()
+
+
+class ChangeFeed:
+    """
+    In-process publish/subscribe of the changes the managers make.
+    
+    Subscribers are called on the publishing thread, in seq order, while
+    the change is being made, so they must be quick and must not publish
+    themselves; hand slow work to another thread, or use queue(). An
+    error in one subscriber is printed and doesn't stop the others.
+    """
+    
+    def __init__(self):
+        self.seq = 0
+        self._subscribers = ()  # (callback, types); replaced, never mutated
+        self._lock = threading.Lock()
+    
+    def subscribe(self, callback, types=Change):
+        """
+        Call callback(change) for every published change that is an
+        instance of types (a Change subclass or a tuple of them).
+        
+        Returns:
+            callback, for unsubscribe()
+        """
+        with self._lock:
+            self._subscribers += ((callback, types),)
+        return callback
+    
+    def unsubscribe(self, callback):
+        with self._lock:
+            self._subscribers = tuple(entry for entry in self._subscribers if entry[0] != callback)
+    
+    def queue(self, types=Change):
+        """
+        Subscribe a new queue.Queue and return it; changes can then be
+        taken off it on any thread. unsubscribe(q.put) stops it.
+        """
+        changes = queue.Queue()
+        self.subscribe(changes.put, types)
+        return changes
+    
+    def publish(self, change):
+        with self._lock:
+            self.seq += 1
+            change.seq = self.seq
+            for callback, types in self._subscribers:
+                if isinstance(change, types):
+                    try:
+                        callback(change)
+                    except Exception as e:
+                        print(f"Error in change subscriber {callback!r}: {e}")
+        return change.seq
+
+
+class ChangeJournal:
+    """
+    The IDs of the records changed, in order, numbered by the seq of the
+    change on a ChangeFeed; subscribe on_change() to keep it.
+    
+    A consumer that remembers the version it last saw asks what changed
+    since then, instead of reading everything again. Only the last
+    max_entries changes are kept.
+    """
+    
+    def __init__(self, max_entries=10000, version=0):
+        self.version = version
+        self.max_entries = max_entries
+        self._entries = deque()  # (version, id)
+        self._floor = version  # changes up to this version can't be told any more
+        self._lock = threading.Lock()
+    
+    def on_change(self, change):
+        with self._lock:
+            if isinstance(change, Reloaded):
+                self._entries.clear()
+                self._floor = change.seq
+            else:
+                if len(self._entries) >= self.max_entries:
+                    self._floor = self._entries.popleft()[0]
+                self._entries.append((change.seq, change.record_id))
+            self.version = change.seq
+    
+    def changed_since(self, version):
+        """
+        Return (ids changed after version, current version). The ids are
+        None if the changes can't be told any more (too old, from before a
+        reload, or a version of another journal); the consumer should then
+        reload everything.
+        """
+        with self._lock:
+            if version > self.version or version < self._floor:
+                return None, self.version
+            changed = set()
+            for entry_version, item_id in reversed(self._entries):
+                if entry_version <= version:
+                    break
+                changed.add(item_id)
+            return changed, self.version
+
+
+class ListingCache:
+    """
+    Bounded LRU cache of listing results, keyed by the listing's arguments.
+    
+    Every invalidation starts a new generation; put() drops a result that
+    was computed in an older one, so a listing read while a write was
+    under way is never cached.
+    """
+    
+    def __init__(self, max_size=32):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.generation = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+    
+    def put(self, key, value, generation):
+        with self._lock:
+            if generation != self.generation:
+                return
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+    
+    def invalidate(self, predicate=None):
+        # Drop the entries whose key matches predicate, or all of them
+        with self._lock:
+            self.generation += 1
+            for key in [key for key in self._entries if predicate is None or predicate(key)]:
+                del self._entries[key]
+    
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
+
+
+class EventManager:
+    def __init__(self, storage, listing_cache_size=32, changes=None):
+        self.storage = storage
+        # Events created, edited, approved, deleted or registered for are
+        # published here
+        self.changes = changes if changes is not None else ChangeFeed()
+        self.events = self.storage.load_events()
+        
+        # Results of EventManagementSystem.get_available_events, keyed by
+        # (category, sort_by_date). The cached dicts hold the live Event
+        # objects, so seat counts are always current; only changes to which
+        # events are listed, or to their order, invalidate them. Evicting
+        # lazily loaded events does too: the cached objects are no longer
+        # the live ones, and shouldn't be kept in memory anyway.
+        self.listing_cache = ListingCache(listing_cache_size)
+        if isinstance(self.events, LazyRecords):
+            self.events.on_evict = lambda keys: self.listing_cache.invalidate()
+        
+        # Secondary indexes for the listing queries. Backends with
+        # supports_queries answer those themselves, so none are kept then.
+        self._index_keys = {}  # event_id -> (category, organizer_id, is_approved, date) it is filed under
+        self._by_organizer = {}  # organizer_id -> {event_id: None}
+        # Approved events only, by creation order (the SortedIds key is
+        # the event's number in _order) and by date, overall and per category
+        self._approved = SortedIds()
+        self._approved_by_category = {}  # category -> SortedIds
+        self._approved_by_date = SortedIds()
+        self._approved_by_category_date = {}  # category -> SortedIds
+        self._pending = {}  # event_id -> None
+        self._order = SortedIds()  # every event, keyed by creation number
+        self._next_seq = 0
+        # user_id -> RegistrationSet of event_ids. RegularUser.registered_events
+        # is bound to these same sets, so there is a single copy to keep right.
+        self._events_by_user = {}
+        # Guards the indexes. Registrations don't touch them (only the
+        # per-event lock and the reverse index's atomic set operations),
+        # so they never wait on it.
+        self._lock = threading.RLock()
+        if not self.storage.supports_queries:
+            for event in self.events.values():
+                self._order_event(event.event_id)
+                self._index_event(event)
+                for user_id in event.registered_users:
+                    self._events_by_user.setdefault(user_id, RegistrationSet()).add(event.event_id)
+    
+    def create_event(self, title, description, date, venue, capacity, category, organizer_id):
+        # Check if event date is not before today
+        if date < datetime.now():
+            return None, "Event date cannot be before today"
+        
+        event_id = str(uuid.uuid4())
+        event = Event(event_id, title, description, date, venue, capacity, category, organizer_id)
+        with self._lock:
+            self.events[event_id] = event
+            self._order_event(event_id)
+            self._reindex_event(event)
+            self.changes.publish(EventCreated(event_id))
+        self.storage.save_event(event, self.events)
+        return event_id, "Event created successfully"
+    
+    def get_event(self, event_id):
+        return self.events.get(event_id)
+    
+    def approve_event(self, event_id):
+        event = self.get_event(event_id)
+        if event:
+            with self._lock:
+                event.approve_event()
+                self._reindex_event(event)
+                self.changes.publish(EventApproved(event_id))
+            self.storage.save_event(event, self.events)
+            return True
+        return False
+    
+    def delete_event(self, event_id):
+        with self._lock:
+            event = self.events.pop(event_id, None)
+            if event is None:
+                return False
+            old_key = self._index_keys.get(event_id)
+            self._unindex_event(event_id)
+            self._order.discard(event_id)
+            self.changes.publish(EventDeleted(event_id))
+            self._listings_changed(old_key, None)
+            if self.storage.supports_queries and event.is_approved:
+                self.listing_cache.invalidate()
+        with event._lock:
+            for user_id in list(event.registered_users):
+                if user_id in self._events_by_user:
+                    self._events_by_user[user_id].discard(event_id)
+        self.storage.delete_event(event_id, self.events)
+        return True
+    
+    def get_all_events(self):
+        return self.events
+    
+    def get_approved_events(self):
+        if self.storage.supports_queries:
+            return self._query(approved=True)
+        return self._lookup(self._approved)
+    
+    def get_unapproved_events(self):
+        if self.storage.supports_queries:
+            return self._query(approved=False)
+        return self._lookup(self._pending)
+    
+    def get_events_by_organizer(self, organizer_id):
+        if self.storage.supports_queries:
+            return self._query(organizer_id=organizer_id)
+        return self._lookup(self._by_organizer.get(organizer_id, ()))
+    
+    def get_events_by_category(self, category):
+        if self.storage.supports_queries:
+            return self._query(category=category, approved=True)
+        return self._lookup(self._approved_by_category.get(category, ()))
+    
+    def get_events_sorted_by_date(self, ascending=True):
+        if self.storage.supports_queries:
+            return self._query(approved=True, order_by_date="asc" if ascending else "desc")
+        return self._lookup(self._approved_by_date if ascending else reversed(self._approved_by_date))
+    
+    def get_events_page(self, limit=50, cursor=None):
+        """
+        One page of all events, in creation order.
+        
+        Returns:
+            Page of {event_id: Event}
+        """
+        if self.storage.supports_queries:
+            event_ids, next_cursor = self.storage.page_event_ids(limit, cursor)
+            return Page(self.events.get_many(event_ids), next_cursor)
+        with self._lock:
+            event_ids, next_cursor = self._order.page(limit, cursor)
+        return Page(self._lookup(event_ids), next_cursor)
+    
+    def get_approved_events_page(self, category=None, sort_by_date=False, limit=50, cursor=None):
+        """
+        One page of the approved events, optionally of one category, in
+        creation or date order.
+        
+        Returns:
+            Page of {event_id: Event}
+        """
+        if self.storage.supports_queries:
+            event_ids, next_cursor = self.storage.page_event_ids(
+                limit, cursor, category=category, approved=True, order_by_date="asc" if sort_by_date else None)
+            return Page(self.events.get_many(event_ids), next_cursor)
+        with self._lock:
+            if category is None:
+                order = self._approved_by_date if sort_by_date else self._approved
+            else:
+                index = self._approved_by_category_date if sort_by_date else self._approved_by_category
+                order = index.get(category, SortedIds())
+            event_ids, next_cursor = order.page(limit, cursor)
+        return Page(self._lookup(event_ids), next_cursor)
+    
+    def register_user_for_event(self, event_id, user_id):
+        event = self.get_event(event_id)
+        if event and not event.is_full() and event.is_approved:
+            # The reverse index changes under the event's lock too, so it
+            # can't drift from the event's own list
+            with event._lock:
+                if not self.storage.supports_queries and self.events.get(event_id) is not event:
+                    return False  # deleted meanwhile
+                success = event.register_user(user_id)
+                if success and not self.storage.supports_queries:
+                    self.registrations_for_user(user_id).add(event_id)
+            if success:
+                self.changes.publish(RegistrationAdded(event_id, user_id))
+                self.storage.save_registration(event_id, user_id, self.events)
+            return success
+        return False
+    
+    def unregister_user_from_event(self, event_id, user_id):
+        event = self.get_event(event_id)
+        if event:
+            with event._lock:
+                success = event.unregister_user(user_id)
+                if success and user_id in self._events_by_user:
+                    self._events_by_user[user_id].discard(event_id)
+            if success:
+                self.changes.publish(RegistrationRemoved(event_id, user_id))
+                self.storage.delete_registration(event_id, user_id, self.events)
+            return success
+        return False
+    
+    def get_events_for_user(self, user_id):
+        if self.storage.supports_queries:
+            return self._query(user_id=user_id, approved=True)
+        # list() copies the set in one step; registrations may be changing it
+        event_ids = list(self._events_by_user.get(user_id, ()))
+        return {eid: event for eid, event in self._lookup(event_ids).items() if event.is_approved}
+    
+    def registrations_for_user(self, user_id):
+        # Returns the live index entry, which RegularUser objects share
+        if self.storage.supports_queries:
+            return RegistrationSet(self.storage.query_event_ids(user_id=user_id))
+        return self._events_by_user.setdefault(user_id, RegistrationSet())
+    
+    def _query(self, **filters):
+        # Let the backend pick the matching ids and only materialize those events
+        return self.events.get_many(self.storage.query_event_ids(**filters))
+    
+    def save_event(self, event):
+        # Called after an event's details were edited, which may move it between indexes
+        with self._lock:
+            self._reindex_event(event)
+            self.changes.publish(EventUpdated(event.event_id))
+        self.storage.save_event(event, self.events)
+    
+    def _lookup(self, event_ids):
+        # event_ids may be a live index (or a generator over one), so it is
+        # only walked under the lock
+        with self._lock:
+            events = {}
+            for event_id in event_ids:
+                event = self.events.get(event_id)
+                if event is not None:
+                    events[event_id] = event
+            return events
+    
+    def _index_event(self, event):
+        event_id = event.event_id
+        key = (event.category, event.organizer_id, event.is_approved, event.date)
+        self._index_keys[event_id] = key
+        self._by_organizer.setdefault(event.organizer_id, {})[event_id] = None
+        if event.is_approved:
+            seq = self._order.key(event_id)
+            self._approved.add(event_id, seq)
+            self._approved_by_date.add(event_id, event.date)
+            self._approved_by_category.setdefault(event.category, SortedIds()).add(event_id, seq)
+            self._approved_by_category_date.setdefault(event.category, SortedIds()).add(event_id, event.date)
+        else:
+            self._pending[event_id] = None
+    
+    def _order_event(self, event_id):
+        if self.storage.supports_queries:
+            return
+        self._order.add(event_id, self._next_seq)
+        self._next_seq += 1
+    
+    def _unindex_event(self, event_id):
+        key = self._index_keys.pop(event_id, None)
+        if key is None:
+            return
+        category, organizer_id, is_approved, date = key
+        self._discard(self._by_organizer, organizer_id, event_id)
+        if is_approved:
+            self._approved.discard(event_id)
+            self._approved_by_date.discard(event_id)
+            self._approved_by_category[category].discard(event_id)
+            self._approved_by_category_date[category].discard(event_id)
+        else:
+            del self._pending[event_id]
+    
+    def _reindex_event(self, event):
+        if self.storage.supports_queries:
+            # Without index keys the old category is unknown. Approval is
+            # never withdrawn, so an unapproved event was never listed.
+            if event.is_approved:
+                self.listing_cache.invalidate()
+            return
+        key = (event.category, event.organizer_id, event.is_approved, event.date)
+        old_key = self._index_keys.get(event.event_id)
+        if old_key == key:
+            return
+        self._unindex_event(event.event_id)
+        self._index_event(event)
+        self._listings_changed(old_key, key)
+    
+    def _listings_changed(self, old_key, new_key):
+        # Invalidate the cached listings an event filed under old_key and
+        # now under new_key (None for neither) was or is listed in
+        categories = set()
+        for key in (old_key, new_key):
+            if key and key[2]:
+                categories.update((key[0], None))
+        if not categories:
+            return
+        if old_key and new_key and old_key[0] == new_key[0] and old_key[2] == new_key[2]:
+            if old_key[3] == new_key[3]:
+                return  # only the organizer changed
+            # Listings keep creation order, so a new date only reorders the sorted ones
+            self.listing_cache.invalidate(lambda key: key[0] in categories and key[1])
+        else:
+            self.listing_cache.invalidate(lambda key: key[0] in categories)
+    
+    @staticmethod
+    def _discard(index, key, event_id):
+        bucket = index.get(key)
+        if bucket is not None:
+            bucket.pop(event_id, None)
+            if not bucket:
+                del index[key]
+    
+    def _save_events(self):
+        self.storage.save_events(self.events)
+
+
+def _retry_on_conflict(failure, attempts=5):
+    """
+    Wrap an EventManagementSystem method so that a StorageConflictError
+    (another process changed a record this call was writing) reloads
+    everything from storage and runs the call again against fresh data,
+    after a short random backoff so the competing writers spread out.
+    
+    Args:
+        failure: Value returned when every attempt conflicted
+        attempts: Total number of tries; 1 for calls that are not safe to
+            repeat after a partial write
+    """
+    def decorate(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            self._reload_if_stale()
+            for attempt in range(attempts):
+                try:
+                    return method(self, *args, **kwargs)
+                except StorageConflictError as e:
+                    print(f"Storage conflict, reloading: {e}")
+                    time.sleep(random.uniform(0, 0.01 * 2 ** attempt))
+                    self.reload()
+            return failure
+        return wrapper
+    return decorate
+
+
+CONFLICT_MESSAGE = "The data was changed by another process, please try again"
+
+
+# Changes that can alter what the event catalog lists
+CATALOG_CHANGES = (EventApproved, EventUpdated, EventDeleted, RegistrationAdded, RegistrationRemoved, Reloaded)
+
+
+class EventManagementSystem:
+    def __init__(self, storage=None, write_behind=False, flush_interval_ms=200, max_pending=1000,
+                 catalog_file=None, catalog_delay_ms=500, catalog_max_delay_ms=2000,
+                 password_cost=DEFAULT_COST, password_workers=0):
+        if storage is None:
+            storage = DataStorage()
+        
+        # Batch writes instead of persisting every change as it happens;
+        # see WriteBehindStorage for when changes reach the disk
+        if write_behind:
+            storage = WriteBehindStorage(storage, flush_interval_ms, max_pending)
+        
+        self.storage = storage
+        
+        # Password hashing, in the calling thread by default, or on
+        # password_workers processes (None for one per core), as server.py
+        # does. Each step up in password_cost doubles the work of a login;
+        # see bench_passwords.py.
+        self.hasher = PasswordHasher(password_cost, workers=password_workers)
+        
+        # Every change the managers make is published on self.changes, which
+        # outlives reloads. The journals follow it for views that page
+        # through users or events and then only refresh what changed.
+        self.changes = ChangeFeed()
+        self.user_journal = ChangeJournal()
+        self.event_journal = ChangeJournal()
+        self.changes.subscribe(self.user_journal.on_change, (UserChange, Reloaded))
+        self.changes.subscribe(self.event_journal.on_change, (EventChange, Reloaded))
+        self._load()
+        
+        # Create a default admin user if no users exist
+        if not self.user_manager.get_users_by_role("admin"):
+            self.user_manager.add_user("admin", "admin123", "admin@example.com", "admin")
+        
+        # Read-only snapshot of the approved events for browse_events();
+        # built in the background catalog_delay_ms after startup and after
+        # the last change, but no later than catalog_max_delay_ms after the
+        # first of a steady stream of them. Registrations only update seat
+        # counts in place. Building it reads every approved event, which
+        # would defeat a backend that loads records lazily, so there is
+        # none with supports_queries.
+        use_catalog = catalog_file and not self.storage.supports_queries
+        self.catalog = EventCatalog(catalog_file) if use_catalog else None
+        self._catalog_delay = catalog_delay_ms / 1000
+        self._catalog_max_delay = catalog_max_delay_ms / 1000
+        self._catalog_lock = threading.Lock()
+        self._catalog_build_lock = threading.Lock()
+        self._catalog_generation = 0
+        self._catalog_built = -1
+        self._catalog_due = None  # when the pending rebuild must start by
+        self._catalog_timer = None
+        if self.catalog:
+            self.changes.subscribe(self._catalog_changed, CATALOG_CHANGES)
+            self._catalog_changed()
+    
+    def _load(self):
+        self.user_manager = UserManager(self.storage, self.changes, self.hasher)
+        self.event_manager = EventManager(self.storage, changes=self.changes)
+        
+        # The event side is authoritative for who is registered where; point
+        # each regular user at the event manager's reverse index
+        if not self.storage.supports_queries:
+            for user in self.user_manager.users.values():
+                self._bind_registrations(user)
+    
+    def reload(self):
+        # Drop the in-memory state and read it back from storage, e.g. to
+        # pick up changes made by other processes sharing the files
+        self.flush()
+        self._load()
+        if isinstance(self.storage, WriteBehindStorage):
+            self.storage.stale = False
+        self.changes.publish(Reloaded())
+    
+    def _reload_if_stale(self):
+        # Another process wrote the shared files, or write-behind dropped
+        # changes that conflicted with its; pick up what is on disk
+        if getattr(self.storage, "stale", False):
+            self.reload()
+    
+    def login(self, username, password):
+        self._reload_if_stale()
+        user_id = self.user_manager.authenticate(username, password)
+        if user_id:
+            user = self.user_manager.get_user(user_id)
+            return user_id, user.get_role()
+        return None, None
+    
+    @_retry_on_conflict((None, CONFLICT_MESSAGE))
+    def register_user(self, username, password, email, role="user"):
+        user_id, msg = self.user_manager.add_user(username, password, email, role)
+        if user_id and not self.storage.supports_queries:
+            self._bind_registrations(self.user_manager.get_user(user_id))
+        return user_id, msg
+    
+    def _bind_registrations(self, user):
+        if isinstance(user, RegularUser):
+            user.registered_events = self.event_manager.registrations_for_user(user.user_id)
+    
+    @_retry_on_conflict((None, CONFLICT_MESSAGE), attempts=1)
+    def create_event(self, title, description, date, venue, capacity, category, organizer_id):
+        event_id, msg = self.event_manager.create_event(title, description, date, venue, capacity, category, organizer_id)
+        if event_id:
+            organizer = self.user_manager.get_user(organizer_id)
+            if organizer and isinstance(organizer, Organizer):
+                organizer.add_event(event_id)
+                self.storage.save_user(organizer, self.user_manager.users)
+        return event_id, msg
+    
+    @_retry_on_conflict(False)
+    def approve_event(self, event_id, admin_id):
+        admin = self.user_manager.get_user(admin_id)
+        if admin and admin.get_role() == "admin":
+            return self.event_manager.approve_event(event_id)
+        return False
+    
+    @_retry_on_conflict(False)
+    def register_for_event(self, event_id, user_id):
+        user = self.user_manager.get_user(user_id)
+        if user and user.get_role() == "user" and isinstance(user, RegularUser):
+            success = self.event_manager.register_user_for_event(event_id, user_id)
+            if success:
+                # A no-op when the user shares the event manager's index;
+                # keeps lazily loaded users current otherwise
+                self._save_registered_user(user, lambda user: user.register_for_event(event_id))
+            return success
+        return False
+    
+    @_retry_on_conflict(False)
+    def unregister_from_event(self, event_id, user_id):
+        user = self.user_manager.get_user(user_id)
+        if user and user.get_role() == "user" and isinstance(user, RegularUser):
+            success = self.event_manager.unregister_user_from_event(event_id, user_id)
+            if success:
+                self._save_registered_user(user, lambda user: user.unregister_from_event(event_id))
+            return success
+        return False
+    
+    def _save_registered_user(self, user, update, attempts=5):
+        """
+        Apply update to a user and save them, once the event side of a
+        registration change has been written.
+        
+        A conflict here is on the user record alone. Retrying the whole
+        call would find the registration already made (or gone), so reload
+        and apply update to the other process's copy instead.
+        """
+        for attempt in range(attempts):
+            update(user)
+            try:
+                self.storage.save_user(user, self.user_manager.users)
+                return
+            except StorageConflictError as e:
+                print(f"Storage conflict, reloading: {e}")
+                time.sleep(random.uniform(0, 0.01 * 2 ** attempt))
+                self.reload()
+                user = self.user_manager.get_user(user.user_id)
+                if user is None:
+                    return
+    
+    @_retry_on_conflict((False, CONFLICT_MESSAGE))
+    def delete_user(self, target_user_id, admin_id):
+        admin = self.user_manager.get_user(admin_id)
+        if not admin or admin.get_role() != "admin":
+            return False, "Only admin can delete users"
+        
+        user = self.user_manager.get_user(target_user_id)
+        if not user:
+            return False, "User not found"
+        
+        # If deleting an organizer, delete all their events
+        if user.get_role() == "organizer" and isinstance(user, Organizer):
+            organizer_events = self.event_manager.get_events_by_organizer(target_user_id)
+            unregistered = {}  # user_id -> RegularUser, saved together below
+            for event_id in list(organizer_events.keys()):
+                # Unregister all users from this event
+                event = self.event_manager.get_event(event_id)
+                for registered_user_id in list(event.registered_users):
+                    registered_user = self.user_manager.get_user(registered_user_id)
+                    if registered_user and isinstance(registered_user, RegularUser):
+                        registered_user.unregister_from_event(event_id)
+                        unregistered[registered_user_id] = registered_user
+                # Delete the event
+                self.event_manager.delete_event(event_id)
+            if unregistered:
+                # One write for every affected user, however many registrations they had
+                users = self.user_manager.users
+                self.storage.write_batch([("save_user", (registered_user, users))
+                                          for registered_user in unregistered.values()])
+        
+        # If deleting a user, unregister them from all events
+        elif user.get_role() == "user" and isinstance(user, RegularUser):
+            for event_id in list(user.registered_events):
+                self.event_manager.unregister_user_from_event(event_id, target_user_id)
+        
+        # Finally delete the user
+        self.user_manager.delete_user(target_user_id)
+        return True, "User deleted successfully"
+    
+    def get_available_events(self, user_id=None, category=None, sort_by_date=False):
+        self._reload_if_stale()
+        # Served from the event manager's listing cache; the result is a
+        # read-only view shared between callers
+        cache = self.event_manager.listing_cache
+        key = (category or None, bool(sort_by_date))
+        events = cache.get(key)
+        if events is None:
+            generation = cache.generation
+            events = MappingProxyType(self._list_available_events(*key))
+            cache.put(key, events, generation)
+        return events
+    
+    def _list_available_events(self, category, sort_by_date):
+        if category:
+            events = self.event_manager.get_events_by_category(category)
+        elif sort_by_date:
+            return self.event_manager.get_events_sorted_by_date()
+        else:
+            events = self.event_manager.get_approved_events()
+        
+        if sort_by_date:
+            sorted_events = sorted(events.values(), key=lambda e: e.date)
+            events = {event.event_id: event for event in sorted_events}
+        
+        return events
+    
+    def browse_events(self, category=None, sort_by_date=False):
+        """
+        List approved events like get_available_events, from the catalog
+        when one is configured and up to date.
+        
+        Returns:
+            CatalogListing of read-only CatalogEntry objects, or a read-only
+            dict of Event objects while the catalog is being rebuilt
+        """
+        if self.catalog and self._catalog_built == self._catalog_generation:
+            try:
+                return self.catalog.listing(category, sort_by_date)
+            except (OSError, ValueError) as e:
+                print(f"Error reading event catalog: {e}")
+        return self.get_available_events(category=category, sort_by_date=sort_by_date)
+    
+    def _catalog_changed(self, change=None):
+        # Mark the catalog stale and (re)start the countdown to rebuilding
+        # it, so a burst of writes leads to one rebuild
+        if not self.catalog:
+            return
+        with self._catalog_lock:
+            if (isinstance(change, (RegistrationAdded, RegistrationRemoved))
+                    and self._catalog_built == self._catalog_generation):
+                # Only a seat count changed; while the catalog is current it
+                # can take that in place
+                event = self.event_manager.get_event(change.event_id)
+                if event is not None and self.catalog.set_registered(event.event_id, len(event.registered_users)):
+                    return
+            self._catalog_generation += 1
+            now = time.monotonic()
+            if self._catalog_due is None:
+                self._catalog_due = now + self._catalog_max_delay
+            if self._catalog_timer:
+                self._catalog_timer.cancel()
+            delay = max(0, min(self._catalog_delay, self._catalog_due - now))
+            self._catalog_timer = threading.Timer(delay, self._rebuild_catalog)
+            self._catalog_timer.daemon = True
+            self._catalog_timer.start()
+    
+    def _rebuild_catalog(self):
+        with self._catalog_build_lock:
+            with self._catalog_lock:
+                generation = self._catalog_generation
+                self._catalog_due = None
+            try:
+                self.catalog.build(list(self.event_manager.get_approved_events().values()))
+            except (OSError, RuntimeError) as e:
+                # RuntimeError: the events changed while being read; a change
+                # always schedules another rebuild
+                print(f"Error building event catalog: {e}")
+                return
+        with self._catalog_lock:
+            self._catalog_built = max(self._catalog_built, generation)
+    
+    def flush(self):
+        # Write out any changes still queued in write-behind mode
+        if isinstance(self.storage, WriteBehindStorage):
+            self.storage.flush()
+    
+    def close(self):
+        if self._catalog_timer:
+            self._catalog_timer.cancel()
+        if self.catalog:
+            self.catalog.close()
+        self.hasher.close()
+        self.storage.close()
+    
+    def evict(self):
+        # With a lazily loading backend, drop every record read so far to
+        # free the memory, e.g. after logout; no-op for in-memory storage
+        self.flush()
+        for records in (self.user_manager.users, self.event_manager.events):
+            if isinstance(records, LazyRecords):
+                records.evict()
+    
+    def get_user_registrations(self, user_id):
+        user = self.user_manager.get_user(user_id)
+        if user and user.get_role() == "user" and isinstance(user, RegularUser):
+            return user.registered_events
+        return []
+    
+    def get_event_registrations(self, event_id, organizer_id=None):
+        event = self.event_manager.get_event(event_id)
+        if not event:
+            return []
+        
+        # Check if the requesting user is the organizer of this event
+        if organizer_id and event.organizer_id != organizer_id:
+            return []
+        
+        return event.registered_users
+    
+    # Paged listings, for callers that show or send one page at a time.
+    # Each returns a Page; pass its next_cursor back to get the next one.
+    
+    def get_users_page(self, role=None, limit=50, cursor=None):
+        return self.user_manager.get_users_page(role, limit, cursor)
+    
+    def get_events_page(self, limit=50, cursor=None):
+        return self.event_manager.get_events_page(limit, cursor)
+    
+    def get_available_events_page(self, category=None, sort_by_date=False, limit=50, cursor=None):
+        return self.event_manager.get_approved_events_page(category or None, sort_by_date, limit, cursor)
+    
+    def get_event_registrations_page(self, event_id, organizer_id=None, limit=50, cursor=None):
+        # Page of user IDs, in registration order
+        event = self.event_manager.get_event(event_id)
+        if not event or (organizer_id and event.organizer_id != organizer_id):
+            return Page([], None)
+        return Page(*event.registered_users.page(limit, cursor))
+    
+    def get_user_events(self, organizer_id):
+        return self.event_manager.get_events_by_organizer(organizer_id)
+    
+    @_retry_on_conflict((False, CONFLICT_MESSAGE))
+    def update_event(self, event_id, title, description, date, venue, capacity, category, organizer_id):
+        """
+        Update an existing event.
+        Only the organizer of the event can update it.
+        
+        Args:
+            event_id: ID of the event to update
+            title: New event title
+            description: New event description
+            date: New event date (datetime object)
+            venue: New event venue
+            capacity: New event capacity
+            category: New event category
+            organizer_id: ID of the user attempting to update the event
+            
+        Returns:
+            Tuple of (success, message)
+        """
+        # Get the event
+        event = self.event_manager.get_event(event_id)
+        if not event:
+            return False, "Event not found"
+        
+        # Check if user is authorized to update this event
+        if event.organizer_id != organizer_id:
+            return False, "You can only edit your own events"
+        
+        # Check if capacity can be changed (can't reduce below current registrations)
+        if not event.set_capacity(capacity):
+            return False, f"Cannot reduce capacity below current registrations ({len(event.registered_users)})"
+        
+        # Update event details
+        event.title = title
+        event.description = description
+        event.date = date
+        event.venue = ids.intern(venue)
+        event.category = ids.intern(category)
+        
+        # Events may need re-approval after significant changes
+        # Uncomment the following line if you want edited events to require re-approval
+        # event.is_approved = False
+        
+        # Save changes
+        self.event_manager.save_event(event)
+        
+        return True, "Event updated successfully"
+
+
@@ -0,0 +1,154 @@
+import base64
+import hashlib
+import hmac
+import multiprocessing
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+
+SCHEME = "scrypt"
+# scrypt's n is 2 ** cost; each step up doubles the time and memory a hash takes
+DEFAULT_COST = 14
+SALT_BYTES = 16
+HASH_BYTES = 32
+
+
+def _pool_context():
+    # Not fork: pools are started from processes already running other
+    # threads (HTTP workers, write-behind and catalog timers), and a forked
+    # child can inherit a lock one of them was holding
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+def _scrypt(password, salt, cost, r, p, length):
+    # Module level, so pool workers can unpickle it
+    n = 1 << cost
+    return hashlib.scrypt(password.encode(), salt=salt, n=n, r=r, p=p, dklen=length,
+                          maxmem=128 * r * (n + p + 2) + (1 << 20))
+
+
+class PasswordHasher:
+    """
+    Salted scrypt hashing of passwords, stored as
+    "scrypt$<cost>$<r>$<p>$<salt>$<hash>" (base64 salt and hash).
+    
+    Hashes are computed in a pool of worker processes, so a burst of
+    logins uses every core and doesn't hold up the process's other
+    threads; workers=0 computes them in the calling thread instead.
+    Successful verifications are remembered (keyed by an HMAC of the
+    stored hash and password under a per-process secret, never the
+    password itself), as are hashes just made, so a user logging in again
+    costs no hashing.
+    
+    verify() also accepts the plaintext passwords of records written
+    before hashing, and reports them, and hashes made at another cost,
+    as needing a rehash; see UserManager.authenticate().
+    """
+    
+    def __init__(self, cost=DEFAULT_COST, r=8, p=1, workers=None, cache_size=1024):
+        self.cost = cost
+        self.r = r
+        self.p = p
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.cache_size = cache_size
+        self.cache_hits = 0
+        self._cache = OrderedDict()  # HMAC of (stored, password) -> None
+        self._cache_secret = os.urandom(32)
+        self._lock = threading.Lock()
+        self._pool = None
+    
+    def hash(self, password):
+        salt = os.urandom(SALT_BYTES)
+        digest = self._derive(password, salt, self.cost, self.r, self.p, HASH_BYTES)
+        stored = "$".join((SCHEME, str(self.cost), str(self.r), str(self.p),
+                           base64.b64encode(salt).decode(), base64.b64encode(digest).decode()))
+        # The password is known to match what was just made of it
+        self._remember(self._cache_key(password, stored))
+        return stored
+    
+    def verify(self, password, stored):
+        """
+        Check password against a stored password.
+        
+        Args:
+            password: Password as entered
+            stored: The user's stored hash, or a legacy plaintext password
+        
+        Returns:
+            (matches, needs_rehash); needs_rehash is True when the password
+            matched but stored is plaintext or uses other parameters
+        """
+        if not stored:
+            return False, False
+        params = self._parse(stored)
+        if params is None:
+            # Plaintext from before passwords were hashed
+            matches = hmac.compare_digest(password.encode(), stored.encode())
+            return matches, matches
+        cost, r, p, salt, expected = params
+        outdated = (cost, r, p) != (self.cost, self.r, self.p)
+        
+        key = self._cache_key(password, stored)
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                self.cache_hits += 1
+                return True, outdated
+        
+        if not hmac.compare_digest(self._derive(password, salt, cost, r, p, len(expected)), expected):
+            return False, False
+        self._remember(key)
+        return True, outdated
+    
+    def _cache_key(self, password, stored):
+        return hmac.digest(self._cache_secret, f"{stored}\0{password}".encode(), "sha256")
+    
+    def _remember(self, key):
+        if not self.cache_size:
+            return
+        with self._lock:
+            self._cache[key] = None
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+    
+    def _parse(self, stored):
+        # (cost, r, p, salt, hash) of a stored hash; None for plaintext
+        parts = stored.split("$")
+        if len(parts) != 6 or parts[0] != SCHEME:
+            return None
+        try:
+            return (int(parts[1]), int(parts[2]), int(parts[3]),
+                    base64.b64decode(parts[4], validate=True), base64.b64decode(parts[5], validate=True))
+        except ValueError:
+            return None
+    
+    def _derive(self, password, salt, cost, r, p, length):
+        pool = self._get_pool()
+        if pool is not None:
+            try:
+                return pool.submit(_scrypt, password, salt, cost, r, p, length).result()
+            except BrokenProcessPool:
+                # A worker died; start a new pool next time
+                with self._lock:
+                    if self._pool is pool:
+                        self._pool = None
+        return _scrypt(password, salt, cost, r, p, length)
+    
+    def _get_pool(self):
+        if not self.workers:
+            return None
+        with self._lock:
+            if self._pool is None:
+                # Workers are started as hashes are asked for, not up front
+                self._pool = ProcessPoolExecutor(self.workers, mp_context=_pool_context())
+            return self._pool
+    
+    def close(self):
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown()
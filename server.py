@@ -0,0 +1,428 @@
+import argparse
+import json
+import re
+import secrets
+import signal
+import threading
+import time
+import traceback
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.parse import urlsplit, parse_qs
+
+from main import DataStorage, EventManagementSystem
+from passwords import DEFAULT_COST
+
+
+class PooledHTTPServer(HTTPServer):
+    """
+    HTTPServer that hands each connection to a fixed pool of worker threads.
+    
+    Connections are kept alive, so a worker serves every request on its
+    connection until the client closes it; the pool size is therefore
+    the number of connections served at once, and later ones queue.
+    """
+    
+    def __init__(self, address, handler, workers=16):
+        super().__init__(address, handler)
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="http")
+    
+    def process_request(self, request, client_address):
+        self.pool.submit(self._process, request, client_address)
+    
+    def _process(self, request, client_address):
+        # What ThreadingMixIn does on its own thread, on a pooled one
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+    
+    def server_close(self):
+        super().server_close()
+        self.pool.shutdown(wait=True)
+
+
+class Sessions:
+    """
+    Tokens handed out at sign-in, and the user each one signed in.
+    
+    Requests name their user with an "Authorization: Bearer <token>"
+    header; a user id in the body or query is never taken as the caller.
+    Tokens are kept in this process's memory, so they end with it.
+    """
+    
+    def __init__(self, lifetime=12 * 60 * 60):
+        self.lifetime = lifetime
+        self._tokens = OrderedDict()  # token -> (user_id, expires), oldest first
+        self._lock = threading.Lock()
+    
+    def start(self, user_id):
+        token = secrets.token_urlsafe(32)
+        now = time.monotonic()
+        with self._lock:
+            # Every token lives as long, so the expired ones are at the front
+            while self._tokens and next(iter(self._tokens.values()))[1] <= now:
+                self._tokens.popitem(last=False)
+            self._tokens[token] = (user_id, now + self.lifetime)
+        return token
+    
+    def user_id(self, token):
+        with self._lock:
+            user_id, expires = self._tokens.get(token, (None, 0))
+        return user_id if expires > time.monotonic() else None
+    
+    def end(self, token):
+        with self._lock:
+            self._tokens.pop(token, None)
+
+
+class Session:
+    """The sign-in, if any, a request was made under."""
+    
+    def __init__(self, sessions, token):
+        self.sessions = sessions
+        self.token = token
+        self.user_id = sessions.user_id(token) if token else None
+
+
+class ApiError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def _require(body, *fields):
+    missing = [field for field in fields if field not in body]
+    if missing:
+        raise ApiError(400, f"Missing fields: {', '.join(missing)}")
+    return [body[field] for field in fields]
+
+
+def _signed_in(system, session, *roles):
+    """
+    The user a request was made by, who must still exist.
+    
+    Args:
+        roles: If given, the roles allowed to make the request
+    
+    Returns:
+        The user's User object
+    """
+    user = system.user_manager.get_user(session.user_id) if session.user_id else None
+    if user is None:
+        raise ApiError(401, "Sign in first")
+    if roles and user.get_role() not in roles:
+        raise ApiError(403, "Not allowed")
+    return user
+
+
+def _page_args(query):
+    # (limit, cursor) when the client asked for a page, else None
+    if "limit" not in query:
+        return None
+    try:
+        limit = int(query["limit"][0])
+    except ValueError:
+        raise ApiError(400, "Invalid limit") from None
+    if not 0 < limit <= 1000:
+        raise ApiError(400, "limit must be between 1 and 1000")
+    return limit, query.get("cursor", [None])[0]
+
+
+def _paged(listing, *args):
+    try:
+        return listing(*args)
+    except ValueError as e:
+        raise ApiError(400, str(e)) from None
+
+
+def _parse_date(value):
+    try:
+        date = datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise ApiError(400, "date must be an ISO 8601 string")
+    if date.tzinfo is not None:
+        # Events keep naive local times, like datetime.now()
+        date = date.astimezone().replace(tzinfo=None)
+    return date
+
+
+def _parse_capacity(value):
+    # An int, or a string of one; not a bool or a float to be truncated
+    try:
+        if isinstance(value, bool) or not isinstance(value, (int, str)):
+            raise TypeError
+        capacity = int(value)
+    except (TypeError, ValueError):
+        raise ApiError(400, "capacity must be a positive integer") from None
+    if capacity < 1:
+        raise ApiError(400, "capacity must be a positive integer")
+    return capacity
+
+
+# Anyone can sign up as these; admins are only made by other means
+SIGNUP_ROLES = ("user", "organizer")
+
+
+# Handlers take (system, match, query, body, session) and return a JSON-able result
+
+def login(system, match, query, body, session):
+    username, password = _require(body, "username", "password")
+    user_id, role = system.login(username, password)
+    if not user_id:
+        raise ApiError(401, "Invalid username or password")
+    return {"user_id": user_id, "role": role, "token": session.sessions.start(user_id)}
+
+
+def logout(system, match, query, body, session):
+    if session.token:
+        session.sessions.end(session.token)
+    return {"signed_in": False}
+
+
+def register_user(system, match, query, body, session):
+    username, password, email = _require(body, "username", "password", "email")
+    role = body.get("role", "user")
+    if role not in SIGNUP_ROLES:
+        raise ApiError(400, f"role must be one of {', '.join(SIGNUP_ROLES)}")
+    user_id, msg = system.register_user(username, password, email, role)
+    if not user_id:
+        raise ApiError(409, msg)
+    # Signed in as the new user, as after /login
+    return {"user_id": user_id, "message": msg, "token": session.sessions.start(user_id)}
+
+
+def delete_user(system, match, query, body, session):
+    admin = _signed_in(system, session)
+    success, msg = system.delete_user(match["user_id"], admin.user_id)
+    if not success:
+        raise ApiError(403, msg)
+    return {"message": msg}
+
+
+def _own_or_admin(system, match, session):
+    # A user's registrations and events are shown to them and to admins
+    user = _signed_in(system, session)
+    if user.user_id != match["user_id"] and user.get_role() != "admin":
+        raise ApiError(403, "Not allowed")
+
+
+def user_registrations(system, match, query, body, session):
+    _own_or_admin(system, match, session)
+    return {"event_ids": list(system.get_user_registrations(match["user_id"]))}
+
+
+def user_events(system, match, query, body, session):
+    _own_or_admin(system, match, session)
+    return {"events": [e.to_dict() for e in list(system.get_user_events(match["user_id"]).values())]}
+
+
+def list_events(system, match, query, body, session):
+    category = query.get("category", [None])[0]
+    sort_by_date = query.get("sort_by_date", ["0"])[0] in ("1", "true")
+    page = _page_args(query)
+    if page:
+        events, next_cursor = _paged(system.get_available_events_page, category, sort_by_date, *page)
+        return {"events": [e.to_dict() for e in events.values()], "next_cursor": next_cursor}
+    events = system.get_available_events(category=category, sort_by_date=sort_by_date)
+    return {"events": [e.to_dict() for e in list(events.values())]}
+
+
+def list_users(system, match, query, body, session):
+    # Admins only: ids and roles are what the other requests are checked against.
+    # Always paged; there may be far too many users for one response
+    _signed_in(system, session, "admin")
+    role = query.get("role", [None])[0]
+    limit, cursor = _page_args(query) or (50, None)
+    users, next_cursor = _paged(system.get_users_page, role, limit, cursor)
+    users = [{k: v for k, v in u.to_dict().items() if k != "password"} for u in users.values()]
+    return {"users": users, "next_cursor": next_cursor}
+
+
+def create_event(system, match, query, body, session):
+    organizer = _signed_in(system, session, "organizer")
+    title, description, date, venue, capacity, category = _require(
+        body, "title", "description", "date", "venue", "capacity", "category")
+    event_id, msg = system.create_event(title, description, _parse_date(date), venue,
+                                        _parse_capacity(capacity), category, organizer.user_id)
+    if not event_id:
+        raise ApiError(403, msg)
+    return {"event_id": event_id, "message": msg}
+
+
+def update_event(system, match, query, body, session):
+    organizer = _signed_in(system, session, "organizer")
+    title, description, date, venue, capacity, category = _require(
+        body, "title", "description", "date", "venue", "capacity", "category")
+    success, msg = system.update_event(match["event_id"], title, description, _parse_date(date), venue,
+                                       _parse_capacity(capacity), category, organizer.user_id)
+    if not success:
+        raise ApiError(409, msg)
+    return {"message": msg}
+
+
+def approve_event(system, match, query, body, session):
+    admin = _signed_in(system, session)
+    if not system.approve_event(match["event_id"], admin.user_id):
+        raise ApiError(403, "Could not approve event")
+    return {"approved": True}
+
+
+def register_for_event(system, match, query, body, session):
+    user = _signed_in(system, session)
+    if not system.register_for_event(match["event_id"], user.user_id):
+        raise ApiError(409, "Registration failed")
+    return {"registered": True}
+
+
+def unregister_from_event(system, match, query, body, session):
+    user = _signed_in(system, session)
+    if not system.unregister_from_event(match["event_id"], user.user_id):
+        raise ApiError(409, "Not registered for this event")
+    return {"registered": False}
+
+
+def event_registrations(system, match, query, body, session):
+    # The event's organizer sees its registrations, and admins see any event's
+    user = _signed_in(system, session)
+    organizer_id = None if user.get_role() == "admin" else user.user_id
+    page = _page_args(query)
+    if page:
+        user_ids, next_cursor = _paged(system.get_event_registrations_page, match["event_id"], organizer_id, *page)
+        return {"user_ids": user_ids, "next_cursor": next_cursor}
+    return {"user_ids": list(system.get_event_registrations(match["event_id"], organizer_id))}
+
+
+ROUTES = [
+    ("POST", r"/login", login),
+    ("POST", r"/logout", logout),
+    ("GET", r"/users", list_users),
+    ("POST", r"/users", register_user),
+    ("DELETE", r"/users/(?P<user_id>[^/]+)", delete_user),
+    ("GET", r"/users/(?P<user_id>[^/]+)/registrations", user_registrations),
+    ("GET", r"/users/(?P<user_id>[^/]+)/events", user_events),
+    ("GET", r"/events", list_events),
+    ("POST", r"/events", create_event),
+    ("PUT", r"/events/(?P<event_id>[^/]+)", update_event),
+    ("POST", r"/events/(?P<event_id>[^/]+)/approve", approve_event),
+    ("POST", r"/events/(?P<event_id>[^/]+)/register", register_for_event),
+    ("POST", r"/events/(?P<event_id>[^/]+)/unregister", unregister_from_event),
+    ("GET", r"/events/(?P<event_id>[^/]+)/registrations", event_registrations),
+]
+ROUTES = [(method, re.compile(pattern + "$"), handler) for method, pattern, handler in ROUTES]
+
+
+class ApiHandler(BaseHTTPRequestHandler):
+    # HTTP/1.1 keeps connections open between requests
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; without this, Nagle's
+    # algorithm holds the body back for the client's delayed ACK (~40ms)
+    disable_nagle_algorithm = True
+    # Close idle keep-alive connections, so they don't hold a worker forever
+    timeout = 30
+    system = None  # set by make_server; shared by every request
+    sessions = None  # likewise
+    
+    def _dispatch(self, method):
+        url = urlsplit(self.path)
+        try:
+            # Always read the body, even for a 404, or it would be taken
+            # for the next request on this connection
+            body = self._read_body()
+            session = Session(self.sessions, self._token())
+            for route_method, pattern, handler in ROUTES:
+                match = pattern.match(url.path)
+                if match and route_method == method:
+                    self._send(200, handler(self.system, match, parse_qs(url.query), body, session))
+                    return
+            raise ApiError(404, "Not found")
+        except ApiError as e:
+            self._send(e.status, {"error": str(e)})
+        except Exception:
+            # The details go to the server's log, not to the client
+            traceback.print_exc()
+            self._send(500, {"error": "Internal server error"})
+    
+    def _token(self):
+        scheme, _, token = (self.headers.get("Authorization") or "").partition(" ")
+        return token.strip() if scheme.lower() == "bearer" else None
+    
+    def _read_body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if not length:
+            return {}
+        try:
+            body = json.loads(self.rfile.read(length))
+        except ValueError:
+            raise ApiError(400, "Body is not valid JSON")
+        if not isinstance(body, dict):
+            raise ApiError(400, "Body must be a JSON object")
+        return body
+    
+    def _send(self, status, payload):
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+    
+    def do_GET(self):
+        self._dispatch("GET")
+    
+    def do_POST(self):
+        self._dispatch("POST")
+    
+    def do_PUT(self):
+        self._dispatch("PUT")
+    
+    def do_DELETE(self):
+        self._dispatch("DELETE")
+    
+    def log_message(self, format, *args):
+        # One line per request would dominate the cost under load
+        pass
+
+
+def make_server(system, host="127.0.0.1", port=8000, workers=16, sessions=None):
+    handler = type("BoundApiHandler", (ApiHandler,), {"system": system, "sessions": sessions or Sessions()})
+    return PooledHTTPServer((host, port), handler, workers)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the event management system over HTTP/JSON")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=16, help="connections served at once")
+    parser.add_argument("--users-file", default="users.json")
+    parser.add_argument("--events-file", default="events.json")
+    parser.add_argument("--write-behind", action="store_true", help="batch writes instead of one per change")
+    parser.add_argument("--password-cost", type=int, default=DEFAULT_COST, help="scrypt cost, log2 of n")
+    parser.add_argument("--password-workers", type=int, default=None,
+                        help="processes hashing passwords (default: one per core; 0 hashes in the request thread)")
+    args = parser.parse_args()
+    
+    # Loaded once; every request works on the same in-memory managers
+    system = EventManagementSystem(DataStorage(args.users_file, args.events_file, shared=True),
+                                   write_behind=args.write_behind, password_cost=args.password_cost,
+                                   password_workers=args.password_workers)
+    server = make_server(system, args.host, args.port, args.workers)
+    # Stop cleanly on SIGTERM too, so queued writes are flushed.
+    # shutdown() waits for serve_forever, hence the separate thread.
+    signal.signal(signal.SIGTERM, lambda signum, frame: threading.Thread(target=server.shutdown).start())
+    print(f"Serving on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        system.close()
+
+
+if __name__ == "__main__":
+    main()
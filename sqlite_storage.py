@@ -0,0 +1,410 @@
+import sqlite3
+import threading
+
+from main import DataStorage, LazyRecords, StorageConflictError, User, Event
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    user_id TEXT PRIMARY KEY,
+    username TEXT NOT NULL,
+    password TEXT NOT NULL,
+    email TEXT NOT NULL,
+    is_active INTEGER NOT NULL,
+    role TEXT NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS users_username ON users (username);
+CREATE INDEX IF NOT EXISTS users_email ON users (email);
+CREATE INDEX IF NOT EXISTS users_role ON users (role);
+
+CREATE TABLE IF NOT EXISTS events (
+    event_id TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    description TEXT NOT NULL,
+    date TEXT NOT NULL,
+    venue TEXT NOT NULL,
+    capacity INTEGER NOT NULL,
+    category TEXT NOT NULL,
+    organizer_id TEXT NOT NULL,
+    is_approved INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS events_approved_date ON events (is_approved, date);
+CREATE INDEX IF NOT EXISTS events_category ON events (category, is_approved, date);
+CREATE INDEX IF NOT EXISTS events_organizer ON events (organizer_id);
+
+-- Replaces the registered_users / registered_events lists; seq keeps registration order
+CREATE TABLE IF NOT EXISTS registrations (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    event_id TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    UNIQUE (event_id, user_id)
+);
+CREATE INDEX IF NOT EXISTS registrations_user ON registrations (user_id);
+"""
+
+USER_COLUMNS = ("user_id", "username", "password", "email", "is_active", "role")
+EVENT_COLUMNS = ("event_id", "title", "description", "date", "venue", "capacity",
+                 "category", "organizer_id", "is_approved")
+
+
+def _upsert(table, columns):
+    # Update in place on conflict rather than INSERT OR REPLACE, which would
+    # delete the row and give it a new rowid (the creation order we list by)
+    updates = ", ".join(f"{column} = excluded.{column}" for column in columns[1:])
+    return (f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))}) "
+            f"ON CONFLICT ({columns[0]}) DO UPDATE SET {updates}")
+
+
+UPSERT_USER = _upsert("users", USER_COLUMNS)
+UPSERT_EVENT = _upsert("events", EVENT_COLUMNS)
+
+# Keep IN (...) lists under SQLite's bound-parameter limit
+MAX_PARAMS = 500
+
+
+def _cursor_fields(cursor, count):
+    # A page cursor is "rowid" or "date/rowid"
+    fields = cursor.split("/")
+    try:
+        if len(fields) != count:
+            raise ValueError
+        fields[-1] = int(fields[-1])
+    except ValueError:
+        raise ValueError(f"Unknown cursor {cursor!r}") from None
+    return fields
+
+
+def _page(rows, limit, make_cursor):
+    # rows holds up to limit + 1 (rowid, id, ...) rows; the extra one only
+    # tells that there is another page
+    more = len(rows) > limit
+    rows = rows[:limit]
+    return [row[1] for row in rows], make_cursor(rows[-1]) if more else None
+
+
+class SQLiteStorage(DataStorage):
+    """
+    Storage backend keeping users, events and registrations in indexed
+    SQLite tables.
+    
+    load_users/load_events return LazyRecords, so records are only read
+    when the managers touch them, and the managers push their lookups down
+    to query_user_ids/query_event_ids instead of scanning memory. Pages
+    of a listing come from page_user_ids/page_event_ids, which seek to the
+    cursor through an index and read just the page.
+    """
+    
+    supports_queries = True
+    
+    def __init__(self, db_file="events.db"):
+        self.db_file = db_file
+        self.conn = sqlite3.connect(db_file, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+        self._unique_usernames()
+        self._lock = threading.RLock()
+    
+    def _unique_usernames(self):
+        # Databases made before usernames were unique have a plain index
+        indexes = {row[1]: row[2] for row in self.conn.execute("PRAGMA index_list(users)")}
+        if indexes.get("users_username", 1):
+            return
+        self.conn.execute("DROP INDEX users_username")
+        try:
+            self.conn.execute("CREATE UNIQUE INDEX users_username ON users (username)")
+        except sqlite3.IntegrityError:
+            print(f"Usernames in {self.db_file} are not unique; new duplicates are only refused by the checks on sign-up")
+            self.conn.execute("CREATE INDEX users_username ON users (username)")
+    
+    def _select(self, sql, params=()):
+        with self._lock:
+            return self.conn.execute(sql, params).fetchall()
+    
+    def _select_in(self, sql, column, keys):
+        # Run sql once per chunk of keys, with "{clause}" replaced by the IN clause
+        rows = []
+        keys = list(keys)
+        for start in range(0, len(keys), MAX_PARAMS):
+            chunk = keys[start:start + MAX_PARAMS]
+            clause = f"{column} IN ({','.join('?' * len(chunk))})"
+            rows.extend(self._select(sql.format(clause=clause), chunk))
+        return rows
+    
+    # Reading
+    
+    def _fetch_users(self, user_ids):
+        rows = self._select_in(f"SELECT {', '.join(USER_COLUMNS)} FROM users WHERE {{clause}}",
+                               "user_id", user_ids)
+        if not rows:
+            return {}
+        found = [row[0] for row in rows]
+        organizer_events = {}
+        for event_id, organizer_id in self._select_in(
+                "SELECT event_id, organizer_id FROM events WHERE {clause} ORDER BY rowid",
+                "organizer_id", found):
+            organizer_events.setdefault(organizer_id, []).append(event_id)
+        registrations = {}
+        for event_id, user_id in self._select_in(
+                "SELECT event_id, user_id FROM registrations WHERE {clause} ORDER BY seq",
+                "user_id", found):
+            registrations.setdefault(user_id, []).append(event_id)
+        
+        users = {}
+        for row in rows:
+            data = dict(zip(USER_COLUMNS, row))
+            data["events"] = organizer_events.get(data["user_id"], [])
+            data["registered_events"] = registrations.get(data["user_id"], [])
+            user = User.from_dict(data)
+            user.is_active = bool(data["is_active"])
+            users[user.user_id] = user
+        return users
+    
+    def _fetch_events(self, event_ids):
+        rows = self._select_in(f"SELECT {', '.join(EVENT_COLUMNS)} FROM events WHERE {{clause}}",
+                               "event_id", event_ids)
+        if not rows:
+            return {}
+        registrations = {}
+        for event_id, user_id in self._select_in(
+                "SELECT event_id, user_id FROM registrations WHERE {clause} ORDER BY seq",
+                "event_id", [row[0] for row in rows]):
+            registrations.setdefault(event_id, []).append(user_id)
+        
+        events = {}
+        for row in rows:
+            data = dict(zip(EVENT_COLUMNS, row))
+            data["is_approved"] = bool(data["is_approved"])
+            data["registered_users"] = registrations.get(data["event_id"], [])
+            events[data["event_id"]] = Event.from_dict(data)
+        return events
+    
+    def load_users(self):
+        return LazyRecords(
+            self._fetch_users,
+            lambda: [row[0] for row in self._select("SELECT user_id FROM users ORDER BY rowid")],
+            lambda: self._select("SELECT COUNT(*) FROM users")[0][0],
+        )
+    
+    def load_events(self):
+        return LazyRecords(
+            self._fetch_events,
+            lambda: [row[0] for row in self._select("SELECT event_id FROM events ORDER BY rowid")],
+            lambda: self._select("SELECT COUNT(*) FROM events")[0][0],
+        )
+    
+    def query_user_ids(self, username=None, email=None, role=None):
+        conditions, params = [], []
+        if username is not None:
+            conditions.append("username = ?")
+            params.append(username)
+        if email is not None:
+            conditions.append("email = ?")
+            params.append(email)
+        if role is not None:
+            conditions.append("role = ?")
+            params.append(role)
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        return [row[0] for row in self._select(f"SELECT user_id FROM users{where} ORDER BY rowid", params)]
+    
+    def page_user_ids(self, limit, cursor=None, role=None):
+        """
+        One page of the users, optionally of one role, in creation order.
+        
+        Returns:
+            (user IDs, next_cursor); the cursor is the rowid of the page's
+            last user, so it stays valid if that user is deleted
+        """
+        conditions, params = [], []
+        if role is not None:
+            conditions.append("role = ?")
+            params.append(role)
+        if cursor is not None:
+            conditions.append("rowid > ?")
+            params.append(_cursor_fields(cursor, 1)[0])
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        rows = self._select(f"SELECT rowid, user_id FROM users{where} ORDER BY rowid LIMIT ?", params + [limit + 1])
+        return _page(rows, limit, lambda row: str(row[0]))
+    
+    def _event_filters(self, category, organizer_id, approved, user_id):
+        # (FROM ... clause, conditions, params) for the event filters
+        sql = "FROM events"
+        conditions, params = [], []
+        if user_id is not None:
+            sql += " JOIN registrations ON registrations.event_id = events.event_id"
+            conditions.append("registrations.user_id = ?")
+            params.append(user_id)
+        if category is not None:
+            conditions.append("events.category = ?")
+            params.append(category)
+        if organizer_id is not None:
+            conditions.append("events.organizer_id = ?")
+            params.append(organizer_id)
+        if approved is not None:
+            conditions.append("events.is_approved = ?")
+            params.append(int(approved))
+        return sql, conditions, params
+    
+    def query_event_ids(self, category=None, organizer_id=None, approved=None, user_id=None,
+                        order_by_date=None):
+        """
+        Return the ids of events matching every given filter.
+        
+        Args:
+            category: Only events in this category
+            organizer_id: Only events created by this organizer
+            approved: True/False to filter on approval state
+            user_id: Only events this user is registered for
+            order_by_date: "asc" or "desc"; creation order otherwise
+        
+        Returns:
+            List of event IDs
+        """
+        sql, conditions, params = self._event_filters(category, organizer_id, approved, user_id)
+        sql = "SELECT events.event_id " + sql
+        if conditions:
+            sql += f" WHERE {' AND '.join(conditions)}"
+        if order_by_date == "asc":
+            sql += " ORDER BY events.date ASC"
+        elif order_by_date == "desc":
+            sql += " ORDER BY events.date DESC"
+        else:
+            sql += " ORDER BY events.rowid"
+        return [row[0] for row in self._select(sql, params)]
+    
+    def page_event_ids(self, limit, cursor=None, category=None, approved=None, order_by_date=None):
+        """
+        One page of query_event_ids with the same filters.
+        
+        Returns:
+            (event IDs, next_cursor); the cursor holds the sort key of the
+            page's last event (rowid, or date and rowid), so it stays valid
+            if that event is deleted
+        """
+        sql, conditions, params = self._event_filters(category, None, approved, None)
+        if order_by_date:
+            descending = order_by_date == "desc"
+            if cursor is not None:
+                conditions.append(f"(events.date, events.rowid) {'<' if descending else '>'} (?, ?)")
+                params.extend(_cursor_fields(cursor, 2))
+            order = " ORDER BY events.date DESC, events.rowid DESC" if descending else " ORDER BY events.date, events.rowid"
+            make_cursor = lambda row: f"{row[2]}/{row[0]}"
+        else:
+            if cursor is not None:
+                conditions.append("events.rowid > ?")
+                params.append(_cursor_fields(cursor, 1)[0])
+            order = " ORDER BY events.rowid"
+            make_cursor = lambda row: str(row[0])
+        sql = "SELECT events.rowid, events.event_id, events.date " + sql
+        if conditions:
+            sql += f" WHERE {' AND '.join(conditions)}"
+        rows = self._select(sql + order + " LIMIT ?", params + [limit + 1])
+        return _page(rows, limit, make_cursor)
+    
+    # Writing
+    
+    def _write(self, statements):
+        with self._lock, self.conn:
+            for sql, params in statements:
+                try:
+                    self.conn.execute(sql, params)
+                except sqlite3.IntegrityError as e:
+                    if "users.username" not in str(e):
+                        raise
+                    # Another process took the username first; like a conflict
+                    # on the JSON files, the managers reload and check again
+                    raise StorageConflictError(f"Username of user {params[0]} is taken", [params[0]]) from None
+    
+    def _user_row(self, user):
+        return (user.user_id, user.username, user.password, user.email, int(user.is_active), user.get_role())
+    
+    def _event_row(self, event):
+        return (event.event_id, event.title, event.description, event.date.isoformat(), event.venue,
+                event.capacity, event.category, event.organizer_id, int(event.is_approved))
+    
+    def _upsert_user(self, user):
+        return UPSERT_USER, self._user_row(user)
+    
+    def _upsert_event(self, event):
+        return UPSERT_EVENT, self._event_row(event)
+    
+    def save_users(self, users):
+        if isinstance(users, LazyRecords):
+            # Anything not materialized is already in the database unchanged
+            self._write([self._upsert_user(user) for user in users.loaded().values()])
+            return
+        # A plain dict (e.g. loaded from the JSON files) replaces the table.
+        # Registrations are written from the event side in save_events.
+        statements = [("DELETE FROM users", ())]
+        statements.extend(self._upsert_user(user) for user in users.values())
+        self._write(statements)
+    
+    def save_events(self, events):
+        if isinstance(events, LazyRecords):
+            self._write([self._upsert_event(event) for event in events.loaded().values()])
+            return
+        statements = [("DELETE FROM events", ()), ("DELETE FROM registrations", ())]
+        for event in events.values():
+            statements.append(self._upsert_event(event))
+            for user_id in event.registered_users:
+                statements.append(("INSERT OR IGNORE INTO registrations (event_id, user_id) VALUES (?, ?)",
+                                   (event.event_id, user_id)))
+        self._write(statements)
+    
+    def save_user(self, user, users):
+        self._write(self._save_user(user, users))
+    
+    def delete_user(self, user_id, users):
+        self._write(self._delete_user(user_id, users))
+    
+    def save_event(self, event, events):
+        self._write(self._save_event(event, events))
+    
+    def delete_event(self, event_id, events):
+        self._write(self._delete_event(event_id, events))
+    
+    def save_registration(self, event_id, user_id, events):
+        self._write(self._save_registration(event_id, user_id, events))
+    
+    def delete_registration(self, event_id, user_id, events):
+        self._write(self._delete_registration(event_id, user_id, events))
+    
+    def write_batch(self, changes):
+        # One transaction for the whole batch instead of one per change
+        statements = []
+        for name, args in changes:
+            statements.extend(getattr(self, "_" + name)(*args))
+        self._write(statements)
+    
+    # Statements for each record-level change
+    
+    def _save_user(self, user, users):
+        # Organizer.events and RegularUser.registered_events are derived from
+        # the events and registrations tables, so only the user row is written
+        return [self._upsert_user(user)]
+    
+    def _delete_user(self, user_id, users):
+        return [
+            ("DELETE FROM users WHERE user_id = ?", (user_id,)),
+            ("DELETE FROM registrations WHERE user_id = ?", (user_id,)),
+        ]
+    
+    def _save_event(self, event, events):
+        return [self._upsert_event(event)]
+    
+    def _delete_event(self, event_id, events):
+        return [
+            ("DELETE FROM events WHERE event_id = ?", (event_id,)),
+            ("DELETE FROM registrations WHERE event_id = ?", (event_id,)),
+        ]
+    
+    def _save_registration(self, event_id, user_id, events):
+        return [("INSERT OR IGNORE INTO registrations (event_id, user_id) VALUES (?, ?)",
+                 (event_id, user_id))]
+    
+    def _delete_registration(self, event_id, user_id, events):
+        return [("DELETE FROM registrations WHERE event_id = ? AND user_id = ?",
+                 (event_id, user_id))]
+    
+    def close(self):
+        with self._lock:
+            self.conn.close()
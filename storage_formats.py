@@ -0,0 +1,159 @@
+import argparse
+import json
+import os
+import pickle
+import threading
+
+from json_stream import iter_object_items
+
+
+class JsonFormat:
+    """One JSON object mapping id -> record; indented, or compact with indent=None."""
+    
+    binary = False
+    
+    def __init__(self, name, indent=2):
+        self.name = name
+        self.indent = indent
+    
+    def dump(self, records, f):
+        if self.indent is None:
+            json.dump(records, f, separators=(",", ":"))
+        else:
+            json.dump(records, f, indent=self.indent)
+    
+    def load(self, f):
+        return iter_object_items(f)
+
+
+class JsonLinesFormat:
+    """One [id, record] array per line, so records can be read, grepped or rewritten line by line."""
+    
+    name = "jsonl"
+    binary = False
+    
+    def dump(self, records, f):
+        for rid, record in records.items():
+            f.write(json.dumps([rid, record], separators=(",", ":")))
+            f.write("\n")
+    
+    def load(self, f):
+        for line in f:
+            if line.strip():
+                rid, record = json.loads(line)
+                yield rid, record
+
+
+class _RecordUnpickler(pickle.Unpickler):
+    # Records are plain dicts, lists, strings and numbers; refusing every
+    # class keeps a tampered file from running code on load
+    def find_class(self, module, name):
+        raise pickle.UnpicklingError(f"Refusing to load {module}.{name}")
+
+
+def load_plain(f):
+    """Unpickle data made only of plain dicts, lists, tuples, strings and numbers."""
+    return _RecordUnpickler(f).load()
+
+
+class BinaryFormat:
+    """
+    A magic header followed by pickle (protocol 5) frames of up to
+    batch_size (id, record) pairs each, so loading can go frame by frame.
+    """
+    
+    name = "binary"
+    binary = True
+    MAGIC = b"EMSPKL5\n"
+    
+    def __init__(self, batch_size=1000):
+        self.batch_size = batch_size
+    
+    def dump(self, records, f):
+        f.write(self.MAGIC)
+        items = list(records.items())
+        for start in range(0, len(items), self.batch_size):
+            pickle.dump(items[start:start + self.batch_size], f, protocol=5)
+    
+    def load(self, f):
+        if f.read(len(self.MAGIC)) != self.MAGIC:
+            raise ValueError("Not a binary storage file")
+        while True:
+            try:
+                batch = load_plain(f)
+            except EOFError:
+                return
+            yield from batch
+
+
+FORMATS = {fmt.name: fmt for fmt in (
+    JsonFormat("json", indent=2),
+    JsonFormat("json-compact", indent=None),
+    JsonLinesFormat(),
+    BinaryFormat(),
+)}
+
+
+def get_format(name):
+    if name not in FORMATS:
+        raise ValueError(f"Unknown storage format {name!r}; expected one of {', '.join(FORMATS)}")
+    return FORMATS[name]
+
+
+def detect_format(path):
+    """
+    Tell which format a storage file is in from its first bytes.
+    
+    Both JSON variants read the same way, so "json" is returned for either.
+    """
+    with open(path, 'rb') as f:
+        head = f.read(64)
+    if head.startswith(BinaryFormat.MAGIC):
+        return FORMATS["binary"]
+    if head.lstrip().startswith(b"["):
+        return FORMATS["jsonl"]
+    return FORMATS["json"]
+
+
+def read_records(path):
+    """Yield the (id, record dict) pairs stored in path, whatever its format."""
+    fmt = detect_format(path)
+    with open(path, 'rb' if fmt.binary else 'r') as f:
+        yield from fmt.load(f)
+
+
+def write_records(path, records, fmt):
+    """
+    Write {id: record dict} to path in the given format, through a
+    temporary file renamed over path, so path is never half-written.
+    """
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_path, 'wb' if fmt.binary else 'w') as f:
+            fmt.dump(records, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convert users/events storage files between formats")
+    parser.add_argument("files", nargs="+", help="files to convert in place, e.g. users.json events.json")
+    parser.add_argument("--to", required=True, choices=sorted(FORMATS), help="format to write")
+    args = parser.parse_args(argv)
+    
+    for path in args.files:
+        if not os.path.exists(path):
+            print(f"{path}: not found, skipped")
+            continue
+        before = os.path.getsize(path)
+        records = dict(read_records(path))
+        write_records(path, records, get_format(args.to))
+        print(f"{path}: {len(records)} records, {before} -> {os.path.getsize(path)} bytes ({args.to})")
+
+
+if __name__ == "__main__":
+    main()